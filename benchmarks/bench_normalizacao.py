@@ -0,0 +1,131 @@
+"""
+Micro-benchmark de utils.normalization.normalize_numeric_value.
+
+Compara a implementação atual (limpeza com str.replace, sufixo separado por rstrip e
+buscado num dicionário, cache LRU por texto) com a versão anterior (cadeia de
+str.replace e testes de substring) sobre um corpus sintético que imita a distribuição
+das células raspadas: muitos "-", percentuais e razões repetidas, e valores monetários
+com sufixos de escala.
+
+Também mede o estágio em lote (utils.normalizacao_lote.normalizar_coluna) sobre a
+coluna inteira de uma vez.
+
+Uso (a partir da raiz do repositório):
+    python -m benchmarks.bench_normalizacao [--celulas 135000] [--repeticoes 5]
+"""
+import argparse
+import random
+import re
+import time
+from models.schema import TIPOS_CAMPOS, NUMERICO
+from utils.normalization import normalize_numeric_value, _normalizar_texto, TAMANHO_CACHE
+from utils.normalizacao_lote import normalizar_coluna
+
+
+# Execução completa: os tickers de benchmarks/bench_triagem.py vezes os campos numéricos do esquema
+TICKERS_MERCADO = 500
+CELULAS_MERCADO = TICKERS_MERCADO * sum(tipo == NUMERICO for tipo in TIPOS_CAMPOS.values())
+
+
+def normalize_numeric_value_legado(value_str):
+    """Cópia fiel da implementação anterior, usada como referência."""
+    if value_str is None or not isinstance(value_str, str) or value_str.strip() in ['-', '']:
+        return None
+    cleaned_str = value_str.lower().strip()
+    cleaned_str = cleaned_str.replace('r$', '').replace('%', '').strip()
+    multiplier = 1
+    if 'bi' in cleaned_str:
+        multiplier = 1_000_000_000
+        cleaned_str = re.sub(r'bi(lhões)?', '', cleaned_str).strip()
+    elif 'mi' in cleaned_str:
+        multiplier = 1_000_000
+        cleaned_str = re.sub(r'mi(lhões)?', '', cleaned_str).strip()
+    cleaned_str = cleaned_str.replace('.', '').replace(',', '.')
+    try:
+        final_value = float(cleaned_str) * multiplier
+        if final_value.is_integer():
+            return int(final_value)
+        return final_value
+    except (ValueError, TypeError):
+        return None
+
+
+def _formatar_br(valor, casas=2):
+    texto = f"{valor:,.{casas}f}"
+    return texto.replace(',', '_').replace('.', ',').replace('_', '.')
+
+
+def gerar_corpus(total, semente=42):
+    """Gera células no formato dos sites, com a repetição típica de uma execução completa."""
+    rnd = random.Random(semente)
+    repetidos = ["-", "0,00%", "0,00", "", "1,00", "100,00%", "N/A"]
+    corpus = []
+    for _ in range(total):
+        sorteio = rnd.random()
+        if sorteio < 0.30:
+            corpus.append(rnd.choice(repetidos))
+        elif sorteio < 0.55:
+            corpus.append(_formatar_br(rnd.uniform(-50, 80)))  # razões (P/L, P/VP...)
+        elif sorteio < 0.75:
+            corpus.append(_formatar_br(rnd.uniform(-30, 60)) + "%")
+        elif sorteio < 0.90:
+            corpus.append(_formatar_br(rnd.randint(-10**10, 10**11), 0))  # valores absolutos
+        else:
+            sufixo = rnd.choice([" Milhões", " Bilhões", " mi", " bi", " mil", " B", " M", " K"])
+            corpus.append("R$ " + _formatar_br(rnd.uniform(1, 999)) + sufixo)
+    return corpus
+
+
+def medir(funcao, corpus, repeticoes):
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        for celula in corpus:
+            funcao(celula)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--celulas", type=int, default=CELULAS_MERCADO)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+
+    corpus = gerar_corpus(args.celulas)
+
+    divergencias = [
+        (c, normalize_numeric_value_legado(c), normalize_numeric_value(c))
+        for c in dict.fromkeys(corpus)
+        if normalize_numeric_value_legado(c) != normalize_numeric_value(c)
+    ]
+
+    t_legado = medir(normalize_numeric_value_legado, corpus, args.repeticoes)
+
+    _normalizar_texto.cache_clear()
+    inicio = time.perf_counter()
+    for celula in corpus:
+        normalize_numeric_value(celula)
+    t_frio = time.perf_counter() - inicio
+    t_quente = medir(normalize_numeric_value, corpus, args.repeticoes)
+    info = _normalizar_texto.cache_info()
+
+    t_lote = medir(normalizar_coluna, [corpus], args.repeticoes)
+
+    n = len(corpus)
+    print(f"Corpus: {n} células ({len(set(corpus))} distintas)")
+    print(f"Legado:            {t_legado * 1e9 / n:8.0f} ns/célula")
+    print(f"Atual (cache frio): {t_frio * 1e9 / n:8.0f} ns/célula  ({t_legado / t_frio:.1f}x)")
+    print(f"Atual (cache quente): {t_quente * 1e9 / n:6.0f} ns/célula  ({t_legado / t_quente:.1f}x)  [corpus repetido]")
+    print(f"Lote:              {t_lote * 1e9 / n:8.0f} ns/célula  ({t_legado / t_lote:.1f}x)")
+    print(f"Cache: {info.hits} acertos, {info.misses} faltas, tamanho {info.currsize}/{info.maxsize}")
+    if len(set(corpus)) > TAMANHO_CACHE:
+        print(f"⚠️ Mais textos distintos que TAMANHO_CACHE ({TAMANHO_CACHE}): o LRU descarta entradas a cada passada.")
+    # Divergências esperadas: sufixos que o legado ignorava ("mil" virava milhão, "B"/"M"/"K" viravam None)
+    print(f"Divergências em relação ao legado: {len(divergencias)}")
+    for celula, antigo, novo in divergencias[:10]:
+        print(f"  {celula!r}: {antigo!r} -> {novo!r}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,326 @@
+"""
+Benchmark offline dos scrapers sobre as páginas de benchmarks/paginas.py.
+
+Mede, por fonte:
+  - throughput do parse() (páginas/s) e latência por página (média, p50, p95, p99);
+  - pico de memória de um parse (tracemalloc, em passe separado para não distorcer o tempo);
+  - fração dos campos preenchidos, para uma mudança no extrator não passar por ganho de velocidade.
+E também:
+  - normalize_numeric_value sobre as células brutas das páginas (cache frio a cada repetição);
+  - ponta a ponta: Acao.get_all_data() por ticker, com as requisições de utils.http
+    respondidas pelas páginas em memória.
+
+O resultado vai para um JSON (benchmarks/resultados/). Com --baseline, compara com uma
+execução anterior e termina com código 1 se alguma métrica piorar além da tolerância.
+
+Sem páginas gravadas (o caso do repositório hoje) as medidas são sobre páginas sintéticas:
+detectam regressões entre versões do código, não medem o desempenho nas páginas reais.
+
+Uso (a partir da raiz do repositório):
+    python -m benchmarks.bench_scrapers [--repeticoes 3] [--fontes fundamentus,statusInvest]
+                                        [--baseline benchmarks/baseline_scrapers.json] [--tolerancia 0.15]
+                                        [--atualizar-baseline] [--exigir-gravadas]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from benchmarks.paginas import carregar, assinatura, avisar_sinteticas, TICKERS_REPRESENTATIVOS
+from scrapers.base_scraper import SCRAPERS_POR_FONTE, FONTES_REGISTRADAS
+from utils.normalization import normalize_numeric_value, _normalizar_texto
+from utils.gravacao import RespostaGravada
+
+DIRETORIO_RESULTADOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'resultados')
+BASELINE_PADRAO = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline_scrapers.json')
+TOLERANCIA_PADRAO = 0.15
+
+# Métrica -> True se maior é melhor. Usado na comparação com a baseline.
+METRICAS_COMPARADAS = {
+    'paginas_por_s': True,
+    'tickers_por_s': True,
+    'p95_ms': False,
+    'pico_memoria_kib': False,
+    'ns_por_celula': False,
+}
+
+
+def _resumo_latencias(latencias):
+    ordenadas = sorted(latencias)
+    n = len(ordenadas)
+
+    def percentil(p):
+        return round(ordenadas[min(n - 1, int(p * n))] * 1000, 3)
+
+    return {
+        'media_ms': round(sum(ordenadas) / n * 1000, 3),
+        'p50_ms': percentil(0.50),
+        'p95_ms': percentil(0.95),
+        'p99_ms': percentil(0.99),
+    }
+
+
+def _pico_memoria(funcao):
+    """Pico de memória (KiB) alocada durante funcao(), medido com tracemalloc."""
+    tracemalloc.start()
+    try:
+        funcao()
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return round(pico / 1024, 1)
+
+
+def medir_parse(fonte, paginas, repeticoes):
+    classe = SCRAPERS_POR_FONTE[fonte]
+    campos = [campo for campo in FONTES_REGISTRADAS[fonte].campos() if campo != f'{fonte}_erro']
+
+    # Aquecimento (imports, extrator compilado, cache da normalização); os registros
+    # dessa passada dão o preenchimento
+    registros = [classe(pagina.ticker).parse(pagina.html, *pagina.argumentos_parse) for pagina in paginas]
+
+    latencias = []
+    for _ in range(repeticoes):
+        for pagina in paginas:
+            scraper = classe(pagina.ticker)
+            inicio = time.perf_counter()
+            scraper.parse(pagina.html, *pagina.argumentos_parse)
+            latencias.append(time.perf_counter() - inicio)
+
+    # Pico de um parse (um por vez, como na coleta) sobre a maior página da fonte
+    maior = max(paginas, key=lambda pagina: len(pagina.html))
+    pico = _pico_memoria(lambda: classe(maior.ticker).parse(maior.html, *maior.argumentos_parse))
+    preenchidos = sum(registro.get(campo) is not None for registro in registros for campo in campos)
+
+    return {
+        'paginas': len(paginas),
+        'paginas_por_s': round(len(latencias) / sum(latencias), 2),
+        **_resumo_latencias(latencias),
+        'pico_memoria_kib': pico,
+        'preenchimento': round(preenchidos / (len(registros) * len(campos)), 4) if campos else None,
+    }
+
+
+def medir_normalizacao(paginas_por_fonte, repeticoes):
+    """normalize_numeric_value sobre as células numéricas brutas (parse com normalizar=False)."""
+    celulas = []
+    for fonte, paginas in paginas_por_fonte.items():
+        campos_texto = FONTES_REGISTRADAS[fonte].campos_texto()
+        for pagina in paginas:
+            registro = SCRAPERS_POR_FONTE[fonte](pagina.ticker, normalizar=False).parse(
+                pagina.html, *pagina.argumentos_parse)
+            celulas += [valor for chave, valor in registro.items()
+                        if isinstance(valor, str) and chave not in campos_texto and not chave.endswith('_erro')]
+    if not celulas:
+        return None
+
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        _normalizar_texto.cache_clear()
+        inicio = time.perf_counter()
+        for celula in celulas:
+            normalize_numeric_value(celula)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return {'celulas': len(celulas), 'ns_por_celula': round(melhor * 1e9 / len(celulas), 1)}
+
+
+@contextlib.contextmanager
+def servir_paginas(paginas_por_fonte):
+    """
+    Responde as requisições de utils.http com as páginas em memória (URL de cada scraper
+    -> HTML). POST para a API do ScrapeNinja devolve {"body": página da URL pedida}.
+    """
+    import utils.http
+
+    por_url = {}
+    for fonte, paginas in paginas_por_fonte.items():
+        for pagina in paginas:
+            scraper = SCRAPERS_POR_FONTE[fonte](pagina.ticker)
+            por_url[getattr(scraper, 'url', None) or scraper.target_url] = pagina.html
+
+    def executar(metodo, url, cliente, **kwargs):
+        if metodo == 'post' and 'json' in kwargs:
+            html = por_url.get(kwargs['json'].get('url'))
+            resposta = RespostaGravada(json.dumps({'body': html}), 200 if html else 404)
+        else:
+            html = por_url.get(url)
+            resposta = RespostaGravada(html or '', 200 if html is not None else 404)
+        return resposta, None, None, None
+
+    original = utils.http._executar
+    chaves = os.environ.get('RAPIDAPI_KEYS')
+    utils.http._executar = executar
+    os.environ['RAPIDAPI_KEYS'] = 'benchmark-offline'
+    try:
+        yield
+    finally:
+        utils.http._executar = original
+        if chaves is None:
+            os.environ.pop('RAPIDAPI_KEYS', None)
+        else:
+            os.environ['RAPIDAPI_KEYS'] = chaves
+
+
+@contextlib.contextmanager
+def contar_pausas():
+    """
+    As pausas deliberadas (METRICAS.dormir: espera antes de cada tentativa, backoff) são
+    somadas em vez de dormidas, senão dominariam o tempo ponta a ponta.
+    """
+    from utils.metricas import METRICAS
+
+    pausas = []
+    METRICAS.dormir = lambda segundos, fonte=None: pausas.append(segundos)
+    try:
+        yield pausas
+    finally:
+        del METRICAS.dormir
+
+
+def medir_ponta_a_ponta(paginas_por_fonte, repeticoes):
+    """
+    Acao.get_all_data() completo para os tickers que têm página em todas as fontes.
+    As pausas deliberadas não entram na latência; o total por ticker vai em 'pausas_s_por_ticker'.
+    """
+    from models.acao import Acao
+
+    conjuntos = [{pagina.ticker for pagina in paginas} for paginas in paginas_por_fonte.values()]
+    tickers = [ticker for ticker in TICKERS_REPRESENTATIVOS if all(ticker in c for c in conjuntos)]
+    tickers += sorted(set.intersection(*conjuntos) - set(tickers)) if conjuntos else []
+    if not tickers or set(paginas_por_fonte) != set(SCRAPERS_POR_FONTE):
+        return None
+
+    latencias = []
+    with servir_paginas(paginas_por_fonte), contar_pausas() as pausas, \
+            contextlib.redirect_stdout(io.StringIO()):
+        Acao(tickers[0]).get_all_data()
+        pausas.clear()
+        for _ in range(repeticoes):
+            for ticker in tickers:
+                inicio = time.perf_counter()
+                Acao(ticker).get_all_data()
+                latencias.append(time.perf_counter() - inicio)
+        pausas_por_ticker = sum(pausas) / len(latencias)
+        pico = _pico_memoria(lambda: Acao(tickers[0]).get_all_data())
+    return {
+        'tickers': len(tickers),
+        'tickers_por_s': round(len(latencias) / sum(latencias), 2),
+        **_resumo_latencias(latencias),
+        'pico_memoria_kib': pico,
+        'pausas_s_por_ticker': round(pausas_por_ticker, 2),
+    }
+
+
+def comparar(atual, baseline, tolerancia):
+    """Lista de regressões (texto) de 'atual' em relação a 'baseline'."""
+    regressoes = []
+    secoes = [('scrapers', fonte) for fonte in atual.get('scrapers', {})]
+    secoes += [(secao, None) for secao in ('normalizacao', 'ponta_a_ponta')]
+    for secao, fonte in secoes:
+        novo = atual.get(secao) or {}
+        antigo = baseline.get(secao) or {}
+        if fonte is not None:
+            novo, antigo = novo.get(fonte) or {}, antigo.get(fonte) or {}
+        nome = fonte or secao
+        for metrica, maior_melhor in METRICAS_COMPARADAS.items():
+            if metrica not in novo or not antigo.get(metrica):
+                continue
+            variacao = (novo[metrica] - antigo[metrica]) / antigo[metrica]
+            if (-variacao if maior_melhor else variacao) > tolerancia:
+                regressoes.append(f"{nome}.{metrica}: {antigo[metrica]} -> {novo[metrica]} ({variacao:+.0%})")
+        if 'preenchimento' in novo and antigo.get('preenchimento') is not None \
+                and novo['preenchimento'] < antigo['preenchimento']:
+            regressoes.append(f"{nome}.preenchimento: {antigo['preenchimento']} -> {novo['preenchimento']}")
+    return regressoes
+
+
+def executar(fontes, repeticoes, exigir_gravadas=False):
+    paginas = carregar(fontes)
+    if avisar_sinteticas(paginas) and exigir_gravadas:
+        sys.exit(2)
+    origens = sorted({pagina.origem for lista in paginas.values() for pagina in lista})
+    resultado = {
+        'data': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'repeticoes': repeticoes,
+        'paginas': {'origem': '+'.join(origens), 'assinatura': assinatura(paginas)},
+        'scrapers': {},
+    }
+    with contextlib.redirect_stdout(io.StringIO()):
+        for fonte, lista in paginas.items():
+            resultado['scrapers'][fonte] = medir_parse(fonte, lista, repeticoes)
+    resultado['normalizacao'] = medir_normalizacao(paginas, repeticoes)
+    resultado['ponta_a_ponta'] = medir_ponta_a_ponta(paginas, repeticoes)
+    return resultado
+
+
+def imprimir(resultado):
+    print(f"Páginas: {resultado['paginas']['origem']} (assinatura {resultado['paginas']['assinatura']}), "
+          f"{resultado['repeticoes']} repetições")
+    print(f"{'fonte':<24}{'pág/s':>9}{'média':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'pico KiB':>10}{'preench.':>10}")
+    for fonte, r in resultado['scrapers'].items():
+        print(f"{fonte:<24}{r['paginas_por_s']:>9}{r['media_ms']:>9}{r['p50_ms']:>9}{r['p95_ms']:>9}"
+              f"{r['p99_ms']:>9}{r['pico_memoria_kib']:>10}{r['preenchimento']:>10}")
+    if resultado['normalizacao']:
+        n = resultado['normalizacao']
+        print(f"normalize_numeric_value: {n['ns_por_celula']} ns/célula ({n['celulas']} células, cache frio)")
+    if resultado['ponta_a_ponta']:
+        e = resultado['ponta_a_ponta']
+        print(f"Acao.get_all_data: {e['tickers_por_s']} tickers/s, p50 {e['p50_ms']} ms, p95 {e['p95_ms']} ms, "
+              f"pico {e['pico_memoria_kib']} KiB (+{e['pausas_s_por_ticker']} s/ticker de pausas deliberadas)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--fontes", default=','.join(SCRAPERS_POR_FONTE))
+    parser.add_argument("--saida", help="Arquivo JSON do resultado (padrão: benchmarks/resultados/<data>.json).")
+    parser.add_argument("--baseline", help="Resultado anterior para comparar.")
+    parser.add_argument("--tolerancia", type=float, default=TOLERANCIA_PADRAO,
+                        help="Piora relativa aceita antes de acusar regressão (0.15 = 15%%).")
+    parser.add_argument("--atualizar-baseline", action="store_true",
+                        help=f"Grava o resultado como baseline ({os.path.relpath(BASELINE_PADRAO)} ou --baseline).")
+    parser.add_argument("--exigir-gravadas", action="store_true",
+                        help="Termina com código 2 se alguma fonte não tiver páginas gravadas.")
+    args = parser.parse_args()
+
+    fontes = [fonte.strip() for fonte in args.fontes.split(',') if fonte.strip()]
+    resultado = executar(fontes, args.repeticoes, args.exigir_gravadas)
+    imprimir(resultado)
+
+    saida = args.saida or os.path.join(DIRETORIO_RESULTADOS,
+                                       f"bench_scrapers_{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(saida)), exist_ok=True)
+    with open(saida, 'w', encoding='utf-8') as f:
+        json.dump(resultado, f, indent=2, ensure_ascii=False)
+    print(f"Resultado gravado em {saida}")
+
+    if args.atualizar_baseline:
+        caminho = args.baseline or BASELINE_PADRAO
+        with open(caminho, 'w', encoding='utf-8') as f:
+            json.dump(resultado, f, indent=2, ensure_ascii=False)
+        print(f"Baseline atualizada: {caminho}")
+        return
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('paginas', {}).get('assinatura') != resultado['paginas']['assinatura']:
+            print("⚠️ A baseline foi medida com outras páginas; comparação só indicativa.")
+        regressoes = comparar(resultado, baseline, args.tolerancia)
+        if regressoes:
+            print(f"❌ {len(regressoes)} regressões acima de {args.tolerancia:.0%}:")
+            for regressao in regressoes:
+                print(f"  {regressao}")
+            sys.exit(1)
+        print(f"✅ Sem regressões acima de {args.tolerancia:.0%} em relação a {args.baseline}.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Micro-benchmark de utils.triagem.
+
+Monta um dataset sintético no esquema atual (valores aleatórios por tipo de campo, com
+uma fração de vazios por fonte, como quando um site falha) e mede consultas típicas:
+filtro simples, filtro entre fontes, ordenação com top-N e texto. Para cada uma, o custo
+da primeira execução (compilação incluída) e o de uma consulta já compilada.
+
+Uso (a partir da raiz do repositório):
+    python -m benchmarks.bench_triagem [--tickers 500] [--repeticoes 200] [--arquivo dados_acoes.json]
+"""
+import argparse
+import random
+import time
+from models.schema import CAMPOS_POR_FONTE, TIPOS_CAMPOS, NUMERICO, DATA
+from utils.triagem import Triagem
+
+CONSULTAS = [
+    ("statusInvest_pl < 10 and statusInvest_roe_percentual > 15% and statusInvest_dy_percentual > 6%", (), None),
+    ("mediana(pl) < 10 and min(roe_percentual) > 15 and max(dy_percentual) > 6", (), None),
+    ("contar(pl) >= 2 and primeiro(pvp) < 1.5", ("-mediana(dy_percentual)",), 20),
+    (None, ("-statusInvest_liquidez_media_diaria", "ticker"), 50),
+    ('fundamentus_setor in ("Bancos", "Energia Elétrica") and contem(statusInvest_segmento, "seguro")',
+     ("fundamentus_setor", "-fundamentus_dy_percentual"), 10),
+    ('statusInvest_data_atualizacao >= "2024-01-01" and abs(statusInvest_pl - investidor10_pl) > 1', (), None),
+]
+
+SETORES = ["Bancos", "Energia Elétrica", "Mineração", "Petróleo", "Seguros", "Varejo", "Saneamento"]
+
+
+def dataset_sintetico(total, semente=7):
+    rnd = random.Random(semente)
+    registros = []
+    for i in range(total):
+        registro = {'ticker': f"T{i:04d}3"}
+        for fonte, campos in CAMPOS_POR_FONTE.items():
+            # ~10% dos tickers sem a fonte inteira (falha na coleta)
+            falhou = rnd.random() < 0.1
+            for campo in campos:
+                tipo = TIPOS_CAMPOS[campo]
+                if falhou or rnd.random() < 0.05:
+                    valor = None
+                elif tipo == NUMERICO:
+                    valor = round(rnd.uniform(-5, 40), 2)
+                elif tipo == DATA:
+                    valor = f"{rnd.randint(1, 28):02d}/{rnd.randint(1, 12):02d}/{rnd.randint(2022, 2025)}"
+                else:
+                    valor = rnd.choice(SETORES)
+                registro[campo] = valor
+        registro['atualizado_em'] = "2025-01-02 10:00:00"
+        registros.append(registro)
+    return registros
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickers", type=int, default=500)
+    parser.add_argument("--repeticoes", type=int, default=200)
+    parser.add_argument("--arquivo", help="Usa um dados_acoes.json real em vez do sintético.")
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    triagem = Triagem.carregar(args.arquivo) if args.arquivo else Triagem(dataset_sintetico(args.tickers))
+    print(f"Carga: {len(triagem)} tickers, {len(triagem.colunas)} colunas em {(time.perf_counter() - inicio) * 1000:.0f} ms")
+
+    for filtro, ordem, limite in CONSULTAS:
+        primeira = triagem.consultar(filtro, ordem, limite)
+        melhor = min(triagem.consultar(filtro, ordem, limite).segundos for _ in range(args.repeticoes))
+        descricao = filtro or f"ordem {', '.join(ordem)}"
+        print(f"{primeira.segundos * 1e6:8.0f} µs  {melhor * 1e6:6.1f} µs  {len(primeira):4d} tickers  {descricao}")
+
+
+if __name__ == '__main__':
+    main()
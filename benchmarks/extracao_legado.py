@@ -0,0 +1,392 @@
+"""
+Extração dos scrapers como estava no commit inicial do repositório (86f4e42, antes do
+BaseScraper e de scrapers/extracao.py), usada como referência: tests/test_extracao.py
+compara os registros do extrator declarativo com os destes sobre as mesmas páginas.
+
+O parse de cada classe é o corpo do fetch_data() daquele commit (no StatusInvest, o
+_parse_html()), copiado sem mudar a lógica. As únicas adaptações, marcadas no código:
+  - o HTML chega por argumento em vez de ser baixado (download, tentativas e mensagens de
+    erro ficam de fora);
+  - normalize_numeric_value passa por self._normalizar, para comparar também o modo bruto
+    (normalizar=False); no modo normal é a mesma função;
+  - o ano corrente dos rótulos do Fundamentus vem de utils.relogio, como no scraper atual;
+  - no InvestSite (Passivo), o texto bruto é guardado sem a escala (ela é aplicada no
+    estágio em lote).
+Os mapas de campos não mudaram desde aquele commit e são importados dos *_campos atuais.
+"""
+from datetime import datetime
+from bs4 import BeautifulSoup
+import pytz
+from utils.relogio import agora
+from scrapers.fundamentus_scraper import FundamentusScraper
+from scrapers.fundamentus_campos import FUNDAMENTUS_INDICATORS_MAP, NON_NUMERIC_KEYS as TEXTO_FUNDAMENTUS
+from scrapers.investidor10_scraper import Investidor10Scraper
+from scrapers.investidor10_campos import INVESTIDOR10_INDICATORS_MAP, NON_NUMERIC_KEYS as TEXTO_INVESTIDOR10
+from scrapers.investsiteindicadores_scraper import InvestSiteIndicadoresScraper
+from scrapers.investsiteindicadores_campos import (INVESTSITE_INDICADORES_MAP,
+                                                   NON_NUMERIC_KEYS as TEXTO_INVESTSITE_INDICADORES)
+from scrapers.investsitepassivo_scraper import InvestSitePassivoScraper
+from scrapers.investsitepassivo_campos import INVESTSITE_PASSIVO_MAP
+from scrapers.statusinvest_scraper import StatusInvestScraper
+from scrapers.statusinvest_campos import STATUSINVEST_INDICATORS_MAP, NON_NUMERIC_KEYS as TEXTO_STATUSINVEST
+
+
+class FundamentusLegado(FundamentusScraper):
+    def _get_all_possible_keys(self):
+        """Gera uma lista com todas as chaves de dados possíveis para este scraper."""
+        keys = set(FUNDAMENTUS_INDICATORS_MAP.values())
+        keys.add("fundamentus_oscilacao_ano_atual_percentual")
+        for i in range(1, 6):
+            keys.add(f"fundamentus_oscilacao_ano_menos_{i}_percentual")
+        return list(keys)
+
+    def parse(self, html):
+        # Inicializa o dicionário com todas as chaves possíveis e valor None.
+        all_keys = self._get_all_possible_keys()
+        dados = {key: None for key in all_keys}
+        dados["ticker"] = self.ticker
+        # Garante que o campo de erro sempre exista.
+        dados["fundamentus_erro"] = ""
+
+        soup = BeautifulSoup(html, 'html.parser')
+        # Adaptação: datetime.now().year
+        ano_atual = agora().year
+
+        # LÓGICA DE EXTRAÇÃO E NORMALIZAÇÃO
+        for table in soup.find_all("table", class_="w728"):
+            for row in table.find_all("tr"):
+                cells = row.find_all("td")
+                i = 0
+                while i < len(cells) - 1:
+                    label_span = cells[i].find('span', class_='txt')
+                    if 'label' in cells[i].get('class', []) and label_span:
+                        label_text = label_span.get_text(strip=True)
+
+                        value_cell = cells[i+1]
+                        value_element = value_cell.find('span') or value_cell
+                        raw_value = (value_element.find('a').get_text(strip=True) if value_element.find('a')
+                                     else value_element.get_text(strip=True)).strip()
+
+                        if label_text in FUNDAMENTUS_INDICATORS_MAP:
+                            key = FUNDAMENTUS_INDICATORS_MAP[label_text]
+                            if key not in dados or dados[key] is None:
+                                if key in TEXTO_FUNDAMENTUS:
+                                    dados[key] = raw_value
+                                else:
+                                    normalized_value = self._normalizar(raw_value)
+                                    if normalized_value is not None:
+                                        dados[key] = normalized_value
+
+                        if label_text.isdigit():
+                            ano = int(label_text)
+                            diff_ano = ano_atual - ano
+
+                            normalized_value = self._normalizar(raw_value)
+                            if normalized_value is not None:
+                                if diff_ano == 0:
+                                    dados["fundamentus_oscilacao_ano_atual_percentual"] = normalized_value
+                                elif 1 <= diff_ano <= 5:
+                                    dados[f"fundamentus_oscilacao_ano_menos_{diff_ano}_percentual"] = normalized_value
+
+                        i += 2
+                        continue
+                    i += 1
+
+        dre_header = soup.find('td', class_='nivel1', string='Dados demonstrativos de resultados')
+        if dre_header:
+            dre_table = dre_header.find_parent('table')
+            rows = dre_table.find_all('tr')
+            if len(rows) >= 5:
+                data_map = {
+                    'fundamentus_receita_liquida_3m': rows[2].find_all('td'),
+                    'fundamentus_ebit_3m': rows[3].find_all('td'),
+                    'fundamentus_lucro_liquido_3m': rows[4].find_all('td'),
+                }
+                for key, cells in data_map.items():
+                    if len(cells) > 3:
+                        raw_value = cells[3].get_text(strip=True)
+                        normalized_value = self._normalizar(raw_value)
+                        if normalized_value is not None:
+                            dados[key] = normalized_value
+
+        return dados
+
+
+class Investidor10Legado(Investidor10Scraper):
+    def _get_all_possible_keys(self):
+        """Gera uma lista com todas as chaves de dados possíveis para este scraper."""
+        keys = set(INVESTIDOR10_INDICATORS_MAP.values())
+        keys.add("investidor10_cotacao")
+        keys.add("investidor10_variacao_12m_percentual")
+        return list(keys)
+
+    def _process_and_store_data(self, dados, key, raw_value):
+        """Função auxiliar para normalizar e armazenar dados."""
+        if key in TEXTO_INVESTIDOR10:
+            dados[key] = raw_value
+        else:
+            normalized_value = self._normalizar(raw_value)
+            if normalized_value is not None:
+                dados[key] = normalized_value
+
+    def parse(self, html):
+        # Inicializa o dicionário com todas as chaves possíveis e valor None.
+        all_keys = self._get_all_possible_keys()
+        dados = {key: None for key in all_keys}
+        dados["ticker"] = self.ticker
+        # Garante que o campo de erro sempre exista.
+        dados["investidor10_erro"] = ""
+
+        soup = BeautifulSoup(html, 'html.parser')
+
+        # 1. Extrai cotação
+        if cotacao_div := soup.find("div", class_="_card cotacao"):
+            if value_span := cotacao_div.find("span", class_="value"):
+                raw_value = value_span.get_text(strip=True)
+                self._process_and_store_data(dados, "investidor10_cotacao", raw_value)
+
+        # 2. Extrai variação 12 meses
+        for card in soup.find_all("div", class_="_card"):
+            header = card.find("div", class_="_card-header")
+            if header and "VARIAÇÃO (12M)" in header.get_text(strip=True).upper():
+                if card_body := card.find("div", class_="_card-body"):
+                    if span := card_body.find("span"):
+                        raw_value = span.get_text(strip=True)
+                        self._process_and_store_data(dados, "investidor10_variacao_12m_percentual", raw_value)
+                        break
+
+        # 3. Extrai indicadores da seção principal
+        if indicators_section := soup.find("div", id="indicators"):
+            for cell in indicators_section.find_all("div", class_="cell"):
+                title_element = cell.find('span') or cell.find('div', class_='title')
+                value_element = cell.select_one('.value span')
+
+                if title_element and value_element:
+                    title_text = title_element.get_text(strip=True).upper()
+                    raw_value = value_element.get_text(strip=True)
+
+                    if "DIVIDEND YIELD" in title_text: title_text = "DIVIDEND YIELD"
+
+                    if title_text in INVESTIDOR10_INDICATORS_MAP:
+                        key = INVESTIDOR10_INDICATORS_MAP[title_text]
+                        self._process_and_store_data(dados, key, raw_value)
+
+        # 4. Extrai dados da seção "Sobre a Empresa"
+        if about_section := soup.find("div", id="about-company"):
+
+            if basic_info_table := about_section.find("div", class_="basic_info"):
+                for row in basic_info_table.find_all("tr"):
+                    cells = row.find_all("td")
+                    if len(cells) == 2:
+                        title_text = cells[0].get_text(strip=True).upper().replace(':', '')
+                        raw_value = cells[1].get_text(strip=True)
+                        if title_text in INVESTIDOR10_INDICATORS_MAP:
+                            key = INVESTIDOR10_INDICATORS_MAP[title_text]
+                            self._process_and_store_data(dados, key, raw_value)
+
+            if info_table := about_section.find("div", id="table-indicators-company"):
+                for cell in info_table.find_all("div", class_="cell"):
+                    title_element = cell.find('span', class_='title')
+                    value_element = cell.find('span', class_='value')
+
+                    if title_element and value_element:
+                        title_text = title_element.get_text(strip=True).upper()
+
+                        value_simple = value_element.find('div', class_='simple-value')
+                        raw_value = value_simple.get_text(strip=True) if value_simple else value_element.get_text(strip=True)
+
+                        if title_text in INVESTIDOR10_INDICATORS_MAP:
+                            key = INVESTIDOR10_INDICATORS_MAP[title_text]
+                            self._process_and_store_data(dados, key, raw_value)
+
+        return dados
+
+
+class InvestSiteIndicadoresLegado(InvestSiteIndicadoresScraper):
+    def _get_all_possible_keys(self):
+        """Gera uma lista com todas as chaves de dados possíveis para este scraper."""
+        return list(INVESTSITE_INDICADORES_MAP.values())
+
+    def parse(self, html):
+        # Inicializa o dicionário com todas as chaves possíveis e valor None.
+        all_keys = self._get_all_possible_keys()
+        dados = {key: None for key in all_keys}
+        dados["ticker"] = self.ticker
+        # Garante que o campo de erro sempre exista.
+        dados["investsiteindicadores_erro"] = ""
+
+        soup = BeautifulSoup(html, 'html.parser')
+
+        tables = soup.select('table[id^="tabela_resumo_empresa"]')
+        if not tables:
+            raise Exception("Nenhuma tabela de indicadores encontrada.")
+
+        # LÓGICA DE EXTRAÇÃO E NORMALIZAÇÃO
+        for table in tables:
+            tbody = table.find('tbody')
+            if not tbody: continue
+
+            for row in tbody.find_all('tr'):
+                cells = row.find_all('td')
+                if len(cells) == 2:
+                    label = cells[0].get_text(strip=True)
+                    value_element = cells[1].find('a') or cells[1]
+                    raw_value = value_element.get_text(strip=True)
+
+                    if label in INVESTSITE_INDICADORES_MAP:
+                        key = INVESTSITE_INDICADORES_MAP[label]
+
+                        if key not in dados or dados[key] is None:
+                            if key in TEXTO_INVESTSITE_INDICADORES:
+                                dados[key] = raw_value
+                            else:
+                                normalized_value = self._normalizar(raw_value)
+                                if normalized_value is not None:
+                                    dados[key] = normalized_value
+
+        return dados
+
+
+class InvestSitePassivoLegado(InvestSitePassivoScraper):
+    def _get_all_possible_keys(self):
+        """Gera uma lista com todas as chaves de dados possíveis para este scraper."""
+        return list(INVESTSITE_PASSIVO_MAP.values())
+
+    def parse(self, html):
+        # Inicializa o dicionário com todas as chaves possíveis e valor None.
+        all_keys = self._get_all_possible_keys()
+        dados = {key: None for key in all_keys}
+        dados["ticker"] = self.ticker
+        # Garante que o campo de erro sempre exista.
+        dados["investsitepassivo_erro"] = ""
+
+        soup = BeautifulSoup(html, 'html.parser')
+
+        table = soup.find('table', id='balanco_empresa_itr')
+        if not table:
+            raise Exception("Tabela de balanço patrimonial não encontrada.")
+
+        tbody = table.find('tbody')
+        if not tbody:
+            raise Exception("Corpo da tabela de balanço não encontrado.")
+
+        # LÓGICA DE EXTRAÇÃO E NORMALIZAÇÃO
+        for row in tbody.find_all('tr'):
+            cells = row.find_all('td')
+            if len(cells) >= 3:
+                raw_label = cells[1].get_text(strip=True)
+                raw_value = cells[2].get_text(strip=True)
+
+                if raw_label in INVESTSITE_PASSIVO_MAP:
+                    key = INVESTSITE_PASSIVO_MAP[raw_label]
+                    base_value = self._normalizar(raw_value)
+
+                    if (key not in dados or dados[key] is None) and isinstance(base_value, (int, float)):
+                        final_value = int(base_value * 1000)
+                        dados[key] = final_value
+                    # Adaptação: no modo bruto o texto válido fica sem a escala
+                    elif (key not in dados or dados[key] is None) and base_value is not None:
+                        dados[key] = base_value
+
+        return dados
+
+
+class StatusInvestLegado(StatusInvestScraper):
+    def _get_all_possible_keys(self):
+        keys = list(STATUSINVEST_INDICATORS_MAP.values())
+        keys.append("statusInvest_data_atualizacao")
+        keys.append("statusInvest_fonte")
+        return keys
+
+    def _process_and_store_data(self, dados, key, raw_value, overwrite=True):
+        if not overwrite and (key in dados and dados[key] is not None): return
+        if key in TEXTO_STATUSINVEST:
+            dados[key] = raw_value.strip() if isinstance(raw_value, str) else raw_value
+        else:
+            normalized_value = self._normalizar(raw_value)
+            if normalized_value is not None: dados[key] = normalized_value
+
+    def _extrair_dados_recompra(self, soup):
+        dados_recompra = {}
+        try:
+            div_programa_recompra = soup.find('div', class_='buyback card')
+            if not div_programa_recompra: return dados_recompra
+            div_primeira_linha = div_programa_recompra.find('div', class_='line')
+            if div_primeira_linha:
+                status_span = div_primeira_linha.find('span', class_='badge')
+                if status_span and 'ativo' in status_span.get_text(strip=True).lower():
+                    mapa_interno = {
+                        "DATA DE INÍCIO": "statusInvest_recompra_inicio",
+                        "DATA DE FIM": "statusInvest_recompra_fim",
+                        "QUANTIDADE": "statusInvest_recompra_quantidade"
+                    }
+                    spans_info = div_primeira_linha.find_all('span', class_=['fs-2', 'fw-700', 'fs-4'])
+                    chave_atual = None
+                    for span in spans_info:
+                        classes = span.get('class', [])
+                        texto = span.get_text(strip=True)
+                        if 'fs-2' in classes: chave_atual = texto.upper()
+                        elif chave_atual and ('fw-700' in classes or 'fs-4' in classes):
+                            if chave_atual in mapa_interno: dados_recompra[mapa_interno[chave_atual]] = texto
+                            chave_atual = None
+        except Exception as e:
+            print(f"    [AVISO] Erro extração recompra {self.ticker}: {e}")
+        return dados_recompra
+
+    def parse(self, html_content, fonte):
+        # Adaptação: o registro vazio era montado por _fetch_local_requests/_fetch_api_scrapeninja
+        dados = {key: None for key in self._get_all_possible_keys()}
+        dados["ticker"] = self.ticker
+        dados["statusInvest_erro"] = ""
+        return self._parse_html(html_content, dados, fonte)
+
+    def _parse_html(self, html_content, dados, fonte):
+        try:
+            soup = BeautifulSoup(html_content, 'html.parser')
+
+            for nome_indicador, chave_json in STATUSINVEST_INDICATORS_MAP.items():
+                try:
+                    elementos = soup.find_all(string=lambda text: text and nome_indicador in text)
+                    valor_encontrado = None
+                    for elem in elementos:
+                        parent = elem.parent
+                        while parent and parent.name != 'body':
+                            valor_tag = parent.find(class_='value')
+                            if valor_tag:
+                                valor_encontrado = valor_tag.get_text(strip=True)
+                                break
+                            parent = parent.parent
+                        if valor_encontrado: break
+
+                    if valor_encontrado:
+                        self._process_and_store_data(dados, chave_json, valor_encontrado)
+
+                    if chave_json == "statusInvest_cotacao" and dados[chave_json] is None:
+                        cotacao_elem = soup.find("div", title="Valor atual")
+                        if cotacao_elem:
+                            val = cotacao_elem.find("strong", class_="value")
+                            if val: self._process_and_store_data(dados, chave_json, val.get_text())
+                except: continue
+
+            dados_recompra = self._extrair_dados_recompra(soup)
+            for k, v in dados_recompra.items():
+                self._process_and_store_data(dados, k, v, overwrite=True)
+
+            # Define timezone BR e formato com hora
+            br_tz = pytz.timezone('America/Sao_Paulo')
+            dados["statusInvest_data_atualizacao"] = datetime.now(br_tz).strftime("%Y-%m-%d %H:%M:%S")
+            dados["statusInvest_fonte"] = fonte
+
+            return dados
+        except Exception as e:
+            dados["statusInvest_erro"] = f"Erro parsing: {e}"
+            return dados
+
+
+SCRAPERS_LEGADOS = {
+    'fundamentus': FundamentusLegado,
+    'investidor10': Investidor10Legado,
+    'investsiteindicadores': InvestSiteIndicadoresLegado,
+    'investsitepassivo': InvestSitePassivoLegado,
+    'statusInvest': StatusInvestLegado,
+}
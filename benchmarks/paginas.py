@@ -0,0 +1,315 @@
+"""
+Páginas de referência dos benchmarks: HTML gravado de cada fonte para um conjunto
+representativo de tickers, e um gerador sintético para quando não há gravação.
+
+As gravações ficam em benchmarks/fixtures/<fonte>/<TICKER>.html.gz, com o manifesto
+(data, tamanho, argumentos extras do parse) em benchmarks/fixtures/manifesto.json.
+Sem gravações, carregar() monta páginas sintéticas determinísticas a partir dos mapas
+de campos de cada fonte, na estrutura que o extrator espera e com marcação de sobra
+para chegar perto do tamanho das páginas reais. Os resultados registram a origem, e a
+comparação com a baseline só vale entre páginas da mesma origem.
+
+O repositório não tem gravações (foram escritas sem acesso aos sites), então hoje o
+benchmark roda só com páginas sintéticas. Elas têm apenas os campos dos mapas, sem o
+resto da árvore das páginas reais: os números servem para comparar duas versões do
+código nessas mesmas páginas, não dizem quanto o parse leva nas páginas reais.
+
+Uso (a partir da raiz do repositório, com rede):
+    python -m benchmarks.paginas --gravar [--tickers PETR4,VALE3] [--fontes fundamentus]
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import random
+from datetime import datetime
+from scrapers.base_scraper import SCRAPERS_POR_FONTE, FONTES_REGISTRADAS
+
+DIRETORIO_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+ARQUIVO_MANIFESTO = 'manifesto.json'
+ORIGEM_GRAVADA = 'gravada'
+ORIGEM_SINTETICA = 'sintetica'
+
+# Setores e perfis de página diferentes: banco, petróleo, mineração, indústria,
+# varejo, energia (unit), saneamento e uma small cap com muitos campos vazios.
+TICKERS_REPRESENTATIVOS = ('ITUB4', 'PETR4', 'VALE3', 'WEGE3', 'MGLU3', 'TAEE11', 'SBSP3', 'TECN3')
+
+# Tamanho aproximado (KiB) das páginas reais de cada fonte, alvo do gerador sintético
+TAMANHO_KIB = {
+    'investidor10': 450,
+    'fundamentus': 45,
+    'statusInvest': 400,
+    'investsitepassivo': 70,
+    'investsiteindicadores': 90,
+}
+
+# Argumentos extras do parse() gravados junto da página (o StatusInvest recebe a origem)
+ARGUMENTOS_PARSE_SINTETICOS = {'statusInvest': ("Atualização Manual Local",)}
+
+_PALAVRAS_RUIDO = ("lorem", "ipsum", "dolor", "sit", "amet", "consectetur", "adipiscing", "elit",
+                   "sed", "do", "eiusmod", "tempor", "incididunt", "ut", "labore", "magna")
+
+
+class Pagina:
+    """HTML de uma fonte para um ticker, com os argumentos extras do parse()."""
+
+    __slots__ = ('fonte', 'ticker', 'html', 'argumentos_parse', 'origem')
+
+    def __init__(self, fonte, ticker, html, argumentos_parse=(), origem=ORIGEM_GRAVADA):
+        self.fonte = fonte
+        self.ticker = ticker
+        self.html = html
+        self.argumentos_parse = tuple(argumentos_parse)
+        self.origem = origem
+
+
+# --- gravação -------------------------------------------------------------------
+
+def _caminho(diretorio, fonte, ticker):
+    return os.path.join(diretorio, fonte, f"{ticker}.html.gz")
+
+
+def _ler_manifesto(diretorio):
+    try:
+        with open(os.path.join(diretorio, ARQUIVO_MANIFESTO), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def gravar(tickers=TICKERS_REPRESENTATIVOS, fontes=None, diretorio=DIRETORIO_FIXTURES):
+    """Baixa as páginas com o baixar() de cada scraper e grava comprimidas. Retorna quantas gravou."""
+    manifesto = _ler_manifesto(diretorio)
+    gravadas = 0
+    for fonte in fontes or list(SCRAPERS_POR_FONTE):
+        os.makedirs(os.path.join(diretorio, fonte), exist_ok=True)
+        for ticker in tickers:
+            scraper = SCRAPERS_POR_FONTE[fonte](ticker)
+            try:
+                if fonte == 'statusInvest':
+                    html, origem = scraper.baixar(use_local_strategy=True)
+                    argumentos_parse = [origem]
+                else:
+                    html, argumentos_parse = scraper.baixar(), []
+            except Exception as e:
+                print(f"❌ {fonte}/{ticker}: {e}")
+                continue
+            with gzip.open(_caminho(diretorio, fonte, ticker), 'wt', encoding='utf-8') as f:
+                f.write(html)
+            manifesto.setdefault(fonte, {})[ticker] = {
+                'gravado_em': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                'bytes': len(html.encode('utf-8')),
+                'argumentos_parse': argumentos_parse,
+            }
+            gravadas += 1
+            print(f"✅ {fonte}/{ticker}: {len(html) / 1024:.0f} KiB")
+    with open(os.path.join(diretorio, ARQUIVO_MANIFESTO), 'w', encoding='utf-8') as f:
+        json.dump(manifesto, f, indent=2, ensure_ascii=False)
+    return gravadas
+
+
+# --- páginas sintéticas ---------------------------------------------------------
+
+def _numero_br(valor, casas=2):
+    texto = f"{valor:,.{casas}f}"
+    return texto.replace(',', '_').replace('.', ',').replace('_', '.')
+
+
+def _valor_sintetico(rnd, chave, campos_texto, ticker):
+    if chave in campos_texto:
+        return f"{ticker} {rnd.choice(_PALAVRAS_RUIDO).title()} {rnd.randint(1, 99)}"
+    if rnd.random() < 0.08:
+        return "-"
+    if chave.endswith('_percentual'):
+        return _numero_br(rnd.uniform(-40, 60)) + "%"
+    sorteio = rnd.random()
+    if sorteio < 0.5:
+        return _numero_br(rnd.uniform(-30, 90))
+    if sorteio < 0.8:
+        return "R$ " + _numero_br(rnd.uniform(1, 999)) + rnd.choice((" Milhões", " Bilhões", " mi", " bi"))
+    return _numero_br(rnd.randint(10**6, 10**11), 0)
+
+
+def _ruido(rnd, tamanho):
+    """Marcação sem rótulo de indicador (menus, listas, scripts) até ~tamanho caracteres."""
+    partes = []
+    total = 0
+    while total < tamanho:
+        palavras = ' '.join(rnd.choice(_PALAVRAS_RUIDO) for _ in range(rnd.randint(4, 12)))
+        tipo = rnd.random()
+        if tipo < 0.45:
+            bloco = ('<div class="menu-item"><a href="/x/{0}"><span class="icon"></span>'
+                     '<span class="label">{1}</span></a></div>').format(rnd.randint(1, 9999), palavras)
+        elif tipo < 0.8:
+            bloco = ('<ul class="lista">' + ''.join(f'<li><a href="#">{palavra}</a></li>' for palavra in palavras.split())
+                     + '</ul>')
+        elif tipo < 0.95:
+            bloco = f'<section><h4>{palavras}</h4><p>{palavras} {palavras}</p></section>'
+        else:
+            bloco = f'<script>window.__dados = {{"n": {rnd.randint(0, 10**6)}, "t": "{palavras}"}};</script>'
+        partes.append(bloco)
+        total += len(bloco)
+    return ''.join(partes)
+
+
+def _celulas(mapa, campos_texto, rnd, ticker, ignorar=()):
+    # rotulo == chave: entrada que só registra a chave (lida de outra parte da página), não é rótulo do site
+    return [(rotulo, _valor_sintetico(rnd, chave, campos_texto, ticker))
+            for rotulo, chave in mapa.items() if isinstance(chave, str) and rotulo != chave and rotulo not in ignorar]
+
+
+def _sintetica_fundamentus(rnd, ticker, campos_texto):
+    from scrapers.fundamentus_campos import FUNDAMENTUS_INDICATORS_MAP
+    demonstrativo = ("Receita Líquida", "EBIT", "Lucro Líquido")
+    celulas = _celulas(FUNDAMENTUS_INDICATORS_MAP, campos_texto, rnd, ticker, ignorar=demonstrativo)
+    ano = datetime.now().year
+    celulas += [(str(ano - i), _numero_br(rnd.uniform(-40, 60)) + "%") for i in range(6)]
+
+    def par(rotulo, valor):
+        return (f'<td class="label"><span class="help tips">?</span><span class="txt">{rotulo}</span></td>'
+                f'<td class="data"><span class="txt">{valor}</span></td>')
+
+    linhas = [''.join(par(*c) for c in celulas[i:i + 2]) for i in range(0, len(celulas), 2)]
+    tabelas = '<table class="w728">' + ''.join(f'<tr>{linha}</tr>' for linha in linhas) + '</table>'
+    dre = ''.join(f'<tr>{par(r, _numero_br(rnd.randint(10**8, 10**11), 0))}'
+                  f'{par(r, _numero_br(rnd.randint(10**7, 10**10), 0))}</tr>' for r in demonstrativo)
+    tabelas += ('<table class="w728"><tr><td class="nivel1" colspan="4">Dados demonstrativos de resultados</td></tr>'
+                '<tr><td class="nivel2" colspan="2">Últimos 12 meses</td><td class="nivel2" colspan="2">'
+                f'Últimos 3 meses</td></tr>{dre}</table>')
+    return tabelas
+
+
+def _sintetica_investidor10(rnd, ticker, campos_texto):
+    from scrapers.investidor10_campos import INVESTIDOR10_INDICATORS_MAP
+    celulas = ''.join(f'<div class="cell"><span class="d-flex">{rotulo}</span><div class="value d-flex">'
+                      f'<span>{valor}</span></div></div>'
+                      for rotulo, valor in _celulas(INVESTIDOR10_INDICATORS_MAP, campos_texto, rnd, ticker))
+    return (f'<div class="_card cotacao"><div class="_card-header">Cotação</div><div class="_card-body">'
+            f'<span class="value">R$ {_numero_br(rnd.uniform(1, 90))}</span></div></div>'
+            f'<div class="_card"><div class="_card-header"><span>{ticker} Variação (12M)</span></div>'
+            f'<div class="_card-body"><span>{_numero_br(rnd.uniform(-40, 60))}%</span></div></div>'
+            f'<div id="indicators">{celulas}</div>')
+
+
+def _sintetica_investsiteindicadores(rnd, ticker, campos_texto):
+    from scrapers.investsiteindicadores_campos import INVESTSITE_INDICADORES_MAP
+    linhas = ''.join(f'<tr><td>{rotulo}</td><td>{valor}</td></tr>'
+                     for rotulo, valor in _celulas(INVESTSITE_INDICADORES_MAP, campos_texto, rnd, ticker))
+    return f'<table id="tabela_resumo_empresa_mercado"><tbody>{linhas}</tbody></table>'
+
+
+def _sintetica_investsitepassivo(rnd, ticker, campos_texto):
+    from scrapers.investsitepassivo_campos import INVESTSITE_PASSIVO_MAP
+    linhas = ''.join(
+        f'<tr><td>2.{i:02d}</td><td>{rotulo}</td><td>{_numero_br(rnd.randint(0, 10**8), 0)}</td>'
+        f'<td>{_numero_br(rnd.randint(0, 10**8), 0)}</td></tr>'
+        for i, rotulo in enumerate(INVESTSITE_PASSIVO_MAP)
+    )
+    return (f'<table id="balanco_empresa_itr"><thead><tr><th></th><th>Conta</th><th>30/06</th><th>31/03</th>'
+            f'</tr></thead><tbody>{linhas}</tbody></table>')
+
+
+def _sintetica_statusinvest(rnd, ticker, campos_texto):
+    from scrapers.statusinvest_campos import STATUSINVEST_INDICATORS_MAP
+    itens = ''.join(f'<div class="item"><h3 class="title">{rotulo}</h3><strong class="value">{valor}</strong></div>'
+                    for rotulo, valor in _celulas(STATUSINVEST_INDICATORS_MAP, campos_texto, rnd, ticker))
+    return (f'<div class="indicators">{itens}</div>'
+            '<div class="buyback card"><div class="line"><span class="badge">Ativo</span>'
+            '<span class="fs-2">Data de início</span><span class="fw-700">01/03/2026</span>'
+            '<span class="fs-2">Data de fim</span><span class="fw-700">01/03/2027</span>'
+            f'<span class="fs-2">Quantidade</span><span class="fs-4">{_numero_br(rnd.randint(10**5, 10**8), 0)}</span>'
+            '</div></div>')
+
+
+_GERADORES = {
+    'investidor10': _sintetica_investidor10,
+    'fundamentus': _sintetica_fundamentus,
+    'statusInvest': _sintetica_statusinvest,
+    'investsitepassivo': _sintetica_investsitepassivo,
+    'investsiteindicadores': _sintetica_investsiteindicadores,
+}
+
+
+def pagina_sintetica(fonte, ticker):
+    """Página determinística (mesma fonte e ticker, mesmo HTML) na estrutura que o extrator da fonte lê."""
+    rnd = random.Random(f"{fonte}:{ticker}")
+    conteudo = _GERADORES[fonte](rnd, ticker, FONTES_REGISTRADAS[fonte].campos_texto())
+    alvo = TAMANHO_KIB[fonte] * 1024 - len(conteudo)
+    # Metade do ruído antes dos indicadores e metade depois, como no cabeçalho/rodapé reais
+    html = (f'<html><head><title>{ticker}</title></head><body><header>{_ruido(rnd, alvo // 2)}</header>'
+            f'<main>{conteudo}</main><footer>{_ruido(rnd, alvo // 2)}</footer></body></html>')
+    return Pagina(fonte, ticker, html, ARGUMENTOS_PARSE_SINTETICOS.get(fonte, ()), ORIGEM_SINTETICA)
+
+
+# --- carga ----------------------------------------------------------------------
+
+def carregar(fontes=None, tickers=None, diretorio=DIRETORIO_FIXTURES):
+    """
+    {fonte: [Pagina]} com as gravações de cada fonte; fonte sem nenhuma gravação usa
+    páginas sintéticas de TICKERS_REPRESENTATIVOS (ou dos tickers pedidos).
+    """
+    manifesto = _ler_manifesto(diretorio)
+    paginas = {}
+    for fonte in fontes or list(SCRAPERS_POR_FONTE):
+        gravadas = manifesto.get(fonte, {})
+        lista = []
+        for ticker, info in gravadas.items():
+            if tickers and ticker not in tickers:
+                continue
+            try:
+                with gzip.open(_caminho(diretorio, fonte, ticker), 'rt', encoding='utf-8') as f:
+                    lista.append(Pagina(fonte, ticker, f.read(), info.get('argumentos_parse', ())))
+            except OSError:
+                continue
+        if not lista:
+            lista = [pagina_sintetica(fonte, ticker) for ticker in tickers or TICKERS_REPRESENTATIVOS]
+        paginas[fonte] = lista
+    return paginas
+
+
+def fontes_sinteticas(paginas):
+    """Fontes de {fonte: [Pagina]} que ficaram com páginas sintéticas (sem gravação)."""
+    return [fonte for fonte, lista in paginas.items() if any(p.origem == ORIGEM_SINTETICA for p in lista)]
+
+
+def avisar_sinteticas(paginas):
+    """Avisa quais fontes estão sem gravação; devolve essas fontes."""
+    sinteticas = fontes_sinteticas(paginas)
+    if sinteticas:
+        print(f"⚠️ Sem páginas gravadas de {', '.join(sinteticas)}: usando páginas sintéticas, que não "
+              f"reproduzem as páginas reais. Os tempos dessas fontes só valem entre execuções sintéticas. "
+              f"Grave com: python -m benchmarks.paginas --gravar")
+    return sinteticas
+
+
+def assinatura(paginas):
+    """Hash do conjunto de páginas: resultados só são comparáveis com a mesma assinatura."""
+    resumo = hashlib.sha1()
+    for fonte in sorted(paginas):
+        for pagina in paginas[fonte]:
+            resumo.update(f"{fonte}/{pagina.ticker}\0".encode('utf-8'))
+            resumo.update(pagina.html.encode('utf-8'))
+    return resumo.hexdigest()[:16]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--gravar", action="store_true", help="Baixa e grava as páginas (precisa de rede).")
+    parser.add_argument("--tickers", default=','.join(TICKERS_REPRESENTATIVOS))
+    parser.add_argument("--fontes", default=','.join(SCRAPERS_POR_FONTE))
+    args = parser.parse_args()
+    tickers = [t.strip().upper() for t in args.tickers.split(',') if t.strip()]
+    fontes = [f.strip() for f in args.fontes.split(',') if f.strip()]
+    if args.gravar:
+        print(f"{gravar(tickers, fontes)} páginas gravadas em {DIRETORIO_FIXTURES}")
+        return
+    paginas = carregar(fontes, tickers)
+    avisar_sinteticas(paginas)
+    for fonte, lista in paginas.items():
+        tamanho = sum(len(pagina.html) for pagina in lista) / len(lista) / 1024
+        print(f"{fonte}: {len(lista)} páginas ({lista[0].origem}), média {tamanho:.0f} KiB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+"""
+Proxies HTTP locais para testar o pool de saídas (utils.proxies) contra o servidor simulado.
+
+Cada porta é um proxy de encaminhamento (só http://, sem CONNECT) que repassa o GET ao
+destino. Para simular o limite por IP dos sites, cada proxy aceita --limite requisições
+por --janela-s segundos e responde 429 até a janela virar; as portas de --bloqueadas
+respondem sempre 403. GET /__estatisticas (caminho relativo) em qualquer porta devolve
+as contagens de todas.
+
+Uso (a partir da raiz do repositório):
+    python -m benchmarks.servidor_simulado --porta 8765
+    python -m benchmarks.proxy_simulado --portas 9001,9002,9003 --limite 5 --janela-s 30 --bloqueadas 9003
+    URL_BASE_SIMULADA=http://127.0.0.1:8765 python main.py --sources statusInvest --local \\
+        --tickers PETR4,VALE3,ITUB4,WEGE3 \\
+        --proxies http://127.0.0.1:9001,http://127.0.0.1:9002,http://127.0.0.1:9003
+"""
+import argparse
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Sem ProxyHandler vazio o urllib usaria HTTP_PROXY do ambiente
+_ABRIDOR = urllib.request.build_opener(urllib.request.ProxyHandler({}))
+_CABECALHOS_REPASSADOS = ('User-Agent', 'Accept', 'Accept-Language')
+
+
+class SimulacaoProxies:
+    """Limite por porta (janela fixa) e contadores, compartilhados entre as portas."""
+
+    def __init__(self, limite=None, janela_s=60.0, bloqueadas=()):
+        self.limite = limite
+        self.janela_s = janela_s
+        self.bloqueadas = set(bloqueadas)
+        self._janelas = {}
+        self._trava = threading.Lock()
+        self.estatisticas = Counter()
+
+    def contar(self, porta, status):
+        with self._trava:
+            self.estatisticas[f"{porta} {status}"] += 1
+
+    def bloqueio(self, porta):
+        """Status de bloqueio (403/429) para a próxima requisição da porta, ou None se ela passa."""
+        if porta in self.bloqueadas:
+            return 403
+        if self.limite is None:
+            return None
+        with self._trava:
+            agora = time.monotonic()
+            inicio, usadas = self._janelas.get(porta, (agora, 0))
+            if agora - inicio >= self.janela_s:
+                inicio, usadas = agora, 0
+            self._janelas[porta] = (inicio, usadas + 1)
+        return 429 if usadas >= self.limite else None
+
+
+class _Manipulador(BaseHTTPRequestHandler):
+    simulacao = None
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, formato, *argumentos):
+        pass
+
+    def _enviar(self, status, dados, tipo='text/html; charset=utf-8'):
+        self.send_response(status)
+        self.send_header('Content-Type', tipo)
+        self.send_header('Content-Length', str(len(dados)))
+        self.end_headers()
+        self.wfile.write(dados)
+
+    def do_GET(self):
+        porta = self.server.server_address[1]
+        if self.path.startswith('/'):
+            if self.path == '/__estatisticas':
+                corpo = json.dumps(dict(self.simulacao.estatisticas), indent=2).encode('utf-8')
+                self._enviar(200, corpo, 'application/json')
+            else:
+                self._enviar(400, b"Proxy: use a URL absoluta")
+            return
+
+        status = self.simulacao.bloqueio(porta)
+        if status is not None:
+            self.simulacao.contar(porta, status)
+            self._enviar(status, b"Too Many Requests" if status == 429 else b"Forbidden")
+            return
+
+        cabecalhos = {nome: self.headers[nome] for nome in _CABECALHOS_REPASSADOS if self.headers.get(nome)}
+        try:
+            with _ABRIDOR.open(urllib.request.Request(self.path, headers=cabecalhos), timeout=30) as resposta:
+                status, tipo, dados = resposta.status, resposta.headers.get('Content-Type', ''), resposta.read()
+        except urllib.error.HTTPError as e:
+            status, tipo, dados = e.code, e.headers.get('Content-Type', ''), e.read()
+        except OSError as e:
+            status, tipo, dados = 502, 'text/plain; charset=utf-8', f"Bad Gateway: {e}".encode('utf-8')
+        self.simulacao.contar(porta, status)
+        self._enviar(status, dados, tipo or 'text/html; charset=utf-8')
+
+
+def criar_proxies(simulacao, portas, endereco='127.0.0.1'):
+    """Um ThreadingHTTPServer por porta, prontos para serve_forever()."""
+    manipulador = type('Manipulador', (_Manipulador,), {'simulacao': simulacao})
+    servidores = []
+    for porta in portas:
+        servidor = ThreadingHTTPServer((endereco, porta), manipulador)
+        servidor.daemon_threads = True
+        servidores.append(servidor)
+    return servidores
+
+
+def _portas(texto):
+    return [int(parte) for parte in texto.split(',') if parte.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--portas", type=_portas, default=[9001, 9002, 9003])
+    parser.add_argument("--limite", type=int, help="Requisições por janela em cada proxy antes do 429.")
+    parser.add_argument("--janela-s", type=float, default=60.0)
+    parser.add_argument("--bloqueadas", type=_portas, default=[], help="Portas que respondem sempre 403.")
+    args = parser.parse_args()
+
+    simulacao = SimulacaoProxies(args.limite, args.janela_s, args.bloqueadas)
+    servidores = criar_proxies(simulacao, args.portas)
+    for servidor in servidores:
+        threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    enderecos = ','.join(f"http://127.0.0.1:{servidor.server_address[1]}" for servidor in servidores)
+    print(f"🧪 Proxies simulados: {enderecos}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for servidor in servidores:
+            servidor.shutdown()
+            servidor.server_close()
+        print(json.dumps(dict(simulacao.estatisticas), indent=2))
+
+
+if __name__ == '__main__':
+    main()
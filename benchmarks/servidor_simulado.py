@@ -0,0 +1,226 @@
+"""
+Servidor HTTP local no lugar dos cinco sites, da API do ScrapeNinja e da planilha de tickers.
+
+Cada host fica sob /<nome>, com o mesmo caminho do site real:
+    /fundamentus/detalhes.php?papel=PETR4
+    /investidor10/acoes/petr4/
+    /statusInvest/acoes/petr4
+    /investsiteindicadores/principais_indicadores.php?cod_negociacao=PETR4
+    /investsitepassivo/balanco_patrimonial_passivo.php?cod_negociacao=PETR4
+    POST /scrapeninja/scrape              {"url": ...} -> {"body": <html>}
+    /planilha/spreadsheets/d/<id>/export  CSV com "BVMF:<ticker>"
+    /__estatisticas                        contagem de respostas por host e status (JSON)
+
+As páginas são as de benchmarks.paginas (gravadas ou sintéticas; ticker sem gravação
+recebe uma sintética). Latência, 429/403, CAPTCHA e cota da API são configuráveis,
+com sorteio reprodutível por --semente.
+
+Uso (a partir da raiz do repositório):
+    python -m benchmarks.servidor_simulado [--porta 8765] [--latencia-ms 150 --jitter-ms 100]
+        [--taxa-429 0.05] [--taxa-403 0.02] [--taxa-captcha 0.02] [--cota-scrapeninja 200]
+    URL_BASE_SIMULADA=http://127.0.0.1:8765 RAPIDAPI_KEYS=a,b python main.py
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+from benchmarks.paginas import carregar, pagina_sintetica, TICKERS_REPRESENTATIVOS
+from scrapers.base_scraper import SCRAPERS_POR_FONTE
+
+PORTA_PADRAO = 8765
+
+# Hosts reais -> nome, para o ScrapeNinja receber a URL original quando só a API é desviada
+_FONTE_POR_HOST = {
+    'www.fundamentus.com.br': 'fundamentus',
+    'investidor10.com.br': 'investidor10',
+    'statusinvest.com.br': 'statusInvest',
+}
+_FONTE_POR_PAGINA_INVESTSITE = {
+    'principais_indicadores.php': 'investsiteindicadores',
+    'balanco_patrimonial_passivo.php': 'investsitepassivo',
+}
+
+PAGINA_CAPTCHA = ('<html><body><h1>Verificação</h1><p>Confirme que você não é um robô.</p>'
+                  '<div class="g-recaptcha" data-sitekey="captcha"></div></body></html>')
+
+
+def rotear(url):
+    """(fonte, ticker) da URL de uma página, ou (None, None)."""
+    partes = urlsplit(url)
+    segmentos = [s for s in partes.path.split('/') if s]
+    if partes.netloc in _FONTE_POR_HOST:
+        fonte = _FONTE_POR_HOST[partes.netloc]
+    elif partes.netloc.endswith('investsite.com.br') and segmentos:
+        fonte = _FONTE_POR_PAGINA_INVESTSITE.get(segmentos[-1])
+    elif segmentos and segmentos[0] in SCRAPERS_POR_FONTE:
+        fonte, segmentos = segmentos[0], segmentos[1:]
+    else:
+        return None, None
+    consulta = parse_qs(partes.query)
+    ticker = (consulta.get('papel') or consulta.get('cod_negociacao') or [segmentos[-1] if segmentos else ''])[0]
+    return fonte, ticker.upper() or None
+
+
+class Simulacao:
+    """Estado compartilhado entre as requisições: páginas, sorteios e contadores."""
+
+    def __init__(self, latencia_ms=0, jitter_ms=0, taxa_429=0.0, taxa_403=0.0, taxa_captcha=0.0,
+                 cota_scrapeninja=None, tickers=TICKERS_REPRESENTATIVOS, semente=0):
+        self.latencia_ms = latencia_ms
+        self.jitter_ms = jitter_ms
+        self.taxa_429 = taxa_429
+        self.taxa_403 = taxa_403
+        self.taxa_captcha = taxa_captcha
+        self.cota_scrapeninja = cota_scrapeninja
+        self.tickers = list(tickers)
+        self._aleatorio = random.Random(semente)
+        self._trava = threading.Lock()
+        self._paginas = {(fonte, pagina.ticker): pagina.html
+                         for fonte, lista in carregar().items() for pagina in lista}
+        self.estatisticas = Counter()
+
+    def _sortear(self):
+        with self._trava:
+            return self._aleatorio.random(), self._aleatorio.uniform(-1, 1)
+
+    def contar(self, nome, status):
+        with self._trava:
+            self.estatisticas[f"{nome} {status}"] += 1
+
+    def consumir_cota(self):
+        """False quando a cota simulada do ScrapeNinja acabou."""
+        with self._trava:
+            if self.cota_scrapeninja is None:
+                return True
+            if self.cota_scrapeninja <= 0:
+                return False
+            self.cota_scrapeninja -= 1
+            return True
+
+    def pagina(self, fonte, ticker):
+        with self._trava:
+            html = self._paginas.get((fonte, ticker))
+        if html is None:
+            html = pagina_sintetica(fonte, ticker).html
+            with self._trava:
+                self._paginas[(fonte, ticker)] = html
+        return html
+
+    def responder(self, fonte, ticker):
+        """(status, corpo) de uma página, já com a latência e as falhas sorteadas."""
+        sorteio, desvio = self._sortear()
+        atraso = max(0.0, self.latencia_ms + desvio * self.jitter_ms) / 1000
+        if atraso:
+            time.sleep(atraso)
+        if sorteio < self.taxa_429:
+            return 429, "Too Many Requests"
+        sorteio -= self.taxa_429
+        if sorteio < self.taxa_403:
+            return 403, "Forbidden"
+        sorteio -= self.taxa_403
+        if sorteio < self.taxa_captcha:
+            return 200, PAGINA_CAPTCHA
+        return 200, self.pagina(fonte, ticker)
+
+
+class _Manipulador(BaseHTTPRequestHandler):
+    simulacao = None
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, formato, *argumentos):
+        pass
+
+    def _enviar(self, status, corpo, tipo='text/html; charset=utf-8'):
+        dados = corpo.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', tipo)
+        self.send_header('Content-Length', str(len(dados)))
+        self.end_headers()
+        self.wfile.write(dados)
+
+    def do_GET(self):
+        caminho = urlsplit(self.path).path
+        if caminho == '/__estatisticas':
+            self._enviar(200, json.dumps(dict(self.simulacao.estatisticas), indent=2), 'application/json')
+            return
+        if caminho.startswith('/planilha/'):
+            linhas = ["Ticker"] + [f"BVMF:{ticker}" for ticker in self.simulacao.tickers]
+            self.simulacao.contar('planilha', 200)
+            self._enviar(200, '\n'.join(linhas) + '\n', 'text/csv; charset=utf-8')
+            return
+        fonte, ticker = rotear(f"http://simulado{self.path}")
+        if fonte is None or ticker is None:
+            self.simulacao.contar('desconhecido', 404)
+            self._enviar(404, "Not Found")
+            return
+        status, corpo = self.simulacao.responder(fonte, ticker)
+        self.simulacao.contar(fonte, status)
+        self._enviar(status, corpo)
+
+    def do_POST(self):
+        tamanho = int(self.headers.get('Content-Length') or 0)
+        try:
+            pedido = json.loads(self.rfile.read(tamanho) or b'{}')
+        except ValueError:
+            pedido = {}
+        if urlsplit(self.path).path != '/scrapeninja/scrape':
+            self._enviar(404, "Not Found")
+            return
+        if not self.simulacao.consumir_cota():
+            self.simulacao.contar('scrapeninja', 429)
+            self._enviar(429, json.dumps({"message": "quota exceeded"}), 'application/json')
+            return
+        fonte, ticker = rotear(pedido.get('url', ''))
+        if fonte is None or ticker is None:
+            self.simulacao.contar('scrapeninja', 404)
+            self._enviar(200, json.dumps({"body": ""}), 'application/json')
+            return
+        status, corpo = self.simulacao.responder(fonte, ticker)
+        self.simulacao.contar('scrapeninja', status)
+        # A API responde 200 com o corpo da página alvo, mesmo quando o alvo bloqueou
+        self._enviar(200, json.dumps({"info": {"statusCode": status}, "body": corpo if status == 200 else ""}),
+                     'application/json')
+
+
+def criar_servidor(simulacao, porta=PORTA_PADRAO, endereco='127.0.0.1'):
+    """ThreadingHTTPServer pronto para serve_forever() (porta 0 = porta livre qualquer)."""
+    manipulador = type('Manipulador', (_Manipulador,), {'simulacao': simulacao})
+    servidor = ThreadingHTTPServer((endereco, porta), manipulador)
+    servidor.daemon_threads = True
+    return servidor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--porta", type=int, default=PORTA_PADRAO)
+    parser.add_argument("--latencia-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--taxa-429", type=float, default=0.0)
+    parser.add_argument("--taxa-403", type=float, default=0.0)
+    parser.add_argument("--taxa-captcha", type=float, default=0.0)
+    parser.add_argument("--cota-scrapeninja", type=int, help="Requisições aceitas pela API antes do 429.")
+    parser.add_argument("--tickers", default=','.join(TICKERS_REPRESENTATIVOS), help="Tickers da planilha.")
+    parser.add_argument("--semente", type=int, default=0)
+    args = parser.parse_args()
+
+    simulacao = Simulacao(args.latencia_ms, args.jitter_ms, args.taxa_429, args.taxa_403, args.taxa_captcha,
+                          args.cota_scrapeninja, [t.strip().upper() for t in args.tickers.split(',') if t.strip()],
+                          args.semente)
+    servidor = criar_servidor(simulacao, args.porta)
+    print(f"🧪 Servidor simulado em http://127.0.0.1:{servidor.server_address[1]} "
+          f"(URL_BASE_SIMULADA=http://127.0.0.1:{servidor.server_address[1]})")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+        print(json.dumps(dict(simulacao.estatisticas), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,52 +1,107 @@
-import json
+import argparse
 import os
+import subprocess
+import sys
+import time
 from datetime import datetime
 from models.acao import Acao
+from scrapers.base_scraper import SCRAPERS_POR_FONTE
 from utils.listaticker import ListaTicker
+from utils.historico import gravar_historico_se_configurado
+from utils.dataset import carregar_dataset, dataset_de_texto, salvar_dataset
+from utils.delta import calcular_delta, salvar_delta, ARQUIVO_DELTA_PADRAO
+from utils.git_local import sincronizar, publicar, usuario_local
+from utils.agendador import ordenar_por_prioridade, Prazo, PRIORIDADES, PRIORIDADE_DEFASAGEM
+from utils.retentativa import retentar_falhas, recoletar, CONEXOES_RETENTATIVA
+from utils.anomalias import revalidar
+from utils.shard import interpretar_shard, filtrar_shard, salvar_shard, mesclar_shards, limpar_shards
+from utils.selecao import interpretar_fontes, interpretar_tickers, planejar_selecao
+from utils.metricas import (METRICAS, DIRETORIO_METRICAS, ETAPA_NORMALIZACAO, ETAPA_MESCLAGEM, ETAPA_ESCRITA,
+                            CACHE_STATUSINVEST, REGISTROS_REAPROVEITADOS, TICKERS_DESPACHADOS, RESULTADO_ACERTO)
+from utils.perfilamento import PERFIL, DIRETORIO_PERFIL, ROTULO_EXECUCAO, TOP_ALOCACOES
+from utils.http import (ativar_gravacao, ativar_reproducao, encerrar_gravacao, registrar_entrada, entrada_gravada,
+                        gravando, LimitadorTaxa)
+from utils.proxies import pool_de_saida, VARIAVEL_PROXIES
+from utils.gravacao import Reprodutor, caminho_do_shard, ENTRADA_DATASET, ENTRADA_TICKERS, ENTRADA_RELOGIO
+from utils.relogio import agora, fixar_referencia
+from utils.saida_por_ticker import gravar_por_ticker
 
 JSON_FILE = 'dados_acoes.json'
 DIAS_VALIDADE_CACHE = 5
+# NORMALIZACAO_EM_LOTE=1 adia a conversão numérica (e as escalas) para um único estágio no fim
+NORMALIZACAO_EM_LOTE = os.getenv('NORMALIZACAO_EM_LOTE') == '1'
+# PROCESSOS_PARSE=N ativa a coleta paralela: downloads em threads e parse em N processos
+PROCESSOS_PARSE = int(os.getenv('PROCESSOS_PARSE') or 0)
+CONEXOES_COLETA = int(os.getenv('CONEXOES_COLETA') or 8)
 
 def carregar_dados_existentes():
-    if not os.path.exists(JSON_FILE):
-        return {}
-    try:
-        with open(JSON_FILE, 'r', encoding='utf-8') as f:
-            lista = json.load(f)
-            # Cria um dicionário indexado pelo ticker para busca rápida
-            return {item['ticker']: item for item in lista}
-    except Exception as e:
-        print(f"Erro ao ler JSON existente: {e}")
-        return {}
+    # Dicionário indexado pelo ticker para busca rápida (guarda também o texto original)
+    texto_gravado = entrada_gravada(ENTRADA_DATASET)
+    if texto_gravado is not None:
+        # --replay: o dataset de entrada é o da gravação, não o dados_acoes.json atual
+        print(f"⏯️ Dataset de entrada da gravação (no lugar do {JSON_FILE} atual).")
+        return dataset_de_texto(texto_gravado)
+    if gravando():
+        try:
+            with open(JSON_FILE, 'r', encoding='utf-8') as f:
+                registrar_entrada(ENTRADA_DATASET, f.read())
+        except OSError:
+            registrar_entrada(ENTRADA_DATASET, '')
+    return carregar_dataset(JSON_FILE)
 
 def extrair_apenas_statusinvest(dados_completos):
     """
     Filtra do JSON completo apenas as chaves que começam com 'statusInvest'.
     """
     if not dados_completos: return None
-    return {k: v for k, v in dados_completos.items() if k.startswith('statusInvest')}
+    return dados_completos.extrair_fonte('statusInvest')
 
-def main():
-    lista_provider = ListaTicker()
-    # acoes_a_consultar = ["ABEV3","ITSA4","EGIE3","FLRY3"] # Para teste
-    acoes_a_consultar = lista_provider.obter_lista_ticker()
+def statusinvest_recente(dados_antigos):
+    """True se os dados de StatusInvest têm menos de DIAS_VALIDADE_CACHE dias (mantém o cache)."""
+    data_att_str = dados_antigos.get('statusInvest_data_atualizacao')
+    if not data_att_str:
+        return False
+    try:
+        # CORREÇÃO AQUI: Pegamos apenas os 10 primeiros caracteres (YYYY-MM-DD)
+        # Isso funciona se tiver hora ("2025-12-01 10:00:00") ou não ("2025-12-01")
+        data_str_limpa = data_att_str[:10] 
+        data_att = datetime.strptime(data_str_limpa, "%Y-%m-%d")
+    except ValueError:
+        # Se data estiver bugada, tenta atualizar
+        return False
 
-    if not acoes_a_consultar:
-        print("Nenhuma ação para consultar.")
-        return
+    dias_passados = (agora() - data_att).days
+    if dias_passados < DIAS_VALIDADE_CACHE:
+        print(f"ℹ️ Dados StatusInvest recentes ({dias_passados} dias). Mantendo cache.")
+        return True
+    print(f"Old Dados StatusInvest antigos ({dias_passados} dias). Tentando atualizar...")
+    return False
 
-    print("\nIniciando atualização inteligente...")
-    
-    # 1. Carrega o estado atual do banco de dados (JSON)
-    mapa_dados_existentes = carregar_dados_existentes()
-    
+def novos_na_frente(tickers, mapa_dados_existentes):
+    """
+    Tickers que ainda não estão no dataset vão na frente, qualquer que seja o critério.
+    A comparação é com o dados_acoes.json (e não com o cache da lista): um ticker que
+    entrou na planilha durante a atualização em segundo plano continua novo até ser coletado.
+    """
+    return ([t for t in tickers if t not in mapa_dados_existentes] +
+            [t for t in tickers if t in mapa_dados_existentes])
+
+def coletar_sequencial(acoes_a_consultar, mapa_dados_existentes, prazo, use_local_strategy=False):
+    """
+    Coleta ticker a ticker. Retorna (registros coletados, tickers não despachados por prazo,
+    pares (ticker, fonte) de fato coletados nesta execução).
+    """
     dados_finais = []
+    coletadas = set()
     
     # Flag global: Se virar True, paramos de tentar o StatusInvest para TODOS
     status_invest_esgotado = False 
 
     total = len(acoes_a_consultar)
     for i, ticker in enumerate(acoes_a_consultar):
+        if not prazo.pode_despachar():
+            return dados_finais, acoes_a_consultar[i:], coletadas
+        inicio_ticker = time.monotonic()
         print(f"\n--- Processando {i+1}/{total}: {ticker} ---")
         
         dados_antigos = mapa_dados_existentes.get(ticker)
@@ -62,24 +117,12 @@ def main():
         
         # Cenário B: Temos dados antigos. Vamos ver se são recentes.
         elif dados_antigos:
-            data_att_str = dados_antigos.get('statusInvest_data_atualizacao')
-            if data_att_str:
-                try:
-                    # CORREÇÃO AQUI: Pegamos apenas os 10 primeiros caracteres (YYYY-MM-DD)
-                    # Isso funciona se tiver hora ("2025-12-01 10:00:00") ou não ("2025-12-01")
-                    data_str_limpa = data_att_str[:10] 
-                    data_att = datetime.strptime(data_str_limpa, "%Y-%m-%d")
-                    
-                    dias_passados = (datetime.now() - data_att).days
-                    
-                    if dias_passados < DIAS_VALIDADE_CACHE:
-                        print(f"ℹ️ Dados StatusInvest recentes ({dias_passados} dias). Mantendo cache.")
-                        usar_scraper_status = False
-                    else:
-                        print(f"Old Dados StatusInvest antigos ({dias_passados} dias). Tentando atualizar...")
-                except ValueError:
-                    # Se data estiver bugada, tenta atualizar
-                    pass
+            usar_scraper_status = not statusinvest_recente(dados_antigos)
+
+        if status_invest_esgotado:
+            METRICAS.contar(CACHE_STATUSINVEST, resultado='cota_esgotada')
+        else:
+            METRICAS.contar(CACHE_STATUSINVEST, resultado='falha' if usar_scraper_status else RESULTADO_ACERTO)
 
         # --- EXECUÇÃO ---
         
@@ -97,7 +140,8 @@ def main():
             # Chama o método. Se passar o segundo argumento, ele PULA o request caro.
             dados_novos = acao.get_all_data(
                 dados_existentes=dados_status_invest_para_injetar,
-                use_local_strategy=False # No GitHub Actions usa API e não local (False)
+                use_local_strategy=use_local_strategy, # No GitHub Actions usa API e não local (False)
+                normalizar=not NORMALIZACAO_EM_LOTE
             )
 
             # Verifica se houve erro fatal de chaves durante a execução dessa ação
@@ -115,6 +159,9 @@ def main():
                         dados_novos.update(dados_recuperados)
             
             dados_finais.append(dados_novos)
+            # StatusInvest injetado do JSON (ou recuperado após a cota) não conta como coletado
+            coletadas.update((ticker, fonte) for fonte in SCRAPERS_POR_FONTE
+                             if fonte != 'statusInvest' or usar_scraper_status and not status_invest_esgotado)
 
         except Exception as e:
             print(f"❌ Erro fatal em {ticker}: {e}")
@@ -122,13 +169,475 @@ def main():
             if dados_antigos:
                 dados_finais.append(dados_antigos)
 
-    # SALVAMENTO
+        prazo.registrar(time.monotonic() - inicio_ticker)
+
+    return dados_finais, [], coletadas
+
+def coletar_em_paralelo(acoes_a_consultar, mapa_dados_existentes, prazo):
+    """
+    Variante de coleta do main() para PROCESSOS_PARSE > 0 (ver models.coleta_paralela).
+    Mesma decisão de cache do StatusInvest; a flag de cota esgotada é compartilhada
+    entre os downloads em andamento.
+    """
+    from models.coleta_paralela import ColetaParalela
+
+    tarefas = []
+    for ticker in acoes_a_consultar:
+        dados_antigos = mapa_dados_existentes.get(ticker)
+        dados_status_invest_para_injetar = None
+        if dados_antigos and statusinvest_recente(dados_antigos):
+            dados_status_invest_para_injetar = extrair_apenas_statusinvest(dados_antigos)
+        METRICAS.contar(CACHE_STATUSINVEST,
+                        resultado='falha' if dados_status_invest_para_injetar is None else RESULTADO_ACERTO)
+        tarefas.append((ticker, dados_status_invest_para_injetar))
+
+    coleta = ColetaParalela(processos=PROCESSOS_PARSE, conexoes=CONEXOES_COLETA,
+                            normalizar=not NORMALIZACAO_EM_LOTE)
+    print(f"⚡ Coleta paralela: {CONEXOES_COLETA} conexões, {coleta.processos} processos de parse.")
+
+    total = len(dict.fromkeys(acoes_a_consultar))
+    injetados = {ticker for ticker, dados_injetar in tarefas if dados_injetar is not None}
+    resultados = {}
+    coletadas = set()
+    for i, (ticker, dados_novos) in enumerate(coleta.executar(tarefas, prazo)):
+        print(f"--- {i+1}/{total}: {ticker} concluído ---")
+        dados_antigos = mapa_dados_existentes.get(ticker)
+        statusinvest_coletado = ticker not in injetados
+        if dados_novos.get('statusInvest_erro') == "ALL_KEYS_EXHAUSTED":
+            statusinvest_coletado = False
+            if dados_antigos:
+                print(f"⛔ Cota de API esgotada. Recuperando dados antigos do StatusInvest para {ticker}...")
+                dados_novos.update(extrair_apenas_statusinvest(dados_antigos))
+        resultados[ticker] = dados_novos
+        coletadas.update((ticker, fonte) for fonte in SCRAPERS_POR_FONTE
+                         if fonte != 'statusInvest' or statusinvest_coletado)
+
+    return list(resultados.values()), coleta.nao_despachados, coletadas
+
+def coletar_statusinvest_por_saidas(plano, prazo):
+    """
+    Com duas ou mais saídas em PROXIES_SAIDA (utils.proxies), o StatusInvest local dos
+    tickers do plano é baixado antes, em paralelo, uma conexão por saída.
+    Retorna {ticker: registro do StatusInvest}; os que ficaram de fora seguem no sequencial.
+    """
+    pool = pool_de_saida()
+    tickers = [ticker for ticker, fontes in plano if 'statusInvest' in fontes]
+    if pool is None or len(pool) < 2 or not tickers:
+        return {}
+    print(f"\n🌐 StatusInvest local de {len(tickers)} tickers por {len(pool)} saídas em paralelo...")
+    # O espaçamento por host fica com o pool (um intervalo por saída)
+    coletados = recoletar([(ticker, 'statusInvest') for ticker in tickers], conexoes=len(pool),
+                          limitador=LimitadorTaxa(0), prazo=prazo, normalizar=not NORMALIZACAO_EM_LOTE,
+                          use_local_strategy=True)
+    return {ticker: dados for ticker, _, dados in coletados if dados is not None}
+
+def coletar_selecao(plano, mapa_dados_existentes, prazo, use_local_strategy):
+    """
+    Coleta só as fontes do plano e mescla sobre o registro anterior de cada ticker.
+    Retorna (registros coletados, tickers não despachados por prazo, pares (ticker, fonte)
+    de fato coletados nesta execução).
+    """
+    dados_coletados = []
+    coletadas = set()
+    status_invest_esgotado = False
+    statusinvest_pre_coletado = coletar_statusinvest_por_saidas(plano, prazo) if use_local_strategy else {}
+
+    total = len(plano)
+    for i, (ticker, fontes) in enumerate(plano):
+        if not prazo.pode_despachar():
+            return dados_coletados, [t for t, _ in plano[i:]], coletadas
+        inicio_ticker = time.monotonic()
+        print(f"\n--- {i+1}/{total}: {ticker} ({', '.join(fontes)}) ---")
+
+        dados_antigos = mapa_dados_existentes.get(ticker)
+        if status_invest_esgotado and 'statusInvest' in fontes:
+            fontes = [fonte for fonte in fontes if fonte != 'statusInvest']
+            if not fontes:
+                print("⚠️ Cota de API esgotada anteriormente. Mantendo dados antigos.")
+                continue
+
+        try:
+            dados_novos = Acao(ticker).get_all_data(
+                dados_existentes=dados_antigos,
+                fontes=fontes,
+                use_local_strategy=use_local_strategy,
+                normalizar=not NORMALIZACAO_EM_LOTE,
+                pre_coletados={'statusInvest': statusinvest_pre_coletado[ticker]}
+                if ticker in statusinvest_pre_coletado else None
+            )
+            if 'statusInvest' in fontes and dados_novos.get('statusInvest_erro') == "ALL_KEYS_EXHAUSTED":
+                print("⛔ LIMITE DE API ATINGIDO (Todas as chaves).")
+                status_invest_esgotado = True
+                fontes = [fonte for fonte in fontes if fonte != 'statusInvest']
+                if dados_antigos:
+                    dados_novos.update(extrair_apenas_statusinvest(dados_antigos))
+            dados_coletados.append(dados_novos)
+            coletadas.update((ticker, fonte) for fonte in fontes)
+        except Exception as e:
+            # Sem append: montar_lista_final mantém o registro anterior
+            print(f"❌ Erro fatal em {ticker}: {e}")
+
+        prazo.registrar(time.monotonic() - inicio_ticker)
+
+    return dados_coletados, [], coletadas
+
+def montar_lista_final(lista_canonica, dados_coletados, mapa_dados_existentes):
+    """
+    Devolve os registros na ordem da planilha, independentemente da ordem de coleta.
+    Tickers que não foram coletados (prazo) mantêm o registro anterior, se houver.
+    """
+    coletados = {dados['ticker']: dados for dados in dados_coletados}
+    dados_finais = []
+    for ticker in lista_canonica:
+        dados = coletados.get(ticker) or mapa_dados_existentes.get(ticker)
+        if dados is not None:
+            dados_finais.append(dados)
+    return dados_finais
+
+def salvar_resultados(dados_finais, mapa_dados_existentes, diretorio_por_ticker=None, por_fonte=False):
+    """
+    Grava o dados_acoes.json, o delta, (se configurado) o histórico e, com
+    diretorio_por_ticker, os arquivos por ticker. Retorna False se o JSON falhou.
+    """
+    with METRICAS.medir(ETAPA_ESCRITA):
+        # SALVAMENTO (registros não tocados são copiados do texto original, sem re-serializar)
+        try:
+            reaproveitados = salvar_dataset(dados_finais, JSON_FILE, anterior=mapa_dados_existentes)
+            print(f"\n✅ Processo concluído! Arquivo salvo: {JSON_FILE} "
+                  f"({len(dados_finais) - reaproveitados} registros serializados, {reaproveitados} mantidos)")
+        except IOError as e:
+            print(f"Erro crítico ao salvar JSON: {e}")
+            return False
+        METRICAS.contar(REGISTROS_REAPROVEITADOS, reaproveitados, resultado=RESULTADO_ACERTO)
+        METRICAS.contar(REGISTROS_REAPROVEITADOS, len(dados_finais) - reaproveitados, resultado='serializado')
+
+        # DELTA: apenas o que mudou em relação à execução anterior
+        try:
+            salvar_delta(calcular_delta(mapa_dados_existentes, dados_finais))
+        except IOError as e:
+            print(f"Erro ao salvar delta: {e}")
+
+        # HISTÓRICO (opcional, ativado por HISTORICO_DB)
+        gravar_historico_se_configurado(dados_finais)
+
+        # UM ARQUIVO POR TICKER (opcional): só os que mudaram são reescritos
+        if diretorio_por_ticker:
+            try:
+                gravados, mantidos, apagados = gravar_por_ticker(dados_finais, diretorio_por_ticker, por_fonte)
+                print(f"🗂️ Arquivos por ticker em {diretorio_por_ticker}/: {gravados} gravados, "
+                      f"{mantidos} sem mudança, {apagados} apagados.")
+            except OSError as e:
+                print(f"Erro ao gravar os arquivos por ticker: {e}")
+    return True
+
+def mesclar_e_salvar(total_shards, diretorio_por_ticker=None, por_fonte=False):
+    """Etapa final do modo sharded: junta os shards e grava como uma execução normal."""
+    mapa_dados_existentes = carregar_dados_existentes()
+    with METRICAS.medir(ETAPA_MESCLAGEM):
+        dados_finais, ausentes = mesclar_shards(total_shards, mapa_dados_existentes)
+    METRICAS.registrar_registros(dados_finais)
+    if ausentes:
+        print(f"⚠️ Shards ausentes: {ausentes}. Seus tickers mantêm os dados anteriores.")
+    print(f"🧩 {total_shards - len(ausentes)}/{total_shards} shards mesclados ({len(dados_finais)} tickers).")
+    salvar_resultados(dados_finais, mapa_dados_existentes, diretorio_por_ticker, por_fonte)
+
+def executar_shards_locais(total_shards, argumentos_extras=(), diretorio_por_ticker=None, por_fonte=False):
+    """
+    Simula a matrix do GitHub Actions na máquina local: sobe um processo
+    'main.py --shard i/N' por shard, espera todos e mescla o resultado.
+    """
+    limpar_shards(total_shards)
+    processos = [
+        subprocess.Popen([sys.executable, os.path.abspath(__file__), '--shard', f'{indice}/{total_shards}',
+                          *argumentos_extras])
+        for indice in range(1, total_shards + 1)
+    ]
+    for indice, processo in enumerate(processos, start=1):
+        if processo.wait() != 0:
+            print(f"❌ Shard {indice}/{total_shards} terminou com código {processo.returncode}.")
+    mesclar_e_salvar(total_shards, diretorio_por_ticker, por_fonte)
+
+def _argumento_shard(texto):
+    try:
+        return interpretar_shard(texto)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+def _argumento_fontes(texto):
+    try:
+        return interpretar_fontes(texto)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+def interpretar_argumentos(argv=None):
+    parser = argparse.ArgumentParser(description="Atualiza o dados_acoes.json a partir dos sites de indicadores.")
+    modo = parser.add_mutually_exclusive_group()
+    modo.add_argument('--shard', type=_argumento_shard, metavar='I/N',
+                      help="Coleta só a fatia I de N (partição estável por hash do ticker) e grava em shards/.")
+    modo.add_argument('--merge-shards', type=int, metavar='N',
+                      help="Mescla os N arquivos de shard no dados_acoes.json.")
+    modo.add_argument('--local-shards', type=int, metavar='N',
+                      help="Roda N shards em processos locais e mescla no fim.")
+    parser.add_argument('--priority', choices=PRIORIDADES, default=PRIORIDADE_DEFASAGEM,
+                        help="Ordem de coleta: fontes mais desatualizadas primeiro (padrão), "
+                             "maior liquidez média diária primeiro, ou a ordem da planilha.")
+    parser.add_argument('--deadline', type=float, metavar='MINUTOS',
+                        help="Tempo máximo da execução. Perto do limite, para de iniciar tickers "
+                             "novos e salva; os restantes mantêm os dados anteriores.")
+    parser.add_argument('--retry-concurrency', type=int, default=CONEXOES_RETENTATIVA, metavar='N',
+                        help="Conexões do passe de retentativa das fontes que falharam (0 desativa).")
+    parser.add_argument('--anomaly-concurrency', type=int, default=CONEXOES_RETENTATIVA, metavar='N',
+                        help="Conexões da nova coleta dos pares (ticker, fonte) com valores suspeitos "
+                             "(0 só informa, sem coletar de novo).")
+    selecao = parser.add_argument_group("atualização seletiva (mescla sobre o dados_acoes.json atual)")
+    selecao.add_argument('--sources', type=_argumento_fontes, metavar='FONTE[,FONTE...]',
+                         help=f"Coleta só estas fontes ({', '.join(SCRAPERS_POR_FONTE)}).")
+    selecao.add_argument('--tickers', type=interpretar_tickers, metavar='TICKER[,TICKER...]',
+                         help="Coleta só estes tickers (em vez da planilha). Os demais são mantidos.")
+    selecao.add_argument('--only-errored', action='store_true',
+                         help="Só os tickers/fontes cujo campo '<fonte>_erro' está preenchido.")
+    local = parser.add_argument_group("execução local")
+    local.add_argument('--local', action='store_true',
+                       help="StatusInvest via requests direto, em vez da API ScrapeNinja.")
+    local.add_argument('--git', action='store_true',
+                       help="git pull antes e add/commit/push do JSON e do delta depois.")
+    local.add_argument('--commit-message', metavar='MSG',
+                       help="Mensagem do commit com --git.")
+    local.add_argument('--proxies', metavar='URL[,URL...]',
+                       help=f"Pool de saídas do StatusInvest local (proxies HTTP ou 'direto'); "
+                            f"o mesmo que {VARIAVEL_PROXIES}. Com duas ou mais, coleta em paralelo.")
+    saida = parser.add_argument_group("saída por ticker")
+    saida.add_argument('--per-ticker-dir', metavar='DIR',
+                       help="Também grava um arquivo por ticker e um manifesto em DIR (só os que mudaram).")
+    saida.add_argument('--per-source-files', action='store_true',
+                       help="Com --per-ticker-dir, também um arquivo por fonte de cada ticker.")
+    parser.add_argument('--metrics-dir', default=DIRETORIO_METRICAS, metavar='DIR',
+                        help="Onde gravar o relatório da execução (JSON) e as métricas no formato do Prometheus.")
+    perfil = parser.add_argument_group("perfilamento (também ativado por PERFILAMENTO=1)")
+    perfil.add_argument('--profile', action='store_true', default=os.getenv('PERFILAMENTO') == '1',
+                        help="cProfile por fonte, relatório do tracemalloc e pilhas para flamegraph.")
+    perfil.add_argument('--profile-dir', default=DIRETORIO_PERFIL, metavar='DIR',
+                        help="Onde gravar os .pstats, alocacoes.txt e pilhas.folded.")
+    perfil.add_argument('--profile-top', type=int, default=TOP_ALOCACOES, metavar='N',
+                        help="Linhas do relatório de alocações.")
+    gravacao = parser.add_argument_group("gravação e reprodução das requisições HTTP")
+    arquivo = gravacao.add_mutually_exclusive_group()
+    arquivo.add_argument('--record', metavar='ARQ',
+                         help="Grava todas as requisições e respostas da execução em ARQ (.jsonl.gz).")
+    arquivo.add_argument('--replay', metavar='ARQ',
+                         help="Responde as requisições a partir de ARQ, sem rede.")
+    gravacao.add_argument('--replay-timing', action='store_true',
+                          help="Com --replay, cada resposta demora o que demorou na gravação.")
+    return parser.parse_args(argv)
+
+def gravar_metricas(args, argv):
+    """
+    Relatório da execução; cada shard grava o seu, com o índice no nome do arquivo e no
+    rótulo 'shard' das séries do Prometheus (a mesclagem grava sem o rótulo).
+    """
+    sufixo = ''
+    contexto = {'argv': list(sys.argv[1:] if argv is None else argv)}
+    rotulos = None
+    if args.shard:
+        indice, total_shards = args.shard
+        sufixo = f'.shard-{indice}-de-{total_shards}'
+        contexto['shard'] = f'{indice}/{total_shards}'
+        rotulos = {'shard': contexto['shard']}
     try:
-        with open(JSON_FILE, 'w', encoding='utf-8') as json_file:
-            json.dump(dados_finais, json_file, indent=4, ensure_ascii=False)
-        print(f"\n✅ Processo concluído! Arquivo salvo: {JSON_FILE}")
-    except IOError as e:
-        print(f"Erro crítico ao salvar JSON: {e}")
+        caminho_json, caminho_prom = METRICAS.gravar(args.metrics_dir, sufixo, contexto, rotulos)
+        print(f"📊 Métricas da execução: {caminho_json}, {caminho_prom}")
+    except OSError as e:
+        print(f"⚠️ Não foi possível gravar as métricas: {e}")
+
+def iniciar_gravacao(args, argv):
+    """Liga --record/--replay; cada shard grava (e reproduz) o seu arquivo."""
+    caminho = args.record or args.replay
+    if not caminho or args.local_shards or args.merge_shards:
+        return
+    if args.shard:
+        caminho = caminho_do_shard(caminho, *args.shard)
+    if args.record:
+        ativar_gravacao(caminho, {'argv': list(sys.argv[1:] if argv is None else argv)})
+        print(f"⏺️ Gravando as requisições em {caminho}")
+        return
+    reprodutor = ativar_reproducao(caminho, args.replay_timing)
+    # Mesmos desvios de host da gravação (servidor simulado etc.), salvo os definidos agora
+    for nome, valor in reprodutor.cabecalho.get('urls_base', {}).items():
+        os.environ.setdefault(nome, valor)
+    if not (os.getenv('RAPIDAPI_KEYS') or os.getenv('RAPIDAPI_KEY')):
+        # O StatusInvest só tenta a API com chaves; as gravadas não vão no arquivo
+        total_chaves = reprodutor.cabecalho.get('chaves_api', 0)
+        os.environ['RAPIDAPI_KEYS'] = ','.join(f'reproducao{i}' for i in range(total_chaves))
+    print(f"⏯️ Reproduzindo {len(reprodutor)} requisições de {caminho} "
+          f"(gravado em {reprodutor.cabecalho.get('gravado_em')})")
+
+def fixar_hora_de_referencia():
+    """
+    Hora de referência da execução (utils.relogio): a da gravação no --replay, senão a
+    atual, que o --record guarda.
+    """
+    gravada = entrada_gravada(ENTRADA_RELOGIO)
+    if gravada is not None:
+        fixar_referencia(datetime.fromisoformat(gravada))
+        print(f"⏯️ Hora de referência da gravação: {gravada}.")
+        return
+    registrar_entrada(ENTRADA_RELOGIO, fixar_referencia().isoformat(timespec='seconds'))
+
+def encerrar_e_resumir_gravacao():
+    encerrado = encerrar_gravacao()
+    if isinstance(encerrado, Reprodutor):
+        print(f"⏯️ Reprodução: {encerrado.servidas} respostas servidas, "
+              f"{encerrado.nao_gravadas} requisições sem gravação.")
+    elif encerrado is not None:
+        print(f"⏺️ {encerrado.total} requisições gravadas em {encerrado.caminho}")
+
+def main(argv=None):
+    args = interpretar_argumentos(argv)
+    iniciar_gravacao(args, argv)
+    fixar_hora_de_referencia()
+    if args.profile:
+        diretorio = args.profile_dir
+        if args.shard:
+            diretorio = os.path.join(diretorio, f'shard-{args.shard[0]}-de-{args.shard[1]}')
+        PERFIL.ativar(diretorio, top=args.profile_top)
+    try:
+        with PERFIL.escopo(ROTULO_EXECUCAO):
+            executar(args)
+    finally:
+        encerrar_e_resumir_gravacao()
+        gravar_metricas(args, argv)
+        PERFIL.finalizar()
+
+def executar(args):
+    if args.proxies:
+        # Pela variável o pool chega também aos scrapers e aos processos de --local-shards
+        os.environ[VARIAVEL_PROXIES] = args.proxies
+    if args.merge_shards:
+        mesclar_e_salvar(args.merge_shards, args.per_ticker_dir, args.per_source_files)
+        return
+    if args.local_shards:
+        argumentos_extras = ['--priority', args.priority, '--metrics-dir', args.metrics_dir]
+        if args.profile:
+            argumentos_extras += ['--profile', '--profile-dir', args.profile_dir,
+                                  '--profile-top', str(args.profile_top)]
+        if args.deadline:
+            argumentos_extras += ['--deadline', str(args.deadline)]
+        if args.record:
+            argumentos_extras += ['--record', args.record]
+        if args.replay:
+            argumentos_extras += ['--replay', args.replay] + (['--replay-timing'] if args.replay_timing else [])
+        executar_shards_locais(args.local_shards, argumentos_extras, args.per_ticker_dir, args.per_source_files)
+        return
+
+    if args.git and not sincronizar():
+        return
+
+    seletivo = bool(args.sources or args.tickers or args.only_errored)
+
+    # 1. Carrega o estado atual do banco de dados (JSON)
+    mapa_dados_existentes = carregar_dados_existentes()
+
+    lista_provider = None
+    if args.tickers:
+        # Tickers avulsos: a saída é o dataset atual, com os novos no fim
+        acoes_a_consultar = args.tickers
+        lista_completa = list(mapa_dados_existentes) + [t for t in args.tickers if t not in mapa_dados_existentes]
+    elif entrada_gravada(ENTRADA_TICKERS) is not None:
+        # --replay: a lista da gravação, sem consultar o cache local nem a planilha
+        lista_completa = entrada_gravada(ENTRADA_TICKERS)
+        acoes_a_consultar = lista_completa
+        print(f"⏯️ Lista de tickers da gravação ({len(lista_completa)} ações).")
+    else:
+        lista_provider = ListaTicker()
+        # acoes_a_consultar = ["ABEV3","ITSA4","EGIE3","FLRY3"] # Para teste
+        lista_completa = lista_provider.obter_lista_ticker()
+        acoes_a_consultar = lista_completa
+        registrar_entrada(ENTRADA_TICKERS, lista_completa)
+
+    if not acoes_a_consultar:
+        print("Nenhuma ação para consultar.")
+        return
+
+    lista_saida = lista_completa
+    if args.shard:
+        indice, total_shards = args.shard
+        acoes_a_consultar = filtrar_shard(acoes_a_consultar, indice, total_shards)
+        lista_saida = filtrar_shard(lista_completa, indice, total_shards)
+        print(f"🧩 Shard {indice}/{total_shards}: {len(acoes_a_consultar)} de {len(lista_completa)} tickers.")
+        if not acoes_a_consultar:
+            # Shard vazio ainda gera arquivo, senão a mesclagem o trataria como ausente
+            salvar_shard([], lista_completa, indice, total_shards)
+            return
+
+    print("\nIniciando atualização inteligente...")
+    
+    # 2. Ordena o trabalho por prioridade; o JSON final continua na ordem da planilha
+    acoes_priorizadas = novos_na_frente(ordenar_por_prioridade(acoes_a_consultar, mapa_dados_existentes,
+                                                               args.priority), mapa_dados_existentes)
+    prazo = Prazo(args.deadline)
+
+    if seletivo:
+        fontes = args.sources or list(SCRAPERS_POR_FONTE)
+        plano = planejar_selecao(acoes_priorizadas, fontes, mapa_dados_existentes, args.only_errored)
+        print(f"🎯 Atualização seletiva: {len(plano)} tickers ({', '.join(fontes)}).")
+        if PROCESSOS_PARSE > 0:
+            print("ℹ️ PROCESSOS_PARSE é ignorado na atualização seletiva (coleta sequencial).")
+        dados_coletados, pendentes, coletadas = coletar_selecao(plano, mapa_dados_existentes, prazo, args.local)
+    elif PROCESSOS_PARSE > 0:
+        dados_coletados, pendentes, coletadas = coletar_em_paralelo(acoes_priorizadas, mapa_dados_existentes, prazo)
+    else:
+        dados_coletados, pendentes, coletadas = coletar_sequencial(acoes_priorizadas, mapa_dados_existentes,
+                                                                   prazo, args.local)
+
+    METRICAS.contar(TICKERS_DESPACHADOS, len(dados_coletados), resultado=RESULTADO_ACERTO)
+    METRICAS.contar(TICKERS_DESPACHADOS, len(pendentes), resultado='prazo')
+    if pendentes:
+        print(f"\n⏱️ Prazo de {args.deadline:g} min atingido: {len(pendentes)} tickers não atualizados "
+              f"(mantidos com os dados anteriores): {', '.join(pendentes)}")
+
+    pool = pool_de_saida()
+    if pool is not None and any(saida.requisicoes for saida in pool.saidas):
+        print("\n🌐 Saídas:")
+        print('\n'.join(pool.resumo()))
+
+    # Registros mantidos da execução anterior não entram (são reaproveitados como texto)
+    novos = [dados for dados in dados_coletados if mapa_dados_existentes.get(dados['ticker']) is not dados]
+
+    # 3. Segundo passe só para os pares (ticker, fonte) que falharam, com menos pressão nos hosts
+    if args.retry_concurrency > 0:
+        retentar_falhas(novos, coletadas, conexoes=args.retry_concurrency, prazo=prazo,
+                        normalizar=not NORMALIZACAO_EM_LOTE, use_local_strategy=args.local)
+
+    if lista_provider is not None and not lista_provider.aguardar_atualizacao(timeout=30):
+        print("⚠️ Atualização da lista de tickers ainda em andamento; fica para a próxima execução.")
+
+    if NORMALIZACAO_EM_LOTE:
+        # Só os registros recém-coletados: os mantidos já estão normalizados
+        from utils.normalizacao_lote import normalizar_registros
+        with METRICAS.medir(ETAPA_NORMALIZACAO):
+            total_celulas = normalizar_registros(dados_coletados)
+        print(f"\n🔢 Normalização em lote: {total_celulas} células convertidas.")
+
+    # 4. Valores suspeitos (comparados com a execução anterior e entre as fontes): nova coleta só desses pares
+    revalidar(novos, coletadas, mapa_dados_existentes, conexoes=args.anomaly_concurrency, prazo=prazo,
+              use_local_strategy=args.local)
+    METRICAS.registrar_registros(dados_coletados)
+
+    with METRICAS.medir(ETAPA_MESCLAGEM):
+        dados_finais = montar_lista_final(lista_saida, dados_coletados, mapa_dados_existentes)
+
+    if args.shard:
+        # Delta e histórico ficam para a mesclagem (--merge-shards)
+        with METRICAS.medir(ETAPA_ESCRITA):
+            salvar_shard(dados_finais, lista_completa, indice, total_shards)
+        return
+
+    if not salvar_resultados(dados_finais, mapa_dados_existentes, args.per_ticker_dir, args.per_source_files):
+        return
+
+    if args.git:
+        mensagem = args.commit_message or f"Update Local {usuario_local()}"
+        publicar([JSON_FILE, ARQUIVO_DELTA_PADRAO] + ([args.per_ticker_dir] if args.per_ticker_dir else []), mensagem)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,10 +1,8 @@
 from datetime import datetime
 import pytz
-from scrapers.investidor10_scraper import Investidor10Scraper
-from scrapers.fundamentus_scraper import FundamentusScraper
-from scrapers.statusinvest_scraper import StatusInvestScraper
-from scrapers.investsitepassivo_scraper import InvestSitePassivoScraper
-from scrapers.investsiteindicadores_scraper import InvestSiteIndicadoresScraper
+from scrapers.base_scraper import SCRAPERS_POR_FONTE
+from models.schema import ordenar_registro
+from models.registro import RegistroAcao
 
 class Acao:
     def __init__(self, ticker):
@@ -13,106 +11,123 @@ class Acao:
 
     def _reorganizar_json(self, dados_desordenados):
         """
-        Reconstrói o dicionário garantindo que as chaves fiquem agrupadas
-        por fonte (prefixo), independentemente da ordem de inserção.
+        Reconstrói o dicionário na ordem fixa do esquema (models.schema), com as
+        chaves agrupadas por fonte, independentemente da ordem de inserção.
+        Um RegistroAcao já itera na ordem do esquema e é devolvido como está.
         """
-        ordem_prefixos = [
-            "ticker",
-            "investidor10",
-            "fundamentus",
-            "statusInvest",
-            "investsitepassivo",
-            "investsiteindicadores",
-            "atualizado_em"
-        ]
-        
-        dados_ordenados = {}
-        
-        # 1. Itera sobre a ordem desejada de prefixos
-        for prefixo in ordem_prefixos:
-            # Pega todas as chaves do dicionário que começam com esse prefixo
-            # (Exceto 'ticker' e 'atualizado_em' que são exatos)
-            chaves_do_grupo = [k for k in dados_desordenados.keys() if k.startswith(prefixo) or k == prefixo]
-            
-            # Opcional: ordenar alfabeticamente DENTRO do grupo
-            # chaves_do_grupo.sort() 
-            
-            for k in chaves_do_grupo:
-                dados_ordenados[k] = dados_desordenados[k]
-        
-        # 2. Adiciona chaves que sobraram (se houver alguma fora do padrão)
-        for k, v in dados_desordenados.items():
-            if k not in dados_ordenados:
-                dados_ordenados[k] = v
-                
-        return dados_ordenados
+        if isinstance(dados_desordenados, RegistroAcao):
+            return dados_desordenados
+        return ordenar_registro(dados_desordenados)
+
+    @staticmethod
+    def _como_registro(dados):
+        """Cópia dos dados como RegistroAcao (aceita dict lido do JSON ou RegistroAcao)."""
+        if isinstance(dados, RegistroAcao):
+            return dados.copy()
+        return RegistroAcao.de_dict(dados)
 
 
-    def get_all_data(self, dados_existentes=None, apenas_statusinvest=False, use_local_strategy=False):
+    def get_all_data(self, dados_existentes=None, apenas_statusinvest=False, use_local_strategy=False, normalizar=True,
+                     fontes=None, pre_coletados=None):
         """
-        :param dados_existentes: Dict com dados antigos (do JSON).
-        :param apenas_statusinvest: Se True, NÃO roda Fundamentus/Inv10. Só atualiza StatusInvest.
+        :param dados_existentes: Dados antigos (dict do JSON ou RegistroAcao). No modo completo,
+                                 só os campos do StatusInvest são usados (cache da API).
+        :param apenas_statusinvest: Atalho para fontes={'statusInvest'} com requests local.
         :param use_local_strategy: Se True, usa requests direto para StatusInvest.
+        :param normalizar: Se False, os scrapers guardam os campos numéricos como texto bruto
+                           e a conversão fica para utils.normalizacao_lote.normalizar_registros.
+        :param fontes: Se informado (ex: {'investsitepassivo', 'investsiteindicadores'}), roda
+                       SÓ esses scrapers e mescla o resultado sobre dados_existentes, que
+                       neste modo é o registro completo anterior.
+        :param pre_coletados: No modo seletivo, {fonte: registro} já coletados antes (ex: o
+                              StatusInvest baixado em paralelo pelas saídas de utils.proxies).
         """
         
         # --- MODO: APENAS STATUS INVEST (Local) ---
         if apenas_statusinvest:
-            if not dados_existentes:
-                print(f"⚠️ Alerta: Tentando atualizar apenas StatusInvest para {self.ticker} sem dados prévios.")
-                dados_combinados = {"ticker": self.ticker}
-            else:
-                # Copia os dados antigos (preserva Fundamentus, Inv10, etc.)
-                dados_combinados = dados_existentes.copy()
-            
-            # Executa APENAS o scraper do StatusInvest
-            print(f"Coletando APENAS StatusInvest para {self.ticker}...")
-            dados_novos_si = StatusInvestScraper(self.ticker).fetch_data(use_local_strategy=True)
-            
-            # Atualiza/Mescla os dados
-            dados_combinados.update(dados_novos_si)
-            
-            # Atualiza timestamp
-            brasilia_tz = pytz.timezone('America/Sao_Paulo')
-            dados_combinados["atualizado_em"] = datetime.now(brasilia_tz).strftime("%Y-%m-%d %H:%M:%S")
-            
-            dados_finais = self._reorganizar_json(dados_combinados)
-
-            print(f"Dados de {self.ticker} processados.")
-            return dados_finais # Retorna o organizado
+            fontes = {'statusInvest'}
+            use_local_strategy = True
 
+        # --- MODO: SELETIVO (fontes escolhidas, preserva o resto) ---
+        if fontes is not None:
+            return self._atualizar_fontes(dados_existentes, fontes, use_local_strategy, normalizar, pre_coletados)
 
         # --- MODO: COMPLETO (GitHub Actions / Update Geral) ---
         print(f"Coletando DADOS COMPLETOS para {self.ticker}...")
 
         # Scrapers Leves
-        dados_inv10 = Investidor10Scraper(self.ticker).fetch_data()
-        dados_fund = FundamentusScraper(self.ticker).fetch_data()
-        dados_investsite_passivo = InvestSitePassivoScraper(self.ticker).fetch_data()
-        dados_investsite_indicadores = InvestSiteIndicadoresScraper(self.ticker).fetch_data()
+        dados_por_fonte = {
+            fonte: classe(self.ticker, normalizar).fetch_data()
+            for fonte, classe in SCRAPERS_POR_FONTE.items() if fonte != 'statusInvest'
+        }
 
-        # Lógica StatusInvest
-        dados_statusinvest = {}
-        
-        # Se temos dados antigos injetados (para economizar API)
-        if dados_existentes and 'statusInvest_data_atualizacao' in dados_existentes:
-             # Aqui extraímos apenas os campos do StatusInvest do dicionário antigo
-             dados_statusinvest = {k: v for k, v in dados_existentes.items() if k.startswith('statusInvest')}
+        # Lógica StatusInvest: se temos dados antigos injetados, economiza a API
+        dados_statusinvest = self.statusinvest_em_cache(dados_existentes)
+        if dados_statusinvest is not None:
              print(f"🔄 Mantendo dados antigos de StatusInvest para {self.ticker}.")
         else:
              # Se não tem cache, usa API
-             dados_statusinvest = StatusInvestScraper(self.ticker).fetch_data(use_local_strategy=False)
-
-        dados_combinados = {
-            "ticker": self.ticker,
-            **dados_inv10,
-            **dados_fund,
-            **dados_statusinvest,
-            **dados_investsite_passivo,
-            **dados_investsite_indicadores
-        }
+             dados_statusinvest = SCRAPERS_POR_FONTE['statusInvest'](self.ticker, normalizar).fetch_data(use_local_strategy=False)
+        dados_por_fonte['statusInvest'] = dados_statusinvest
+
+        return self.montar_registro(dados_por_fonte)
+
+    def _atualizar_fontes(self, dados_existentes, fontes, use_local_strategy, normalizar, pre_coletados=None):
+        desconhecidas = set(fontes) - set(SCRAPERS_POR_FONTE)
+        if desconhecidas:
+            raise ValueError(f"Fontes desconhecidas: {', '.join(sorted(desconhecidas))}")
+
+        if not dados_existentes:
+            print(f"⚠️ Alerta: Atualizando só {', '.join(fontes)} para {self.ticker} sem dados prévios.")
+            dados_combinados = RegistroAcao(self.ticker)
+        else:
+            # Copia os dados antigos (preserva as fontes que não serão coletadas)
+            dados_combinados = self._como_registro(dados_existentes)
+
+        print(f"Coletando APENAS {', '.join(f for f in SCRAPERS_POR_FONTE if f in fontes)} para {self.ticker}...")
+        for fonte in SCRAPERS_POR_FONTE:
+            if fonte not in fontes:
+                continue
+            if pre_coletados and fonte in pre_coletados:
+                dados_combinados.mesclar(pre_coletados[fonte])
+                continue
+            # Só as classes das fontes pedidas são importadas
+            scraper = SCRAPERS_POR_FONTE[fonte](self.ticker, normalizar)
+            if fonte == 'statusInvest':
+                dados_fonte = scraper.fetch_data(use_local_strategy=use_local_strategy)
+            else:
+                dados_fonte = scraper.fetch_data()
+            # Atualiza/Mescla os dados
+            dados_combinados.mesclar(dados_fonte)
+
+        # Atualiza timestamp
+        brasilia_tz = pytz.timezone('America/Sao_Paulo')
+        dados_combinados["atualizado_em"] = datetime.now(brasilia_tz).strftime("%Y-%m-%d %H:%M:%S")
+
+        print(f"Dados de {self.ticker} processados.")
+        return dados_combinados # RegistroAcao já sai na ordem do esquema
+
+    def statusinvest_em_cache(self, dados_existentes):
+        """Campos do StatusInvest dos dados injetados, ou None se não há cache a reaproveitar."""
+        if dados_existentes and 'statusInvest_data_atualizacao' in dados_existentes:
+            # Aqui extraímos apenas os campos do StatusInvest do dicionário antigo
+            return self._como_registro(dados_existentes).extrair_fonte('statusInvest')
+        return None
+
+    def montar_registro(self, dados_por_fonte):
+        """
+        Junta os resultados de cada fonte ({fonte: registro ou dict}) em um único
+        RegistroAcao e carimba 'atualizado_em'. Usado tanto pela coleta sequencial
+        quanto pela coleta paralela (models.coleta_paralela).
+        """
+        # Monta o registro direto na ordem do esquema, sem dicts intermediários
+        dados_combinados = RegistroAcao(self.ticker)
+        for fonte in SCRAPERS_POR_FONTE:
+            if dados_por_fonte.get(fonte) is not None:
+                dados_combinados.mesclar(dados_por_fonte[fonte])
 
         brasilia_tz = pytz.timezone('America/Sao_Paulo')
         dados_combinados["atualizado_em"] = datetime.now(brasilia_tz).strftime("%Y-%m-%d %H:%M:%S")
 
         print(f"Dados de {self.ticker} processados.")
-        return dados_combinados
\ No newline at end of file
+        return dados_combinados
@@ -0,0 +1,175 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from models.acao import Acao
+from scrapers.base_scraper import SCRAPERS_POR_FONTE
+from utils.metricas import METRICAS, ETAPA_FILA, ETAPA_PARSE
+from utils.perfilamento import PERFIL, perfilar_chamada
+from utils.relogio import fixar_referencia, referencia
+
+CONEXOES_PADRAO = 8
+ERRO_COTA_ESGOTADA = "ALL_KEYS_EXHAUSTED"
+
+# Definido por _iniciar_processo em cada processo de parse
+_perfilar_parse = False
+
+
+def _iniciar_processo(perfilar, hora_referencia=None):
+    """
+    Inicializador dos processos de parse. O perfilamento e a hora de referência
+    (utils.relogio, usada nos rótulos dos anos) vêm por argumento, e não do estado
+    herdado, porque com spawn/forkserver (macOS, padrão do Python 3.14) o filho não
+    herda o estado do pai.
+    """
+    global _perfilar_parse
+    _perfilar_parse = perfilar
+    if hora_referencia is not None:
+        fixar_referencia(hora_referencia)
+
+
+def _parse_em_processo(fonte, ticker, html, normalizar, argumentos_parse):
+    """
+    Roda no processo filho: só CPU (BeautifulSoup + normalização). Devolve (dict simples,
+    duração do parse, estatísticas do cProfile ou None); duração e perfil são registrados
+    pelo processo principal.
+    """
+    inicio = time.perf_counter()
+    scraper = SCRAPERS_POR_FONTE[fonte](ticker, normalizar)
+    if _perfilar_parse:
+        registro, estatisticas = perfilar_chamada(scraper.parse, html, *argumentos_parse)
+    else:
+        registro, estatisticas = scraper.parse(html, *argumentos_parse), None
+    return registro.para_dict(), time.perf_counter() - inicio, estatisticas
+
+
+class ColetaParalela:
+    """
+    Coleta em dois estágios:
+      1. Rede: um pool de threads baixa o HTML de cada (ticker, fonte).
+      2. CPU: um pool de processos roda o parse() do scraper sobre o HTML baixado.
+
+    O parse com BeautifulSoup é preso ao GIL, então só escala com processos; já o
+    download passa a maior parte do tempo esperando I/O e fica nas threads.
+    Um parse que falha (ex: tabela ausente no HTML) conta como tentativa e,
+    se o scraper permitir, volta para o estágio de rede.
+    """
+
+    def __init__(self, processos=None, conexoes=CONEXOES_PADRAO, normalizar=True, use_local_strategy=False):
+        """
+        :param processos: Processos de parse (None = os.cpu_count()).
+        :param conexoes: Downloads simultâneos.
+        :param normalizar: Repassado aos scrapers (ver Acao.get_all_data).
+        :param use_local_strategy: Estratégia de download do StatusInvest.
+        """
+        self.processos = processos or os.cpu_count()
+        self.conexoes = conexoes
+        self.normalizar = normalizar
+        self.use_local_strategy = use_local_strategy
+        self.cota_statusinvest_esgotada = False
+        self.nao_despachados = []
+
+    def _baixar(self, ticker, fonte, tentativa, enfileirado=None):
+        """Estágio de rede. Retorna (html, argumentos extras do parse)."""
+        if enfileirado is not None:
+            METRICAS.observar(ETAPA_FILA, time.perf_counter() - enfileirado, fonte)
+        if tentativa:
+            METRICAS.dormir(1 * tentativa, fonte)
+        scraper = SCRAPERS_POR_FONTE[fonte](ticker, self.normalizar)
+        if fonte != 'statusInvest':
+            return scraper.baixar(), ()
+
+        # Depois que todas as chaves da API esgotam, nem tenta os tickers restantes
+        if self.cota_statusinvest_esgotada:
+            raise Exception(ERRO_COTA_ESGOTADA)
+        try:
+            html, origem = scraper.baixar(self.use_local_strategy)
+        except Exception as e:
+            if str(e) == ERRO_COTA_ESGOTADA:
+                self.cota_statusinvest_esgotada = True
+            raise
+        return html, (origem,)
+
+    def _registro_de_falha(self, ticker, fonte, erro):
+        return SCRAPERS_POR_FONTE[fonte](ticker, self.normalizar).registro_de_falha(erro)
+
+    def executar(self, tarefas, prazo=None):
+        """
+        :param tarefas: Lista de (ticker, dados_statusinvest), na ordem de prioridade.
+                        Se dados_statusinvest não for None (cache ainda válido), o
+                        StatusInvest não é baixado.
+        :param prazo: utils.agendador.Prazo opcional. Esgotado o prazo, nenhum ticker
+                      novo é despachado; os que ficaram de fora vão para self.nao_despachados.
+        :return: Gerador de (ticker, RegistroAcao), na ordem em que cada ticker termina.
+        """
+        resultados = {}
+        faltando = {}
+        inicio = {}
+        pendentes = {}
+        fila = iter(tarefas)
+        self.nao_despachados = []
+
+        # Importa os scrapers antes de abrir os pools: com fork, um processo de parse
+        # criado no meio do import feito por uma thread de rede ficaria preso no lock
+        # desse import.
+        SCRAPERS_POR_FONTE.carregar_todos()
+
+        with ThreadPoolExecutor(max_workers=self.conexoes) as rede, \
+             ProcessPoolExecutor(max_workers=self.processos, initializer=_iniciar_processo,
+                                 initargs=(PERFIL.ativo, referencia())) as cpu:
+
+            def agendar_download(ticker, fonte, tentativa):
+                futuro = rede.submit(self._baixar, ticker, fonte, tentativa, time.perf_counter())
+                pendentes[futuro] = (ticker, fonte, tentativa, 'rede')
+
+            def despachar():
+                # Mantém no máximo 'conexoes' tickers em andamento, para o prazo valer
+                # sobre o que ainda não começou em vez de tudo ir para a fila de uma vez.
+                for ticker, dados_statusinvest in fila:
+                    if ticker in inicio:
+                        continue
+                    if prazo is not None and not prazo.pode_despachar():
+                        self.nao_despachados.append(ticker)
+                        self.nao_despachados.extend(t for t, _ in fila if t not in inicio)
+                        return
+                    inicio[ticker] = time.monotonic()
+                    cache = Acao(ticker).statusinvest_em_cache(dados_statusinvest)
+                    resultados[ticker] = {'statusInvest': cache} if cache is not None else {}
+                    fontes = [f for f in SCRAPERS_POR_FONTE if f not in resultados[ticker]]
+                    faltando[ticker] = len(fontes)
+                    for fonte in fontes:
+                        agendar_download(ticker, fonte, 0)
+                    if len(faltando) >= self.conexoes:
+                        return
+
+            despachar()
+            while pendentes:
+                concluidos, _ = wait(pendentes, return_when=FIRST_COMPLETED)
+                for futuro in concluidos:
+                    ticker, fonte, tentativa, estagio = pendentes.pop(futuro)
+                    try:
+                        valor = futuro.result()
+                    except Exception as e:
+                        print(f"Tentativa {tentativa+1} para {ticker} em {fonte} falhou: {e}")
+                        if tentativa + 1 < SCRAPERS_POR_FONTE[fonte].MAX_TENTATIVAS:
+                            agendar_download(ticker, fonte, tentativa + 1)
+                            continue
+                        valor = self._registro_de_falha(ticker, fonte, str(e))
+                    else:
+                        if estagio == 'rede':
+                            html, argumentos_parse = valor
+                            futuro_parse = cpu.submit(_parse_em_processo, fonte, ticker, html,
+                                                      self.normalizar, argumentos_parse)
+                            pendentes[futuro_parse] = (ticker, fonte, tentativa, 'parse')
+                            continue
+                        valor, duracao_parse, estatisticas = valor
+                        METRICAS.observar(ETAPA_PARSE, duracao_parse, fonte)
+                        PERFIL.incorporar(fonte, estatisticas)
+
+                    resultados[ticker][fonte] = valor
+                    faltando[ticker] -= 1
+                    if faltando[ticker] == 0:
+                        del faltando[ticker]
+                        if prazo is not None:
+                            prazo.registrar(time.monotonic() - inicio[ticker])
+                        yield ticker, Acao(ticker).montar_registro(resultados.pop(ticker))
+                        despachar()
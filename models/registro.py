@@ -0,0 +1,161 @@
+from collections.abc import MutableMapping
+from models.schema import ORDEM_CAMPOS, INDICE_CAMPO, FAIXAS_FONTE, fonte_do_campo
+
+# Marca posições sem chave. Diferente de None, que é um valor válido (null no JSON).
+_AUSENTE = object()
+
+_TOTAL_CAMPOS = len(ORDEM_CAMPOS)
+
+
+class RegistroAcao(MutableMapping):
+    """
+    Registro compacto de uma ação: uma lista com uma posição por campo do esquema,
+    em vez de um dict com ~300 chaves.
+
+    Se comporta como um dict (get, in, items, update...) e itera sempre na ordem
+    do esquema, então serializa direto no formato do dados_acoes.json sem passar
+    por reordenação. Chaves fora do esquema ficam em um dict à parte.
+    """
+
+    __slots__ = ("_valores", "_extras")
+
+    def __init__(self, ticker=None):
+        self._valores = [_AUSENTE] * _TOTAL_CAMPOS
+        self._extras = None
+        if ticker is not None:
+            self._valores[0] = ticker
+
+    @classmethod
+    def modelo(cls, campos):
+        """Cria um registro com os campos informados preenchidos com None (use .copy() a cada uso)."""
+        registro = cls()
+        for campo in campos:
+            registro[campo] = None
+        return registro
+
+    @classmethod
+    def de_dict(cls, dados):
+        """Converte um dict (ex: lido do JSON) em RegistroAcao."""
+        registro = cls()
+        registro.update(dados)
+        return registro
+
+    # --- Interface de dict ---
+
+    def __getitem__(self, campo):
+        indice = INDICE_CAMPO.get(campo)
+        if indice is None:
+            if self._extras is None:
+                raise KeyError(campo)
+            return self._extras[campo]
+        valor = self._valores[indice]
+        if valor is _AUSENTE:
+            raise KeyError(campo)
+        return valor
+
+    def get(self, campo, padrao=None):
+        indice = INDICE_CAMPO.get(campo)
+        if indice is None:
+            return self._extras.get(campo, padrao) if self._extras else padrao
+        valor = self._valores[indice]
+        return padrao if valor is _AUSENTE else valor
+
+    def __setitem__(self, campo, valor):
+        indice = INDICE_CAMPO.get(campo)
+        if indice is None:
+            if self._extras is None:
+                self._extras = {}
+            self._extras[campo] = valor
+        else:
+            self._valores[indice] = valor
+
+    def __delitem__(self, campo):
+        indice = INDICE_CAMPO.get(campo)
+        if indice is None:
+            if self._extras is None:
+                raise KeyError(campo)
+            del self._extras[campo]
+        elif self._valores[indice] is _AUSENTE:
+            raise KeyError(campo)
+        else:
+            self._valores[indice] = _AUSENTE
+
+    def __contains__(self, campo):
+        indice = INDICE_CAMPO.get(campo)
+        if indice is None:
+            return bool(self._extras) and campo in self._extras
+        return self._valores[indice] is not _AUSENTE
+
+    def __iter__(self):
+        for campo, valor in zip(ORDEM_CAMPOS, self._valores):
+            if valor is not _AUSENTE:
+                yield campo
+        if self._extras:
+            yield from self._extras
+
+    def __len__(self):
+        return _TOTAL_CAMPOS - self._valores.count(_AUSENTE) + (len(self._extras) if self._extras else 0)
+
+    def items(self):
+        return self.para_dict().items()
+
+    def update(self, outro=(), **kwargs):
+        if isinstance(outro, RegistroAcao):
+            self.mesclar(outro)
+        else:
+            super().update(outro, **kwargs)
+
+    def __eq__(self, outro):
+        if isinstance(outro, RegistroAcao):
+            return self._valores == outro._valores and (self._extras or {}) == (outro._extras or {})
+        return super().__eq__(outro)
+
+    def __repr__(self):
+        return f"RegistroAcao({self.para_dict()!r})"
+
+    def __reduce__(self):
+        # O sentinela _AUSENTE não sobrevive ao pickle, então serializamos como dict.
+        return (RegistroAcao.de_dict, (self.para_dict(),))
+
+    # --- Operações baratas sobre a lista ---
+
+    def copy(self):
+        novo = RegistroAcao()
+        novo._valores = self._valores.copy()
+        novo._extras = self._extras.copy() if self._extras else None
+        return novo
+
+    def mesclar(self, outro):
+        """Copia para este registro todos os campos presentes em 'outro' (como dict.update)."""
+        if not isinstance(outro, RegistroAcao):
+            super().update(outro)
+            return
+        self._valores = [b if b is not _AUSENTE else a for a, b in zip(self._valores, outro._valores)]
+        if outro._extras:
+            if self._extras is None:
+                self._extras = {}
+            self._extras.update(outro._extras)
+
+    def extrair_fonte(self, fonte):
+        """Retorna um novo registro apenas com os campos de uma fonte (ex: 'statusInvest')."""
+        faixa = FAIXAS_FONTE[fonte]
+        novo = RegistroAcao()
+        novo._valores[faixa] = self._valores[faixa]
+        if self._extras:
+            extras = {k: v for k, v in self._extras.items() if fonte_do_campo(k) == fonte}
+            novo._extras = extras or None
+        return novo
+
+    def para_dict(self):
+        """Dict na ordem do esquema, no mesmo formato do dados_acoes.json."""
+        dados = {campo: valor for campo, valor in zip(ORDEM_CAMPOS, self._valores) if valor is not _AUSENTE}
+        if self._extras:
+            dados.update(self._extras)
+        return dados
+
+
+def serializar_registro(obj):
+    """Função 'default' para json.dump, convertendo RegistroAcao em dict."""
+    if isinstance(obj, RegistroAcao):
+        return obj.para_dict()
+    raise TypeError(f"Objeto do tipo {type(obj).__name__} não é serializável em JSON")
@@ -0,0 +1,101 @@
+"""
+Registro central do esquema dos dados de uma ação.
+
+Montado uma única vez no import a partir das fontes registradas em scrapers.base_scraper. Define a ordem
+fixa dos campos no JSON, o tipo de cada campo (numérico, texto ou data) e qual
+fonte é dona de cada campo.
+"""
+from scrapers.base_scraper import FONTES_REGISTRADAS
+
+NUMERICO = "numerico"
+TEXTO = "texto"
+DATA = "data"
+
+# Campos que não pertencem a nenhuma fonte específica.
+FONTE_GERAL = "geral"
+
+# Fontes na ordem em que seus grupos de campos aparecem no JSON.
+CAMPOS_POR_FONTE = {nome: fonte.campos() for nome, fonte in FONTES_REGISTRADAS.items()}
+FONTES = tuple(CAMPOS_POR_FONTE)
+
+_CAMPOS_TEXTO = (
+    set().union(*(fonte.campos_texto() for fonte in FONTES_REGISTRADAS.values()))
+    | {f"{fonte}_erro" for fonte in FONTES}
+    | {"ticker", "statusInvest_fonte"}
+)
+
+_CAMPOS_DATA = {
+    "fundamentus_data_ult_cotacao",
+    "fundamentus_data_ult_balanco",
+    "statusInvest_recompra_inicio",
+    "statusInvest_recompra_fim",
+    "statusInvest_data_atualizacao",
+    "investsiteindicadores_data_da_cotacao",
+    "investsiteindicadores_ultimo_demonstrativo_financeiro",
+    "atualizado_em",
+}
+
+ORDEM_CAMPOS = (
+    "ticker",
+    *(campo for campos in CAMPOS_POR_FONTE.values() for campo in campos),
+    "atualizado_em",
+)
+
+# Posição de cada campo em ORDEM_CAMPOS.
+INDICE_CAMPO = {campo: i for i, campo in enumerate(ORDEM_CAMPOS)}
+
+FONTE_CAMPO = {"ticker": FONTE_GERAL, "atualizado_em": FONTE_GERAL}
+# Fatia de ORDEM_CAMPOS ocupada por cada fonte (os campos de uma fonte são contíguos).
+FAIXAS_FONTE = {}
+for _fonte, _campos in CAMPOS_POR_FONTE.items():
+    FONTE_CAMPO.update(dict.fromkeys(_campos, _fonte))
+    FAIXAS_FONTE[_fonte] = slice(INDICE_CAMPO[_campos[0]], INDICE_CAMPO[_campos[-1]] + 1)
+
+TIPOS_CAMPOS = {
+    campo: DATA if campo in _CAMPOS_DATA else TEXTO if campo in _CAMPOS_TEXTO else NUMERICO
+    for campo in ORDEM_CAMPOS
+}
+
+# Mesmo indicador em várias fontes, pelo nome sem a fonte:
+# 'pl' -> ('investidor10_pl', 'fundamentus_pl', 'statusInvest_pl'), na ordem das fontes.
+CAMPOS_EQUIVALENTES = {}
+for _fonte, _campos in CAMPOS_POR_FONTE.items():
+    for _campo in _campos:
+        CAMPOS_EQUIVALENTES.setdefault(_campo[len(_fonte) + 1:], []).append(_campo)
+CAMPOS_EQUIVALENTES = {
+    nome: tuple(campos) for nome, campos in CAMPOS_EQUIVALENTES.items() if nome not in TIPOS_CAMPOS
+}
+
+# Multiplicador aplicado aos campos numéricos após a conversão do texto. Campos ausentes
+# usam escala 1. Percentuais ficam em pontos percentuais (7,96% -> 7.96), sem escala.
+# Campos com escala são truncados para int, como o scraper do InvestSite (Passivo) sempre fez.
+ESCALA_CAMPO = {
+    campo: fonte.escala()
+    for fonte in FONTES_REGISTRADAS.values() if fonte.escala() != 1
+    for campo in fonte.campos() if TIPOS_CAMPOS[campo] == NUMERICO
+}
+
+
+def fonte_do_campo(campo):
+    """
+    Retorna a fonte dona do campo (ex: 'fundamentus_pl' -> 'fundamentus').
+    Campos fora do esquema (ex: de versões antigas do JSON) são resolvidos pelo prefixo.
+    """
+    fonte = FONTE_CAMPO.get(campo)
+    if fonte is None:
+        prefixo = campo.split('_', 1)[0]
+        fonte = prefixo if prefixo in CAMPOS_POR_FONTE else FONTE_GERAL
+    return fonte
+
+
+def ordenar_registro(dados):
+    """
+    Monta o registro na ordem fixa do esquema em uma única passada.
+    Chaves fora do esquema são mantidas no final, na ordem original.
+    """
+    ordenado = {campo: dados[campo] for campo in ORDEM_CAMPOS if campo in dados}
+    if len(ordenado) != len(dados):
+        for campo, valor in dados.items():
+            if campo not in ordenado:
+                ordenado[campo] = valor
+    return ordenado
@@ -0,0 +1,153 @@
+"""
+Interface comum dos scrapers e registro das fontes.
+
+Cada fonte é registrada com o prefixo dos seus campos, o módulo (sem dependências)
+que descreve esses campos e o caminho da classe do scraper. A classe só é importada
+no primeiro uso, então uma execução que não coleta uma fonte (ex: --merge-shards,
+--sources statusInvest) não paga o import de bs4/curl_cffi/requests dela.
+
+Para adicionar uma fonte: criar <fonte>_campos.py e <fonte>_scraper.py e chamar
+registrar_fonte() abaixo. models.schema, models.acao e main.py leem daqui.
+"""
+import importlib
+from collections.abc import Mapping
+from utils.normalization import normalize_numeric_value, manter_valor_bruto
+from utils.metricas import METRICAS, ETAPA_PARSE
+from utils.perfilamento import PERFIL
+from utils.http import url_base
+
+
+class BaseScraper:
+    """
+    Contrato dos scrapers:
+      - baixar(): só a parte de rede, devolve o HTML (levanta exceção em caso de falha);
+      - parse(html): só CPU, devolve o RegistroAcao da fonte (pode rodar em outro processo);
+      - registro_de_falha(erro): registro vazio com '<fonte>_erro' preenchido;
+      - fetch_data(): baixar + parse com até MAX_TENTATIVAS tentativas.
+    """
+
+    # Nome da fonte no registro (prefixo dos campos e rótulo das métricas)
+    FONTE = None
+    # Endereço real do site; URL_BASE_<FONTE> ou URL_BASE_SIMULADA trocam (ver url_base)
+    URL_BASE = None
+    MAX_TENTATIVAS = 1
+
+    def __init__(self, ticker, normalizar=True):
+        self.ticker = ticker
+        self._normalizar = normalize_numeric_value if normalizar else manter_valor_bruto
+
+    @classmethod
+    def url_base(cls):
+        return url_base(cls.FONTE, cls.URL_BASE)
+
+    def baixar(self):
+        raise NotImplementedError
+
+    def parse(self, html):
+        raise NotImplementedError
+
+    def registro_de_falha(self, erro):
+        raise NotImplementedError
+
+    def parse_medido(self, *argumentos):
+        """parse() com a duração registrada em utils.metricas (e no perfil da fonte, com --profile)."""
+        with METRICAS.medir(ETAPA_PARSE, self.FONTE), PERFIL.escopo(self.FONTE):
+            return self.parse(*argumentos)
+
+    def fetch_data(self):
+        raise NotImplementedError
+
+
+class FonteRegistrada:
+    """Entrada do registro: onde estão os campos e o scraper de uma fonte."""
+
+    __slots__ = ("nome", "modulo_campos", "atributo_campos", "atributo_campos_texto",
+                 "atributo_escala", "caminho_scraper")
+
+    def __init__(self, nome, modulo_campos, atributo_campos, caminho_scraper,
+                 atributo_campos_texto=None, atributo_escala=None):
+        self.nome = nome
+        self.modulo_campos = modulo_campos
+        self.atributo_campos = atributo_campos
+        self.caminho_scraper = caminho_scraper
+        self.atributo_campos_texto = atributo_campos_texto
+        self.atributo_escala = atributo_escala
+
+    def _campos(self, atributo, padrao):
+        if atributo is None:
+            return padrao
+        return getattr(importlib.import_module(self.modulo_campos), atributo)
+
+    def campos(self):
+        """Tupla com todas as chaves da fonte, na ordem do JSON."""
+        return self._campos(self.atributo_campos, ())
+
+    def campos_texto(self):
+        """Chaves que guardam texto (não passam pela normalização numérica)."""
+        return self._campos(self.atributo_campos_texto, set())
+
+    def escala(self):
+        """Multiplicador dos campos numéricos da fonte (1 se não houver)."""
+        return self._campos(self.atributo_escala, 1)
+
+    def carregar_scraper(self):
+        modulo, classe = self.caminho_scraper.split(':')
+        return getattr(importlib.import_module(modulo), classe)
+
+
+# Fontes na ordem em que seus grupos de campos aparecem no JSON.
+FONTES_REGISTRADAS = {}
+
+
+def registrar_fonte(nome, modulo_campos, atributo_campos, caminho_scraper,
+                    atributo_campos_texto=None, atributo_escala=None):
+    FONTES_REGISTRADAS[nome] = FonteRegistrada(nome, modulo_campos, atributo_campos, caminho_scraper,
+                                               atributo_campos_texto, atributo_escala)
+
+
+registrar_fonte("investidor10", "scrapers.investidor10_campos", "INVESTIDOR10_ALL_KEYS",
+                "scrapers.investidor10_scraper:Investidor10Scraper",
+                atributo_campos_texto="NON_NUMERIC_KEYS")
+registrar_fonte("fundamentus", "scrapers.fundamentus_campos", "FUNDAMENTUS_ALL_KEYS",
+                "scrapers.fundamentus_scraper:FundamentusScraper",
+                atributo_campos_texto="NON_NUMERIC_KEYS")
+registrar_fonte("statusInvest", "scrapers.statusinvest_campos", "STATUSINVEST_ALL_KEYS",
+                "scrapers.statusinvest_scraper:StatusInvestScraper",
+                atributo_campos_texto="NON_NUMERIC_KEYS")
+registrar_fonte("investsitepassivo", "scrapers.investsitepassivo_campos", "INVESTSITE_PASSIVO_ALL_KEYS",
+                "scrapers.investsitepassivo_scraper:InvestSitePassivoScraper",
+                atributo_escala="INVESTSITE_PASSIVO_ESCALA")
+registrar_fonte("investsiteindicadores", "scrapers.investsiteindicadores_campos", "INVESTSITE_INDICADORES_ALL_KEYS",
+                "scrapers.investsiteindicadores_scraper:InvestSiteIndicadoresScraper",
+                atributo_campos_texto="NON_NUMERIC_KEYS")
+
+
+class _ScrapersPorFonte(Mapping):
+    """{fonte: classe do scraper}, importando o módulo de cada scraper só no primeiro acesso."""
+
+    def __init__(self):
+        self._classes = {}
+
+    def __getitem__(self, fonte):
+        classe = self._classes.get(fonte)
+        if classe is None:
+            classe = self._classes[fonte] = FONTES_REGISTRADAS[fonte].carregar_scraper()
+        return classe
+
+    def __contains__(self, fonte):
+        # Sem isso, Mapping.__contains__ chamaria __getitem__ e importaria o scraper
+        return fonte in FONTES_REGISTRADAS
+
+    def __iter__(self):
+        return iter(FONTES_REGISTRADAS)
+
+    def __len__(self):
+        return len(FONTES_REGISTRADAS)
+
+    def carregar_todos(self):
+        """Importa agora o scraper de todas as fontes (em vez de no primeiro acesso a cada uma)."""
+        for fonte in FONTES_REGISTRADAS:
+            self[fonte]
+
+
+SCRAPERS_POR_FONTE = _ScrapersPorFonte()
@@ -0,0 +1,345 @@
+"""
+Extração declarativa de rótulo/valor.
+
+Cada scraper descreve as regiões da página com Regiao (onde estão as linhas, onde
+estão o rótulo e o valor de cada linha, qual chave corresponde a cada rótulo) e
+compilar() transforma essa descrição em um extrator. A compilação resolve uma vez
+tudo o que não depende do HTML: seletores simples viram chamadas diretas a
+find/find_all (os demais são pré-compilados pelo soupsieve), o mapa rótulo->chave
+fica pronto para consulta e o tipo de cada chave (texto ou numérico) é conhecido.
+Na extração, cada região é percorrida uma única vez, com uma consulta ao dicionário
+por rótulo.
+
+Caminhos (rotulo/valor) partem da linha e são um passo ou uma lista de passos:
+  - str: seletor CSS, primeiro descendente que casa (PROPRIO = o próprio elemento);
+  - tupla de str: alternativas, vale a primeira que existir (ex: ('span', PROPRIO));
+  - int: i-ésima célula <td> da linha.
+Se algum passo não encontra nada, a linha é ignorada.
+"""
+import re
+
+# Passo de caminho que devolve o próprio elemento.
+PROPRIO = ""
+
+# Políticas para quando a mesma chave aparece mais de uma vez:
+PRIMEIRO_VALIDO = "primeiro_valido"          # fica o primeiro valor que normalizou
+ULTIMO_VALOR = "ultimo_valor"                # cada ocorrência sobrescreve a anterior
+PRIMEIRA_OCORRENCIA = "primeira_ocorrencia"  # só a primeira linha que casou conta
+
+_SELETOR_SIMPLES = re.compile(
+    r'^(?P<tag>[a-zA-Z][\w-]*)?(?:\.(?P<classe>[\w-]+))?(?:#(?P<id>[\w-]+))?$')
+
+
+def _compilar_seletor(seletor):
+    """Devolve (primeiro, todos): funções elemento -> primeiro descendente / lista de descendentes."""
+    if seletor == PROPRIO:
+        return (lambda elemento: elemento), (lambda elemento: [elemento])
+
+    simples = _SELETOR_SIMPLES.match(seletor)
+    if simples:
+        tag = simples['tag']
+        atributos = {}
+        if simples['classe']:
+            atributos['class_'] = simples['classe']
+        if simples['id']:
+            atributos['id'] = simples['id']
+        return ((lambda elemento: elemento.find(tag, **atributos)),
+                (lambda elemento: elemento.find_all(tag, **atributos)))
+
+    import soupsieve  # dependência do bs4; só carregada por quem usa seletores compostos
+    padrao = soupsieve.compile(seletor)
+    return padrao.select_one, padrao.select
+
+
+def _compilar_caminho(caminho):
+    """Caminho (ver docstring do módulo) -> função (linha, células) -> elemento ou None."""
+    passos = []
+    for passo in (caminho if isinstance(caminho, list) else [caminho]):
+        if isinstance(passo, int):
+            passos.append(passo)
+        else:
+            alternativas = passo if isinstance(passo, tuple) else (passo,)
+            passos.append(tuple(_compilar_seletor(alternativa)[0] for alternativa in alternativas))
+
+    def seguir(linha, celulas):
+        elemento = linha
+        for passo in passos:
+            if isinstance(passo, int):
+                elemento = celulas[passo]
+                continue
+            for primeiro in passo:
+                encontrado = primeiro(elemento)
+                if encontrado is not None:
+                    elemento = encontrado
+                    break
+            else:
+                return None
+        return elemento
+
+    return seguir
+
+
+def _padrao_de_rotulos(rotulos):
+    return re.compile('|'.join(re.escape(rotulo) for rotulo in sorted(rotulos, key=len, reverse=True)))
+
+
+def _usa_celulas(caminho):
+    passos = caminho if isinstance(caminho, list) else [caminho]
+    return any(isinstance(passo, int) for passo in passos)
+
+
+class Regiao:
+    """
+    Descrição de uma região da página e de como ler os pares rótulo/valor dela.
+
+    :param seletor: Seletor CSS da região, ou tupla de seletores aninhados (cada passo
+                    pega o primeiro descendente que casa). None = a página inteira.
+    :param mapa: {rótulo: chave}. Uma tupla de chaves distribui ocorrências repetidas do
+                 rótulo: a 1ª vai para a 1ª chave, a 2ª para a 2ª, e assim por diante.
+    :param chave: Alternativa a mapa para regiões sem rótulo: o valor vai sempre para esta chave.
+    :param itens: Seletor das linhas dentro da região (None = a própria região é a linha).
+    :param rotulo: Caminho até o rótulo, a partir da linha (ou da célula, com pares).
+    :param valor: Caminho até o valor, a partir da linha (ou da célula seguinte, com pares).
+    :param todas: Usa todas as regiões que casam com o primeiro seletor, não só a primeira.
+    :param erros: Mensagens da exceção levantada quando o passo correspondente de
+                  'seletor' não encontra nada (sem mensagem, a região é só ignorada).
+    :param celulas: Exige exatamente este número de <td> na linha.
+    :param min_celulas: Exige pelo menos este número de <td> na linha.
+    :param pares: Classe da célula de rótulo. Ativa a leitura em pares: as <td> da linha
+                  são varridas e cada célula de rótulo é seguida pela célula do valor.
+    :param rotulo_como: Função texto -> texto aplicada ao rótulo antes de consultar o mapa.
+    :param rotulos_dinamicos: Função sem argumentos que devolve rótulos extras {rótulo: chave},
+                              avaliada a cada extração (ex: rótulos que dependem do ano).
+    :param busca_texto: Procura os rótulos do mapa como trechos de qualquer texto da região;
+                        o valor é o primeiro 'valor' dentro do ancestral mais próximo
+                        (abaixo do <body>) que o contém. Fica o primeiro valor não vazio.
+    :param escala: Multiplicador dos valores numéricos (truncados para int).
+    :param ocorrencia: Política para chaves repetidas (PRIMEIRO_VALIDO, ULTIMO_VALOR, PRIMEIRA_OCORRENCIA).
+    """
+
+    def __init__(self, seletor=None, mapa=None, chave=None, itens=None, rotulo=None, valor=PROPRIO,
+                 todas=False, erros=(), celulas=None, min_celulas=0, pares=None, rotulo_como=None,
+                 rotulos_dinamicos=None, busca_texto=False, escala=1, ocorrencia=PRIMEIRO_VALIDO):
+        if (mapa is None) == (chave is None):
+            raise ValueError("Informe 'mapa' ou 'chave' (um dos dois).")
+        self.seletor = seletor
+        self.mapa = mapa
+        self.chave = chave
+        self.itens = itens
+        self.rotulo = rotulo
+        self.valor = valor
+        self.todas = todas
+        self.erros = erros
+        self.celulas = celulas
+        self.min_celulas = min_celulas
+        self.pares = pares
+        self.rotulo_como = rotulo_como
+        self.rotulos_dinamicos = rotulos_dinamicos
+        self.busca_texto = busca_texto
+        self.escala = escala
+        self.ocorrencia = ocorrencia
+
+
+class _RegiaoCompilada:
+    """Regiao com seletores, caminhos e mapa resolvidos; ver Extrator."""
+
+    def __init__(self, regiao, campos_texto):
+        self.regiao = regiao
+        self.campos_texto = frozenset(campos_texto)
+
+        seletores = regiao.seletor if isinstance(regiao.seletor, tuple) else (regiao.seletor,)
+        self._passos_regiao = [_compilar_seletor(s) for s in seletores if s is not None]
+        self._erros = tuple(regiao.erros) + (None,) * (len(self._passos_regiao) - len(regiao.erros))
+        self._itens = _compilar_seletor(regiao.itens)[1] if regiao.itens is not None else None
+        self._rotulo = _compilar_caminho(regiao.rotulo) if regiao.rotulo is not None else None
+        self._valor = _compilar_caminho(regiao.valor)
+        self._usa_celulas = (regiao.celulas is not None or regiao.min_celulas or regiao.pares is not None
+                             or _usa_celulas(regiao.valor)
+                             or (regiao.rotulo is not None and _usa_celulas(regiao.rotulo)))
+        self._valor_em_busca = _compilar_seletor(regiao.valor)[0] if regiao.busca_texto else None
+        self._mapa = dict(regiao.mapa) if regiao.mapa is not None else None
+        # Filtro da busca_texto: descarta com uma única busca os textos sem nenhum rótulo
+        self._algum_rotulo = _padrao_de_rotulos(self._mapa) if regiao.busca_texto else None
+
+    # --- regiões ---------------------------------------------------------------
+
+    def _regioes(self, soup):
+        if not self._passos_regiao:
+            return [soup]
+        primeiro, todos = self._passos_regiao[0]
+        if self.regiao.todas:
+            regioes = todos(soup)
+        else:
+            regiao = primeiro(soup)
+            regioes = [regiao] if regiao is not None else []
+        if not regioes and self._erros[0]:
+            raise Exception(self._erros[0])
+
+        for (primeiro, _), erro in zip(self._passos_regiao[1:], self._erros[1:]):
+            internas = []
+            for regiao in regioes:
+                interna = primeiro(regiao)
+                if interna is not None:
+                    internas.append(interna)
+                elif erro:
+                    raise Exception(erro)
+            regioes = internas
+        return regioes
+
+    # --- gravação --------------------------------------------------------------
+
+    def _guardar(self, dados, chave, bruto, normalizar, vistas):
+        ocorrencia = self.regiao.ocorrencia
+        if ocorrencia == PRIMEIRO_VALIDO:
+            if dados.get(chave) is not None:
+                return
+        elif ocorrencia == PRIMEIRA_OCORRENCIA:
+            if chave in vistas:
+                return
+            vistas.add(chave)
+
+        if chave in self.campos_texto:
+            dados[chave] = bruto
+            return
+        valor = normalizar(bruto)
+        if valor is None:
+            return
+        # Texto bruto (normalizar=False) recebe a escala no estágio em lote
+        if self.regiao.escala != 1 and isinstance(valor, (int, float)):
+            valor = int(valor * self.regiao.escala)
+        dados[chave] = valor
+
+    def _chave_do_rotulo(self, mapa, texto, contagem):
+        if self.regiao.rotulo_como is not None:
+            texto = self.regiao.rotulo_como(texto)
+        chave = mapa.get(texto)
+        if type(chave) is tuple:
+            n = contagem.get(texto, 0)
+            contagem[texto] = n + 1
+            chave = chave[n] if n < len(chave) else None
+        return chave
+
+    # --- extração --------------------------------------------------------------
+
+    def extrair(self, soup, dados, normalizar):
+        regiao = self.regiao
+        mapa = self._mapa
+        if regiao.rotulos_dinamicos is not None:
+            mapa = {**mapa, **regiao.rotulos_dinamicos()}
+        vistas = set()
+        contagem = {}
+
+        for elemento in self._regioes(soup):
+            if regiao.busca_texto:
+                self._extrair_por_texto(elemento, dados, normalizar, mapa, vistas)
+                continue
+
+            linhas = self._itens(elemento) if self._itens is not None else (elemento,)
+            for linha in linhas:
+                celulas = linha.find_all('td') if self._usa_celulas else None
+                if regiao.pares is not None:
+                    self._extrair_pares(celulas, dados, normalizar, mapa, vistas, contagem)
+                    continue
+                if celulas is not None and (
+                        (regiao.celulas is not None and len(celulas) != regiao.celulas)
+                        or len(celulas) < regiao.min_celulas):
+                    continue
+
+                if mapa is None:
+                    chave = regiao.chave
+                else:
+                    rotulo = self._rotulo(linha, celulas)
+                    if rotulo is None:
+                        continue
+                    valor = self._valor(linha, celulas)
+                    if valor is None:
+                        continue
+                    chave = self._chave_do_rotulo(mapa, rotulo.get_text(strip=True), contagem)
+                    if chave is None:
+                        continue
+                    self._guardar(dados, chave, valor.get_text(strip=True), normalizar, vistas)
+                    continue
+
+                valor = self._valor(linha, celulas)
+                if valor is not None:
+                    self._guardar(dados, chave, valor.get_text(strip=True), normalizar, vistas)
+
+    def _extrair_pares(self, celulas, dados, normalizar, mapa, vistas, contagem):
+        classe_rotulo = self.regiao.pares
+        i = 0
+        while i < len(celulas) - 1:
+            celula = celulas[i]
+            rotulo = self._rotulo(celula, celulas) if classe_rotulo in celula.get('class', []) else None
+            if rotulo is None:
+                i += 1
+                continue
+            chave = self._chave_do_rotulo(mapa, rotulo.get_text(strip=True), contagem)
+            if chave is not None:
+                valor = self._valor(celulas[i + 1], celulas)
+                if valor is not None:
+                    self._guardar(dados, chave, valor.get_text(strip=True), normalizar, vistas)
+            i += 2
+
+    def _extrair_por_texto(self, raiz, dados, normalizar, mapa, vistas):
+        """Uma passada pelos textos da região, resolvendo todos os rótulos de uma vez."""
+        algum_rotulo = self._algum_rotulo if mapa is self._mapa else _padrao_de_rotulos(mapa)
+        pendentes = list(mapa)
+        encontrados = {}
+        valores_por_ancestral = {}
+
+        for texto in raiz.find_all(string=True):
+            if algum_rotulo.search(texto) is None:
+                continue
+            casados = [nome for nome in pendentes if nome in texto]
+            if not casados:
+                continue
+            pai = texto.parent
+            chave_cache = id(pai)
+            if chave_cache not in valores_por_ancestral:
+                valor = None
+                while pai is not None and pai.name != 'body':
+                    valor_tag = self._valor_em_busca(pai)
+                    if valor_tag is not None:
+                        valor = valor_tag.get_text(strip=True)
+                        break
+                    pai = pai.parent
+                valores_por_ancestral[chave_cache] = valor
+            valor = valores_por_ancestral[chave_cache]
+            if not valor:
+                continue
+            for nome in casados:
+                encontrados[nome] = valor
+                pendentes.remove(nome)
+            if not pendentes:
+                break
+
+        # Grava na ordem do mapa, como se cada rótulo tivesse sido buscado separadamente
+        for nome, chave in mapa.items():
+            if nome in encontrados:
+                self._guardar(dados, chave, encontrados[nome], normalizar, vistas)
+
+
+class Extrator:
+    """Extrator compilado: aplica as regiões, na ordem, sobre um BeautifulSoup já montado."""
+
+    def __init__(self, regioes, campos_texto=()):
+        self._regioes = [_RegiaoCompilada(regiao, campos_texto) for regiao in regioes]
+
+    def extrair(self, soup, dados, normalizar):
+        """
+        Preenche 'dados' (RegistroAcao ou dict) com os valores encontrados.
+
+        :param normalizar: normalize_numeric_value ou manter_valor_bruto (ver BaseScraper).
+        """
+        for regiao in self._regioes:
+            regiao.extrair(soup, dados, normalizar)
+        return dados
+
+
+def compilar(*regioes, campos_texto=()):
+    """
+    Compila as regiões de uma fonte em um Extrator.
+
+    :param campos_texto: Chaves guardadas como texto; as demais passam por 'normalizar'.
+    """
+    return Extrator(regioes, campos_texto)
@@ -0,0 +1,83 @@
+"""
+Campos coletados do Fundamentus.
+
+Módulo sem dependências externas, para que o esquema (models.schema) possa ser
+montado sem importar o scraper.
+"""
+
+FUNDAMENTUS_INDICATORS_MAP = {
+    # Dados da Empresa (Texto)
+    "Papel": "fundamentus_papel",
+    "Tipo": "fundamentus_tipo",
+    "Empresa": "fundamentus_empresa",
+    "Setor": "fundamentus_setor",
+    "Subsetor": "fundamentus_subsetor",
+    "Data últ cot": "fundamentus_data_ult_cotacao",
+    "Últ balanço processado": "fundamentus_data_ult_balanco",
+
+    # Dados Numéricos
+    "Cotação": "fundamentus_cotacao",
+    "Min 52 sem": "fundamentus_min_52_semanas",
+    "Max 52 sem": "fundamentus_max_52_semanas",
+    "Vol $ méd (2m)": "fundamentus_volume_medio_2m",
+    "Valor de mercado": "fundamentus_valor_mercado",
+    "Valor da firma": "fundamentus_valor_firma",
+    "Nro. Ações": "fundamentus_nro_acoes",
+    "P/L": "fundamentus_pl",
+    "P/VP": "fundamentus_pvp",
+    "PSR": "fundamentus_psr",
+    "P/Ativos": "fundamentus_p_ativos",
+    "P/Cap. Giro": "fundamentus_p_cap_giro",
+    "P/Ativ Circ Liq": "fundamentus_p_ativ_circ_liq",
+    "EV / EBITDA": "fundamentus_ev_ebitda",
+    "EV / EBIT": "fundamentus_ev_ebit",
+    "P/EBIT": "fundamentus_p_ebit",
+    "Liquidez Corr": "fundamentus_liquidez_corr",
+    "Div Br/ Patrim": "fundamentus_div_bruta_patrim",
+    "Giro Ativos": "fundamentus_giro_ativos",
+    "LPA": "fundamentus_lpa",
+    "VPA": "fundamentus_vpa",
+    "Ativo": "fundamentus_ativo",
+    "Dív. Bruta": "fundamentus_divida_bruta",
+    "Disponibilidades": "fundamentus_disponibilidades",
+    "Dív. Líquida": "fundamentus_divida_liquida",
+    "Ativo Circulante": "fundamentus_ativo_circulante",
+    "Patrim. Líq": "fundamentus_patrimonio_liquido",
+    "Receita Líquida": "fundamentus_receita_liquida_12m",
+    "EBIT": "fundamentus_ebit_12m",
+    "Lucro Líquido": "fundamentus_lucro_liquido_12m",
+
+    # Percentuais
+    "Div. Yield": "fundamentus_dy_percentual",
+    "Marg. Bruta": "fundamentus_margem_bruta_percentual",
+    "Marg. EBIT": "fundamentus_margem_ebit_percentual",
+    "Marg. Líquida": "fundamentus_margem_liquida_percentual",
+    "EBIT / Ativo": "fundamentus_ebit_ativo_percentual",
+    "ROIC": "fundamentus_roic_percentual",
+    "ROE": "fundamentus_roe_percentual",
+    "Cres. Rec (5a)": "fundamentus_crescimento_rec_5anos_percentual",
+    "Dia": "fundamentus_oscilacao_dia_percentual",
+    "Mês": "fundamentus_oscilacao_mes_percentual",
+    "30 dias": "fundamentus_oscilacao_30d_percentual",
+    "12 meses": "fundamentus_oscilacao_12m_percentual",
+
+    # DRE 3 meses
+    "fundamentus_receita_liquida_3m": "fundamentus_receita_liquida_3m",
+    "fundamentus_ebit_3m": "fundamentus_ebit_3m",
+    "fundamentus_lucro_liquido_3m": "fundamentus_lucro_liquido_3m",
+}
+
+# Conjunto de chaves que são intencionalmente não numéricas
+NON_NUMERIC_KEYS = {
+    "fundamentus_papel", "fundamentus_tipo", "fundamentus_empresa",
+    "fundamentus_setor", "fundamentus_subsetor", "fundamentus_data_ult_cotacao",
+    "fundamentus_data_ult_balanco"
+}
+
+# Todas as chaves produzidas pelo scraper, na ordem em que aparecem no JSON.
+FUNDAMENTUS_ALL_KEYS = tuple(dict.fromkeys([
+    *FUNDAMENTUS_INDICATORS_MAP.values(),
+    "fundamentus_oscilacao_ano_atual_percentual",
+    *(f"fundamentus_oscilacao_ano_menos_{i}_percentual" for i in range(1, 6)),
+    "fundamentus_erro",
+]))
@@ -1,57 +1,48 @@
-import requests
 import os
 from datetime import datetime
 from bs4 import BeautifulSoup
-from utils.normalization import normalize_numeric_value
+from scrapers.base_scraper import BaseScraper
+from utils.http import requisitar, url_base, CLIENTE_REQUESTS
+from utils.proxies import pool_de_saida
+from scrapers.extracao import Regiao, compilar, ULTIMO_VALOR
 from dotenv import load_dotenv
 import pytz
+from scrapers.statusinvest_campos import STATUSINVEST_INDICATORS_MAP, NON_NUMERIC_KEYS, STATUSINVEST_ALL_KEYS
+from models.registro import RegistroAcao
 
 load_dotenv()
 
-# --- MAPA DE INDICADORES ---
-STATUSINVEST_INDICATORS_MAP = {
-    "Valor atual": "statusInvest_cotacao", "Min. 52 semanas": "statusInvest_min_52_semanas", "Máx. 52 semanas": "statusInvest_max_52_semanas",
-    "Dividend Yield": "statusInvest_dy_percentual", "Valorização (12m)": "statusInvest_valorizacao_12m_percentual", "D.Y": "statusInvest_dy_percentual",
-    "P/L": "statusInvest_pl", "PEG Ratio": "statusInvest_peg_ratio", "P/VP": "statusInvest_pvp", "EV/EBITDA": "statusInvest_ev_ebitda", "EV/EBIT": "statusInvest_ev_ebit",
-    "P/EBITDA": "statusInvest_p_ebitda", "P/EBIT": "statusInvest_p_ebit", "VPA": "statusInvest_vpa", "P/Ativo": "statusInvest_p_ativo", "LPA": "statusInvest_lpa",
-    "P/SR": "statusInvest_psr", "P/Cap. Giro": "statusInvest_p_cap_giro", "P/Ativo Circ. Liq.": "statusInvest_p_ativo_circ_liq", "Dív. líquida/PL": "statusInvest_div_liq_pl",
-    "Dív. líquida/EBITDA": "statusInvest_div_liq_ebitda", "Dív. líquida/EBIT": "statusInvest_div_liq_ebit", "PL/Ativos": "statusInvest_pl_ativos",
-    "Passivos/Ativos": "statusInvest_passivos_ativos", "Liq. corrente": "statusInvest_liq_corrente", "Giro ativos": "statusInvest_giro_ativos",
-    "M. Bruta": "statusInvest_margem_bruta_percentual", "M. EBITDA": "statusInvest_margem_ebitda_percentual", "M. EBIT": "statusInvest_margem_ebit_percentual",
-    "M. Líquida": "statusInvest_margem_liquida_percentual", "ROE": "statusInvest_roe_percentual", "ROA": "statusInvest_roa_percentual",
-    "ROIC": "statusInvest_roic_percentual", "CAGR Receitas 5 anos": "statusInvest_cagr_rec_5anos_percentual", "CAGR Lucros 5 anos": "statusInvest_cagr_lucros_5anos_percentual",
-    "Patrimônio líquido": "statusInvest_patrimonio_liquido", "Ativos": "statusInvest_ativos", "Ativo circulante": "statusInvest_ativo_circulante",
-    "Dívida bruta": "statusInvest_divida_bruta", "Dívida líquida": "statusInvest_divida_liquida", "Valor de mercado": "statusInvest_valor_mercado",
-    "Valor de firma": "statusInvest_valor_firma", "Nº total de papéis": "statusInvest_nro_papeis", "Free Float": "statusInvest_free_float_percentual",
-    "Tag Along": "statusInvest_tag_along_percentual", "Liquidez média diária": "statusInvest_liquidez_media_diaria", "Setor de Atuação": "statusInvest_setor",
-    "Subsetor de Atuação": "statusInvest_subsetor", "Segmento de Atuação": "statusInvest_segmento",
-    "Data Início Recompra": "statusInvest_recompra_inicio", 
-    "Data Fim Recompra": "statusInvest_recompra_fim", 
-    "Quantidade Recompra": "statusInvest_recompra_quantidade",
-}
-
-NON_NUMERIC_KEYS = {
-    "statusInvest_setor", "statusInvest_subsetor", "statusInvest_segmento",
-    "statusInvest_recompra_inicio", "statusInvest_recompra_fim"
-}
-
-class StatusInvestScraper:
-    def __init__(self, ticker):
-        self.ticker = ticker
-        self.target_url = f"https://statusinvest.com.br/acoes/{self.ticker.lower()}"
+# Registro com todas as chaves desta fonte em None; copiado a cada coleta.
+REGISTRO_MODELO = RegistroAcao.modelo(STATUSINVEST_ALL_KEYS)
+
+# Os indicadores não têm estrutura fixa: cada nome é procurado em qualquer texto da
+# página e o valor é o primeiro '.value' do ancestral mais próximo que tiver um.
+EXTRATOR = compilar(
+    Regiao(busca_texto=True, valor=".value", mapa=STATUSINVEST_INDICATORS_MAP, ocorrencia=ULTIMO_VALOR),
+    # Cotação pelo bloco "Valor atual", se a busca por texto não achou
+    Regiao('div[title="Valor atual"]', chave="statusInvest_cotacao", valor="strong.value"),
+    campos_texto=NON_NUMERIC_KEYS,
+)
+
+
+class StatusInvestScraper(BaseScraper):
+    FONTE = "statusInvest"
+    URL_BASE = "https://statusinvest.com.br"
+    MAX_TENTATIVAS = 1
+
+    def __init__(self, ticker, normalizar=True):
+        super().__init__(ticker, normalizar)
+        self.target_url = f"{self.url_base()}/acoes/{self.ticker.lower()}"
 
     def _get_all_possible_keys(self):
-        keys = list(STATUSINVEST_INDICATORS_MAP.values())
-        keys.append("statusInvest_data_atualizacao")
-        keys.append("statusInvest_fonte")
-        return keys
+        return STATUSINVEST_ALL_KEYS
 
     def _process_and_store_data(self, dados, key, raw_value, overwrite=True):
         if not overwrite and (key in dados and dados[key] is not None): return
         if key in NON_NUMERIC_KEYS:
             dados[key] = raw_value.strip() if isinstance(raw_value, str) else raw_value
         else:
-            normalized_value = normalize_numeric_value(raw_value)
+            normalized_value = self._normalizar(raw_value)
             if normalized_value is not None: dados[key] = normalized_value
 
     def _extrair_dados_recompra(self, soup):
@@ -86,19 +77,33 @@ class StatusInvestScraper:
         :param use_local_strategy: Se True, usa requests local direto (rápido).
                                    Se False, usa API ScrapeNinja (remoto).
         """
+        try:
+            html_content, fonte = self.baixar(use_local_strategy)
+        except Exception as e:
+            return self.registro_de_falha(str(e))
+        return self.parse_medido(html_content, fonte)
+
+    def baixar(self, use_local_strategy=False):
+        """
+        Parte de rede da coleta. Retorna (html, fonte). Em caso de falha levanta
+        exceção cuja mensagem é o que vai para statusInvest_erro (ex: "ALL_KEYS_EXHAUSTED").
+        """
         if use_local_strategy:
-            return self._fetch_local_requests()
+            return self._baixar_local_requests(), "Atualização Manual Local"
         else:
-            return self._fetch_api_scrapeninja()
+            return self._baixar_api_scrapeninja()
+
+    def registro_de_falha(self, erro):
+        """Registro vazio com o erro da coleta em statusInvest_erro."""
+        dados = REGISTRO_MODELO.copy()
+        dados["ticker"] = self.ticker
+        dados["statusInvest_erro"] = erro
+        return dados
 
-    def _fetch_local_requests(self):
+    def _baixar_local_requests(self):
         """
         Estratégia Local Rápida: Requests com Headers específicos.
         """
-        dados = {key: None for key in self._get_all_possible_keys()}
-        dados["ticker"] = self.ticker
-        dados["statusInvest_erro"] = ""
-
         # Headers simulando navegador real (inspirado no PesquisaStatusInvest.py)
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/71.0.3578.98 Safari/537.36',
@@ -111,48 +116,32 @@ class StatusInvestScraper:
         print(f"  > [LOCAL] Request direto para {self.ticker}...", end="", flush=True)
         try:
             # Timeout curto para ser rápido
-            response = requests.get(self.target_url, headers=headers, timeout=10)
-            
-            if response.status_code in [403, 429]:
-                print(" ❌ Bloqueado (403/429).")
-                dados["statusInvest_erro"] = "Blocked"
-                return dados
-            
-            if response.status_code != 200:
-                print(f" ❌ Erro HTTP {response.status_code}")
-                dados["statusInvest_erro"] = f"HTTP {response.status_code}"
-                return dados
-
-            html_content = response.text
-            print(" ✅ Sucesso!")
-            return self._parse_html(html_content, dados, fonte="Atualização Manual Local")
-
+            # Com PROXIES_SAIDA sai por um dos proxies do pool (utils.proxies)
+            response = requisitar("get", self.target_url, self.FONTE, cliente=CLIENTE_REQUESTS,
+                                  saidas=pool_de_saida(), headers=headers, timeout=10)
         except Exception as e:
             print(f" ❌ Erro: {e}")
-            dados["statusInvest_erro"] = str(e)
-            return dados
+            raise
 
-    def _fetch_api_scrapeninja(self):
-        # ... (Mantém a mesma lógica da API Ninja que já funciona) ...
-        # Para economizar espaço aqui, assuma que este bloco é idêntico
-        # ao que definimos anteriormente, usando RAPIDAPI_KEYS.
+        if response.status_code in [403, 429]:
+            print(" ❌ Bloqueado (403/429).")
+            raise Exception("Blocked")
         
-        dados = {key: None for key in self._get_all_possible_keys()}
-        dados["ticker"] = self.ticker
-        dados["statusInvest_erro"] = ""
+        if response.status_code != 200:
+            print(f" ❌ Erro HTTP {response.status_code}")
+            raise Exception(f"HTTP {response.status_code}")
 
+        print(" ✅ Sucesso!")
+        return response.text
+
+    def _baixar_api_scrapeninja(self):
         api_keys_str = os.getenv('RAPIDAPI_KEYS')
         if not api_keys_str: api_keys_str = os.getenv('RAPIDAPI_KEY', '')
         if not api_keys_str:
-            dados["statusInvest_erro"] = "Sem Chaves API"
-            return dados
+            raise Exception("Sem Chaves API")
 
         api_keys_list = [k.strip() for k in api_keys_str.split(',') if k.strip()]
-        api_url = 'https://scrapeninja.p.rapidapi.com/scrape'
-        
-        sucesso = False
-        html_content = ""
-        chave_usada = ""
+        api_url = f"{url_base('scrapeninja', 'https://scrapeninja.p.rapidapi.com')}/scrape"
 
         for i, api_key in enumerate(api_keys_list):
             key_masked = f"...{api_key[-6:]}"
@@ -164,51 +153,27 @@ class StatusInvestScraper:
 
             try:
                 print(f"    -> API {i+1} ({key_masked})... ", end="", flush=True)
-                response = requests.post(api_url, json=payload, headers=headers)
+                response = requisitar("post", api_url, self.FONTE, cliente=CLIENTE_REQUESTS, json=payload, headers=headers)
                 if response.status_code == 429:
                     print("❌ 429.")
                     continue
                 if response.status_code == 200 and response.json().get('body'):
-                    html_content = response.json().get('body')
-                    chave_usada = f"API Ninja ({key_masked})"
                     print("✅")
-                    sucesso = True
-                    break
+                    return response.json().get('body'), f"API Ninja ({key_masked})"
             except: pass
 
-        if not sucesso:
-            dados["statusInvest_erro"] = "ALL_KEYS_EXHAUSTED"
-            return dados
+        raise Exception("ALL_KEYS_EXHAUSTED")
 
-        return self._parse_html(html_content, dados, fonte=chave_usada)
+    def parse(self, html_content, fonte):
+        """Extrai os indicadores do HTML. Não faz I/O, então pode rodar em outro processo."""
+        dados = REGISTRO_MODELO.copy()
+        dados["ticker"] = self.ticker
+        dados["statusInvest_erro"] = ""
 
-    def _parse_html(self, html_content, dados, fonte):
         try:
             soup = BeautifulSoup(html_content, 'html.parser')
             
-            for nome_indicador, chave_json in STATUSINVEST_INDICATORS_MAP.items():
-                try:
-                    elementos = soup.find_all(string=lambda text: text and nome_indicador in text)
-                    valor_encontrado = None
-                    for elem in elementos:
-                        parent = elem.parent
-                        while parent and parent.name != 'body':
-                            valor_tag = parent.find(class_='value')
-                            if valor_tag:
-                                valor_encontrado = valor_tag.get_text(strip=True)
-                                break
-                            parent = parent.parent
-                        if valor_encontrado: break
-                    
-                    if valor_encontrado:
-                        self._process_and_store_data(dados, chave_json, valor_encontrado)
-                    
-                    if chave_json == "statusInvest_cotacao" and dados[chave_json] is None:
-                        cotacao_elem = soup.find("div", title="Valor atual")
-                        if cotacao_elem:
-                            val = cotacao_elem.find("strong", class_="value")
-                            if val: self._process_and_store_data(dados, chave_json, val.get_text())
-                except: continue
+            EXTRATOR.extrair(soup, dados, self._normalizar)
 
             dados_recompra = self._extrair_dados_recompra(soup)
             for k, v in dados_recompra.items():
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Os módulos são importados a partir da raiz do repositório (python main.py, python -m utils...)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
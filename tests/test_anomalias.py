@@ -0,0 +1,43 @@
+from models.registro import RegistroAcao
+from utils import anomalias
+
+
+def _registro(ticker, **campos):
+    return RegistroAcao.de_dict({'ticker': ticker, **campos})
+
+
+def _divergente(ticker):
+    """StatusInvest com P/L e P/VP dez vezes maiores que o consenso de fundamentus e investidor10."""
+    return _registro(ticker,
+                     fundamentus_pl=8.0, investidor10_pl=8.1, statusInvest_pl=80.0,
+                     fundamentus_pvp=1.2, investidor10_pvp=1.2, statusInvest_pvp=12.0)
+
+
+def test_detectar_anomalias_sem_pares_avalia_todas_as_fontes():
+    assert [(a.ticker, a.fonte) for a in anomalias.detectar_anomalias([_divergente('PETR4')], {})] == \
+        [('PETR4', 'statusInvest')]
+
+
+def test_detectar_anomalias_ignora_fonte_nao_coletada():
+    coletadas = {('PETR4', 'fundamentus'), ('PETR4', 'investidor10')}
+
+    assert anomalias.detectar_anomalias([_divergente('PETR4')], {}, coletadas) == []
+
+
+def test_revalidar_nao_recoleta_fonte_nao_coletada(monkeypatch):
+    pedidos = []
+
+    def recoletar(pares, *args):
+        pedidos.extend(pares)
+        return [(ticker, fonte, None) for ticker, fonte in pares]
+
+    monkeypatch.setattr(anomalias, 'recoletar', recoletar)
+    registros = [_divergente('PETR4'), _divergente('VALE3')]
+    # PETR4 teve o StatusInvest do cache; VALE3 foi coletado nesta execução
+    coletadas = {('PETR4', 'fundamentus'), ('VALE3', 'fundamentus'), ('VALE3', 'statusInvest')}
+
+    corrigidas, persistentes, falhas = anomalias.revalidar(registros, coletadas, {}, conexoes=1)
+
+    assert pedidos == [('VALE3', 'statusInvest')]
+    assert corrigidas == [] and persistentes == []
+    assert [(a.ticker, a.fonte) for a in falhas] == [('VALE3', 'statusInvest')]
@@ -0,0 +1,33 @@
+import multiprocessing
+import os
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+import pytest
+from models.coleta_paralela import _iniciar_processo, _parse_em_processo
+
+PAGINA = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'paginas', 'fundamentus.html')
+
+
+def _parse_sem_fork(*argumentos_iniciais):
+    with open(PAGINA, 'r', encoding='utf-8') as f:
+        html = f.read()
+    contexto = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=1, mp_context=contexto, initializer=_iniciar_processo,
+                             initargs=argumentos_iniciais) as cpu:
+        return cpu.submit(_parse_em_processo, 'fundamentus', 'WEGE3', html, True, ()).result()
+
+
+@pytest.mark.parametrize('perfilar', [True, False])
+def test_perfilamento_chega_ao_processo_de_parse_sem_fork(perfilar):
+    registro, _, estatisticas = _parse_sem_fork(perfilar)
+
+    assert registro['fundamentus_pl'] is not None
+    assert (estatisticas is not None) == perfilar
+
+
+def test_hora_de_referencia_chega_ao_processo_de_parse_sem_fork():
+    # A página tem a oscilação de 2026: na execução de 2027 ela é a do ano anterior
+    registro, _, _ = _parse_sem_fork(False, datetime(2027, 3, 1))
+
+    assert registro['fundamentus_oscilacao_ano_menos_1_percentual'] == 12.3
+    assert registro['fundamentus_oscilacao_ano_atual_percentual'] is None
@@ -0,0 +1,113 @@
+import json
+from datetime import datetime
+from models.registro import RegistroAcao
+from utils.conciliacao import conciliar, main
+from utils.dataset import carregar_dataset
+
+AGORA = datetime(2024, 5, 2, 12, 0, 0)
+
+
+def _registro(ticker, atualizado_em='2024-05-01 10:00:00', **campos):
+    return RegistroAcao.de_dict({'ticker': ticker, 'atualizado_em': atualizado_em, **campos})
+
+
+def _por_ticker(registros):
+    return {registro['ticker']: registro for registro in registros}
+
+
+def test_fonte_alterada_de_um_lado_so_vale_esse_lado():
+    base = {'PETR4': _registro('PETR4', fundamentus_pl=8.0, statusInvest_pl=8.1)}
+    nossos = {'PETR4': _registro('PETR4', '2024-05-02 09:00:00', fundamentus_pl=9.0, statusInvest_pl=8.1)}
+    deles = {'PETR4': _registro('PETR4', '2024-05-02 08:00:00', fundamentus_pl=8.0, statusInvest_pl=7.5)}
+
+    registros, _, resumo = conciliar(base, nossos, deles, AGORA)
+
+    petr4 = _por_ticker(registros)['PETR4']
+    assert petr4['fundamentus_pl'] == 9.0
+    assert petr4['statusInvest_pl'] == 7.5
+    assert petr4['atualizado_em'] == '2024-05-02 09:00:00'
+    assert resumo['pela_data'] == 0
+
+
+def test_fonte_alterada_dos_dois_lados_fica_a_mais_recente():
+    base = {'PETR4': _registro('PETR4', statusInvest_pl=8.0)}
+    nossos = {'PETR4': _registro('PETR4', statusInvest_pl=9.0,
+                                 statusInvest_data_atualizacao='2024-05-02 08:00:00')}
+    deles = {'PETR4': _registro('PETR4', statusInvest_pl=7.0,
+                                statusInvest_data_atualizacao='2024-05-02 11:00:00')}
+
+    registros, _, resumo = conciliar(base, nossos, deles, AGORA)
+
+    assert _por_ticker(registros)['PETR4']['statusInvest_pl'] == 7.0
+    assert resumo['pela_data'] == 1
+
+
+def test_fonte_com_erro_perde_para_a_outra():
+    nossos = {'PETR4': _registro('PETR4', '2024-05-02 11:00:00', fundamentus_pl=None,
+                                 fundamentus_erro='Fundamentus: Falha')}
+    deles = {'PETR4': _registro('PETR4', '2024-05-02 08:00:00', fundamentus_pl=9.0)}
+
+    registros, _, _ = conciliar({}, nossos, deles, AGORA)
+
+    assert _por_ticker(registros)['PETR4']['fundamentus_pl'] == 9.0
+
+
+def test_ticker_removido_de_um_lado_e_intocado_no_outro_sai():
+    base = {'PETR4': _registro('PETR4'), 'VALE3': _registro('VALE3', fundamentus_pl=6.0)}
+    nossos = {'PETR4': _registro('PETR4')}
+    deles = {'PETR4': _registro('PETR4'), 'VALE3': _registro('VALE3', fundamentus_pl=6.0),
+             'WEGE3': _registro('WEGE3', fundamentus_pl=30.0)}
+
+    registros, _, resumo = conciliar(base, nossos, deles, AGORA)
+
+    assert [registro['ticker'] for registro in registros] == ['PETR4', 'WEGE3']
+    assert resumo['removidos'] == 1
+
+
+def test_ticker_removido_de_um_lado_e_alterado_no_outro_fica():
+    base = {'PETR4': _registro('PETR4'), 'VALE3': _registro('VALE3', fundamentus_pl=6.0)}
+    nossos = {'PETR4': _registro('PETR4')}
+    deles = {'PETR4': _registro('PETR4'), 'VALE3': _registro('VALE3', fundamentus_pl=6.5)}
+
+    registros, _, _ = conciliar(base, nossos, deles, AGORA)
+
+    assert [registro['ticker'] for registro in registros] == ['PETR4', 'VALE3']
+
+
+def test_ordem_do_lado_que_reordenou():
+    base = {ticker: _registro(ticker) for ticker in ('PETR4', 'VALE3', 'ITUB4')}
+    nossos = {ticker: _registro(ticker) for ticker in ('PETR4', 'VALE3', 'ITUB4', 'WEGE3')}
+    deles = {ticker: _registro(ticker) for ticker in ('ITUB4', 'PETR4', 'VALE3')}
+
+    registros, _, _ = conciliar(base, nossos, deles, AGORA)
+
+    assert [registro['ticker'] for registro in registros] == ['ITUB4', 'PETR4', 'VALE3', 'WEGE3']
+
+
+def _gravar(caminho, registros):
+    caminho.write_text(json.dumps(registros, indent=4, ensure_ascii=False), encoding='utf-8')
+    return str(caminho)
+
+
+def test_driver_grava_o_resultado_sobre_o_nosso(tmp_path):
+    base = _gravar(tmp_path / 'base.json', [{'ticker': 'PETR4', 'fundamentus_pl': 8.0}])
+    nosso = _gravar(tmp_path / 'nosso.json', [{'ticker': 'PETR4', 'fundamentus_pl': 9.0}])
+    deles = _gravar(tmp_path / 'deles.json', [{'ticker': 'PETR4', 'fundamentus_pl': 8.0},
+                                              {'ticker': 'VALE3', 'fundamentus_pl': 6.0}])
+
+    assert main([base, nosso, deles]) == 0
+
+    resultado = carregar_dataset(nosso, estrito=True)
+    assert list(resultado) == ['PETR4', 'VALE3']
+    assert resultado['PETR4']['fundamentus_pl'] == 9.0
+
+
+def test_driver_com_arquivo_invalido_mantem_o_conflito(tmp_path):
+    base = _gravar(tmp_path / 'base.json', [{'ticker': 'PETR4', 'fundamentus_pl': 8.0}])
+    nosso = tmp_path / 'nosso.json'
+    nosso.write_text('<<<<<<< HEAD\n[{"ticker": "PETR4"', encoding='utf-8')
+    deles = _gravar(tmp_path / 'deles.json', [{'ticker': 'PETR4', 'fundamentus_pl': 8.0}])
+
+    assert main([base, str(nosso), deles]) == 1
+    # O git mantém o arquivo com os marcadores para resolver à mão
+    assert nosso.read_text(encoding='utf-8').startswith('<<<<<<<')
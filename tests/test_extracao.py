@@ -0,0 +1,50 @@
+import os
+import pytest
+from benchmarks.extracao_legado import SCRAPERS_LEGADOS
+from benchmarks.paginas import carregar
+from scrapers.base_scraper import SCRAPERS_POR_FONTE
+
+# Trechos escritos à mão na estrutura que cada scraper lê (não são páginas salvas dos sites)
+DIRETORIO_PAGINAS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'paginas')
+TICKER_PAGINAS = 'WEGE3'
+# Argumentos do parse() além do HTML
+ARGUMENTOS_PARSE = {'statusInvest': ('Atualização Manual Local',)}
+# Hora da coleta, não conteúdo da página
+IGNORADOS = {'statusInvest_data_atualizacao'}
+# Banco, petróleo e a small cap com campos vazios: o parse anterior do StatusInvest é lento (uma busca por indicador)
+TICKERS_BENCHMARK = ('ITUB4', 'PETR4', 'TECN3')
+
+
+def _paginas_escritas():
+    for arquivo in sorted(os.listdir(DIRETORIO_PAGINAS)):
+        fonte = arquivo[:-len('.html')]
+        with open(os.path.join(DIRETORIO_PAGINAS, arquivo), 'r', encoding='utf-8') as f:
+            yield pytest.param(fonte, TICKER_PAGINAS, f.read(), ARGUMENTOS_PARSE.get(fonte, ()), id=f'escrita-{fonte}')
+
+
+def _paginas_benchmark():
+    for fonte, paginas in carregar(tickers=TICKERS_BENCHMARK).items():
+        for pagina in paginas:
+            yield pytest.param(fonte, pagina.ticker, pagina.html, tuple(pagina.argumentos_parse),
+                               id=f'{pagina.origem}-{fonte}-{pagina.ticker}')
+
+
+def _registro(classe, ticker, normalizar, html, argumentos):
+    # O parse atual devolve RegistroAcao; o do commit inicial, dict
+    dados = dict(classe(ticker, normalizar=normalizar).parse(html, *argumentos))
+    return {chave: valor for chave, valor in dados.items() if chave not in IGNORADOS}
+
+
+def test_paginas_escritas_de_todas_as_fontes():
+    assert {os.path.splitext(arquivo)[0] for arquivo in os.listdir(DIRETORIO_PAGINAS)} == set(SCRAPERS_POR_FONTE)
+
+
+@pytest.mark.parametrize('normalizar', [True, False], ids=['normalizado', 'bruto'])
+@pytest.mark.parametrize('fonte, ticker, html, argumentos', [*_paginas_escritas(), *_paginas_benchmark()])
+def test_extrator_igual_ao_parse_anterior(fonte, ticker, html, argumentos, normalizar):
+    novo = _registro(SCRAPERS_POR_FONTE[fonte], ticker, normalizar, html, argumentos)
+    legado = _registro(SCRAPERS_LEGADOS[fonte], ticker, normalizar, html, argumentos)
+    assert novo == legado
+    # Página sem nenhum campo extraído passaria na comparação sem testar nada
+    assert any(valor is not None for chave, valor in novo.items()
+               if chave.startswith(fonte) and not chave.endswith('_erro'))
@@ -0,0 +1,73 @@
+import json
+from datetime import datetime
+import main
+from scrapers.fundamentus_scraper import _rotulos_dos_anos
+from utils import http, relogio
+from utils.gravacao import Gravador, Reprodutor, RespostaGravada, ENTRADA_DATASET, ENTRADA_TICKERS, ENTRADA_RELOGIO
+
+
+def test_entradas_gravadas_nao_contam_como_requisicoes(tmp_path):
+    caminho = str(tmp_path / 'execucao.jsonl.gz')
+    gravador = Gravador(caminho)
+    gravador.registrar_entrada(ENTRADA_TICKERS, ['PETR4', 'VALE3'])
+    gravador.registrar('get', 'https://exemplo/petr4', None, 'fundamentus', 0.0, 0.1, RespostaGravada('<html>'))
+    gravador.fechar()
+
+    reprodutor = Reprodutor(caminho)
+
+    assert gravador.total == 1 and len(reprodutor) == 1
+    assert reprodutor.entradas == {ENTRADA_TICKERS: ['PETR4', 'VALE3']}
+    assert reprodutor.responder('get', 'https://exemplo/petr4', None).text == '<html>'
+
+
+def test_reproducao_usa_o_dataset_gravado(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / main.JSON_FILE).write_text(json.dumps([{'ticker': 'PETR4', 'fundamentus_pl': 8.5}]), encoding='utf-8')
+    http.ativar_gravacao(str(tmp_path / 'execucao.jsonl.gz'))
+    try:
+        gravado = main.carregar_dados_existentes()
+    finally:
+        http.encerrar_gravacao()
+
+    # Depois da gravação o arquivo muda; a reprodução continua vendo o de antes
+    (tmp_path / main.JSON_FILE).write_text(json.dumps([{'ticker': 'VALE3'}]), encoding='utf-8')
+    http.ativar_reproducao(str(tmp_path / 'execucao.jsonl.gz'))
+    try:
+        reproduzido = main.carregar_dados_existentes()
+    finally:
+        http.encerrar_gravacao()
+
+    assert list(reproduzido) == list(gravado) == ['PETR4']
+    assert reproduzido['PETR4']['fundamentus_pl'] == 8.5
+    assert list(main.carregar_dados_existentes()) == ['VALE3']
+
+
+def test_gravacao_guarda_a_hora_de_referencia(tmp_path, monkeypatch):
+    monkeypatch.setattr(relogio, '_referencia', None)
+    http.ativar_gravacao(str(tmp_path / 'execucao.jsonl.gz'))
+    try:
+        main.fixar_hora_de_referencia()
+    finally:
+        http.encerrar_gravacao()
+
+    gravada = Reprodutor(str(tmp_path / 'execucao.jsonl.gz')).entradas[ENTRADA_RELOGIO]
+    assert datetime.fromisoformat(gravada) == relogio.agora().replace(microsecond=0)
+
+
+def test_reproducao_decide_pela_hora_gravada(tmp_path, monkeypatch):
+    monkeypatch.setattr(relogio, '_referencia', None)
+    caminho = str(tmp_path / 'execucao.jsonl.gz')
+    gravador = Gravador(caminho)
+    gravador.registrar_entrada(ENTRADA_RELOGIO, '2024-05-02T12:00:00')
+    gravador.fechar()
+
+    http.ativar_reproducao(caminho)
+    try:
+        main.fixar_hora_de_referencia()
+    finally:
+        http.encerrar_gravacao()
+
+    assert relogio.agora() == datetime(2024, 5, 2, 12, 0, 0)
+    # Cache de 2 dias na hora da gravação: continua válido, qualquer que seja o dia da reprodução
+    assert main.statusinvest_recente({'statusInvest_data_atualizacao': '2024-04-30 10:00:00'})
+    assert _rotulos_dos_anos()['2024'] == 'fundamentus_oscilacao_ano_atual_percentual'
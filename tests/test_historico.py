@@ -0,0 +1,29 @@
+from utils.historico import HistoricoSQLite
+
+
+def test_segunda_execucao_do_dia_remove_campo_que_ficou_nulo(tmp_path):
+    with HistoricoSQLite(str(tmp_path / 'historico.db')) as historico:
+        historico.gravar_execucao([{'ticker': 'PETR4', 'fundamentus_pl': 8.5, 'fundamentus_pvp': 1.2},
+                                   {'ticker': 'VALE3', 'fundamentus_pl': 6.0}], '2024-05-02')
+        historico.gravar_execucao([{'ticker': 'PETR4', 'fundamentus_pl': 9.0, 'fundamentus_pvp': None}],
+                                  '2024-05-02')
+
+        assert historico.snapshot(['fundamentus_pl', 'fundamentus_pvp'], '2024-05-02') == {
+            'PETR4': {'fundamentus_pl': 9.0},
+            'VALE3': {'fundamentus_pl': 6.0},
+        }
+
+
+def test_outro_dia_nao_e_apagado(tmp_path):
+    with HistoricoSQLite(str(tmp_path / 'historico.db')) as historico:
+        historico.gravar_execucao([{'ticker': 'PETR4', 'fundamentus_pl': 8.5}], '2024-05-01')
+        historico.gravar_execucao([{'ticker': 'PETR4', 'fundamentus_pl': None}], '2024-05-02')
+
+        assert historico.serie_temporal('PETR4', 'fundamentus_pl', ate='2024-05-02') == [('2024-05-01', 8.5)]
+
+
+def test_snapshot_sem_campos(tmp_path):
+    with HistoricoSQLite(str(tmp_path / 'historico.db')) as historico:
+        historico.gravar_execucao([{'ticker': 'PETR4', 'fundamentus_pl': 8.5}], '2024-05-02')
+
+        assert historico.snapshot([]) == {}
@@ -0,0 +1,49 @@
+import json
+import time
+import main
+from utils import listaticker
+from utils.http import ErroRequisicao
+from utils.listaticker import ListaTicker
+
+
+class _RespostaCsv:
+    status_code = 200
+
+    def __init__(self, tickers):
+        self.text = "ticker\n" + "".join(f"BVMF:{ticker}\n" for ticker in tickers)
+
+    def raise_for_status(self):
+        pass
+
+
+def _gravar(caminho, conteudo):
+    caminho.write_text(json.dumps(conteudo), encoding='utf-8')
+    return str(caminho)
+
+
+def test_ticker_novo_da_atualizacao_em_segundo_plano_vai_na_frente_na_execucao_seguinte(tmp_path, monkeypatch):
+    cache = _gravar(tmp_path / 'cache.json', {'baixado_em': time.time() - 24 * 3600, 'tickers': ['PETR4', 'VALE3']})
+    dados = _gravar(tmp_path / 'dados.json', [{'ticker': 'PETR4'}, {'ticker': 'VALE3'}])
+    monkeypatch.setattr(listaticker, 'requisitar', lambda *a, **k: _RespostaCsv(['PETR4', 'VALE3', 'WEGE3']))
+
+    # Cache expirado: a execução usa a lista antiga e a planilha chega em segundo plano
+    primeira = ListaTicker(cache, arquivo_dados=dados)
+    assert primeira.obter_lista_ticker() == ['PETR4', 'VALE3']
+    assert primeira.aguardar_atualizacao(timeout=5)
+
+    # Próxima execução: cache válido, sem diferença registrada, e WEGE3 ainda não está no dataset
+    segunda = ListaTicker(cache, arquivo_dados=dados)
+    assert segunda.tickers_adicionados == []
+    mapa = {'PETR4': {'ticker': 'PETR4'}, 'VALE3': {'ticker': 'VALE3'}}
+    assert main.novos_na_frente(segunda.obter_lista_ticker(), mapa) == ['WEGE3', 'PETR4', 'VALE3']
+
+
+def test_planilha_indisponivel_usa_o_dataset(tmp_path, monkeypatch):
+    dados = _gravar(tmp_path / 'dados.json', [{'ticker': 'PETR4'}, {'ticker': 'vale3 '}])
+
+    def falhar(*args, **kwargs):
+        raise ErroRequisicao("Connection refused")
+
+    monkeypatch.setattr(listaticker, 'requisitar', falhar)
+
+    assert ListaTicker(str(tmp_path / 'cache.json'), arquivo_dados=dados).obter_lista_ticker() == ['PETR4', 'VALE3']
@@ -0,0 +1,30 @@
+import re
+from utils.metricas import Metricas, RESULTADO_ACERTO
+
+
+def _series(texto):
+    return [linha.rsplit(' ', 1)[0] for linha in texto.splitlines() if linha and not linha.startswith('#')]
+
+
+def _shard(indice):
+    metricas = Metricas()
+    metricas.observar('download', 0.2, 'fundamentus')
+    metricas.contar('cache_statusinvest', resultado=RESULTADO_ACERTO)
+    metricas.registrar_registros([{'ticker': 'PETR4', 'fundamentus_erro': 'timeout'}])
+    return metricas.texto_prometheus(metricas.relatorio(), {'shard': f'{indice}/2'})
+
+
+def test_shards_nao_repetem_series():
+    series = _series(_shard(1)) + _series(_shard(2))
+
+    assert len(series) == len(set(series))
+    assert all(re.search(r'shard="[12]/2"', serie) for serie in series)
+
+
+def test_sem_rotulos_fixos_mantem_o_formato():
+    metricas = Metricas()
+    metricas.contar('requisicoes', fonte='fundamentus', status='200')
+    texto = metricas.texto_prometheus(metricas.relatorio())
+
+    assert 'coleta_requisicoes_total{fonte="fundamentus",status="200"} 1' in texto
+    assert re.search(r'^coleta_duracao_execucao_segundos [\d.]+$', texto, re.M)
@@ -0,0 +1,53 @@
+import pytest
+from benchmarks.bench_normalizacao import gerar_corpus
+from utils.normalizacao_lote import normalizar_coluna, normalizar_registros
+from utils.normalization import normalize_numeric_value
+
+CASOS = [
+    'R$\xa01,5', '1,5\xa0mil', '1e5', '1E5', '-1,5e3', '1_000', '1__0', '1e', 'e5',
+    '12,93', '7,96%', 'R$ 207,42 Bilhões', '207.738.000.000', '1,5 mil', '-34,13',
+    ' 2,5 bi ', '3 M', '1\t5', '.5', '5.', '+3', '--3', '1,2,3', '1e400',
+    '-', '', '   ', 'N/A', 'x', 'nan', 'inf', '10 x',
+]
+
+
+def _identicos(a, b):
+    return a == b and type(a) is type(b)
+
+
+@pytest.mark.parametrize('texto', CASOS)
+def test_lote_igual_celula_a_celula(texto):
+    esperado = normalize_numeric_value(texto)
+    assert _identicos(normalizar_coluna([texto])[0], esperado)
+
+
+def test_lote_igual_celula_a_celula_no_corpus():
+    corpus = gerar_corpus(3000) + CASOS
+    for texto, valor in zip(corpus, normalizar_coluna(corpus)):
+        assert _identicos(valor, normalize_numeric_value(texto)), texto
+
+
+def test_normalizar_registros_so_textos():
+    registros = [{'ticker': 'PETR4', 'fundamentus_pl': '8,5', 'statusInvest_pl': 8.5, 'fundamentus_pvp': '1e0'}]
+
+    assert normalizar_registros(registros) == 2
+    assert registros[0]['fundamentus_pl'] == 8.5 and registros[0]['fundamentus_pvp'] == 1
+
+
+def _celulas_fundamentus(*pares):
+    return ''.join(f'<td class="label"><span class="txt">{rotulo}</span></td><td class="data"><span>{valor}</span></td>'
+                   for rotulo, valor in pares)
+
+
+@pytest.mark.parametrize('invalido', ['N/A', '-', 'x', ''])
+def test_texto_bruto_escolhe_a_mesma_ocorrencia(invalido):
+    from scrapers.fundamentus_scraper import FundamentusScraper
+    html = (f'<table class="w728"><tr>{_celulas_fundamentus(("P/L", invalido), ("P/VP", "1,2"))}</tr>'
+            f'<tr>{_celulas_fundamentus(("P/L", "8,5"))}</tr></table>')
+
+    normalizado = FundamentusScraper('PETR4').parse(html)
+    bruto = FundamentusScraper('PETR4', normalizar=False).parse(html)
+    normalizar_registros([bruto])
+
+    assert normalizado['fundamentus_pl'] == 8.5
+    assert bruto.para_dict() == normalizado.para_dict()
@@ -0,0 +1,68 @@
+import json
+import sqlite3
+from types import SimpleNamespace
+import main
+from models.registro import RegistroAcao
+from utils import agendador
+
+MINUTOS_POR_TICKER = 10
+TICKERS = ['PETR4', 'VALE3', 'WEGE3']
+
+
+class _Relogio:
+    """time.monotonic falso: cada ticker coletado avança MINUTOS_POR_TICKER."""
+
+    def __init__(self):
+        self.segundos = 0.0
+
+    def monotonic(self):
+        return self.segundos
+
+
+class _ListaFalsa:
+    def obter_lista_ticker(self):
+        return list(TICKERS)
+
+    def aguardar_atualizacao(self, timeout=None):
+        return True
+
+
+def test_prazo_atingido_ainda_grava_dataset_delta_e_historico(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('HISTORICO_DB', str(tmp_path / 'historico.db'))
+    anteriores = [{'ticker': ticker, 'fundamentus_pl': 5.0, 'atualizado_em': '2024-05-01 10:00:00'}
+                  for ticker in TICKERS]
+    (tmp_path / main.JSON_FILE).write_text(json.dumps(anteriores), encoding='utf-8')
+
+    relogio = _Relogio()
+    monkeypatch.setattr(agendador, 'time', SimpleNamespace(monotonic=relogio.monotonic))
+    monkeypatch.setattr(main, 'time', SimpleNamespace(monotonic=relogio.monotonic))
+    monkeypatch.setattr(main, 'ListaTicker', _ListaFalsa)
+
+    class _AcaoFalsa:
+        def __init__(self, ticker):
+            self.ticker = ticker
+
+        def get_all_data(self, dados_existentes=None, **kwargs):
+            relogio.segundos += MINUTOS_POR_TICKER * 60
+            registro = RegistroAcao.de_dict({'ticker': self.ticker, 'fundamentus_pl': 9.0,
+                                             'atualizado_em': '2024-05-02 10:00:00'})
+            if dados_existentes is not None:
+                registro.mesclar(dados_existentes)
+            return registro
+
+    monkeypatch.setattr(main, 'Acao', _AcaoFalsa)
+
+    # 25 min: cabem dois tickers de 10 min; o terceiro passaria da margem de gravação
+    main.main(['--deadline', '25', '--priority', 'sheet', '--retry-concurrency', '0',
+               '--anomaly-concurrency', '0', '--metrics-dir', str(tmp_path / 'metricas')])
+
+    dataset = json.loads((tmp_path / main.JSON_FILE).read_text(encoding='utf-8'))
+    assert [(registro['ticker'], registro['fundamentus_pl']) for registro in dataset] == [
+        ('PETR4', 9.0), ('VALE3', 9.0), ('WEGE3', 5.0)]
+
+    delta = json.loads((tmp_path / 'dados_acoes_delta.json').read_text(encoding='utf-8'))
+    assert set(delta['alterados']) == {'PETR4', 'VALE3'}
+
+    with sqlite3.connect(tmp_path / 'historico.db') as conexao:
+        assert conexao.execute('SELECT COUNT(*) FROM execucoes').fetchone()[0] == 1
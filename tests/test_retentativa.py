@@ -0,0 +1,92 @@
+from datetime import datetime, timedelta
+import main
+from models.registro import RegistroAcao
+from utils import retentativa
+from utils.agendador import Prazo
+
+
+def _registro(ticker, **campos):
+    return RegistroAcao.de_dict({'ticker': ticker, **campos})
+
+
+def test_coletar_falhas_so_dos_pares_coletados():
+    registros = [
+        _registro('PETR4', fundamentus_erro='timeout', statusInvest_erro='HTTP 500'),
+        _registro('VALE3', investidor10_erro='HTTP 403', statusInvest_erro='ALL_KEYS_EXHAUSTED'),
+    ]
+    coletadas = {('PETR4', 'fundamentus'), ('VALE3', 'investidor10'), ('VALE3', 'statusInvest')}
+
+    assert retentativa.coletar_falhas(registros, coletadas) == [('PETR4', 'fundamentus'), ('VALE3', 'investidor10')]
+
+
+def test_retentar_falhas_nao_recoleta_fonte_mantida(monkeypatch):
+    pedidos = []
+
+    def recoletar(pares, *args):
+        pedidos.extend(pares)
+        return [(ticker, fonte, _registro(ticker, **{f'{fonte}_erro': None})) for ticker, fonte in pares]
+
+    monkeypatch.setattr(retentativa, 'recoletar', recoletar)
+    registro = _registro('PETR4', fundamentus_erro='timeout', statusInvest_erro='HTTP 500')
+
+    recuperadas, definitivas = retentativa.retentar_falhas([registro], {('PETR4', 'fundamentus')})
+
+    assert pedidos == [('PETR4', 'fundamentus')]
+    assert recuperadas == [('PETR4', 'fundamentus', 'timeout')] and definitivas == []
+    assert registro['statusInvest_erro'] == 'HTTP 500'
+
+
+class _AcaoFalsa:
+    """Acao que devolve ALL_KEYS_EXHAUSTED no StatusInvest e erro nas outras fontes."""
+
+    def __init__(self, ticker):
+        self.ticker = ticker
+
+    def get_all_data(self, dados_existentes=None, fontes=None, **kwargs):
+        if fontes is not None:
+            # Modo seletivo: só as fontes pedidas, sobre o registro anterior
+            registro = dados_existentes.copy() if dados_existentes is not None else _registro(self.ticker)
+            for fonte in fontes:
+                registro[f'{fonte}_erro'] = 'ALL_KEYS_EXHAUSTED' if fonte == 'statusInvest' else 'timeout'
+            return registro
+        registro = _registro(self.ticker, fundamentus_erro='timeout')
+        if dados_existentes is not None:
+            registro.mesclar(dados_existentes)
+        else:
+            registro['statusInvest_erro'] = 'ALL_KEYS_EXHAUSTED'
+        return registro
+
+
+def test_coletar_sequencial_exclui_statusinvest_recuperado_e_do_cache(monkeypatch):
+    monkeypatch.setattr(main, 'Acao', _AcaoFalsa)
+    antigo = (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d %H:%M:%S')
+    recente = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    mapa = {
+        # Cota esgota aqui: o bloco antigo (com o erro antigo) volta para o registro
+        'PETR4': _registro('PETR4', statusInvest_erro='HTTP 500', statusInvest_data_atualizacao=antigo),
+        # Cache recente: o StatusInvest é injetado, não coletado
+        'VALE3': _registro('VALE3', statusInvest_erro='HTTP 502', statusInvest_data_atualizacao=recente),
+    }
+
+    dados, pendentes, coletadas = main.coletar_sequencial(['PETR4', 'VALE3'], mapa, Prazo())
+
+    assert pendentes == []
+    assert [registro['statusInvest_erro'] for registro in dados] == ['HTTP 500', 'HTTP 502']
+    assert ('PETR4', 'statusInvest') not in coletadas and ('VALE3', 'statusInvest') not in coletadas
+    assert ('PETR4', 'fundamentus') in coletadas and ('VALE3', 'fundamentus') in coletadas
+    assert retentativa.coletar_falhas(dados, coletadas) == [('PETR4', 'fundamentus'), ('VALE3', 'fundamentus')]
+
+
+def test_coletar_selecao_so_fontes_do_plano(monkeypatch):
+    monkeypatch.setattr(main, 'Acao', _AcaoFalsa)
+    mapa = {
+        'PETR4': _registro('PETR4', fundamentus_erro='timeout', statusInvest_erro='HTTP 500'),
+        'VALE3': _registro('VALE3', fundamentus_erro='timeout'),
+    }
+    plano = [('PETR4', ['statusInvest']), ('VALE3', ['statusInvest', 'investidor10'])]
+
+    dados, _, coletadas = main.coletar_selecao(plano, mapa, Prazo(), False)
+
+    # --sources statusInvest não retenta o fundamentus; o StatusInvest esgotou a cota
+    assert coletadas == {('VALE3', 'investidor10')}
+    assert retentativa.coletar_falhas(dados, coletadas) == [('VALE3', 'investidor10')]
@@ -0,0 +1,29 @@
+import pytest
+from models.schema import FONTES
+from utils.selecao import interpretar_fontes, interpretar_tickers, planejar_selecao
+
+
+def test_interpretar_fontes_e_tickers():
+    assert interpretar_fontes('statusInvest, fundamentus') == ['statusInvest', 'fundamentus']
+    assert interpretar_tickers(' petr4,VALE3,, ') == ['PETR4', 'VALE3']
+    for texto in ('statusinvest', ',', 'fundamentus,xpto'):
+        with pytest.raises(ValueError):
+            interpretar_fontes(texto)
+
+
+def test_plano_so_com_as_fontes_com_erro():
+    mapa = {
+        'PETR4': {'ticker': 'PETR4', 'fundamentus_erro': 'timeout', 'statusInvest_erro': ''},
+        'VALE3': {'ticker': 'VALE3', 'fundamentus_erro': ''},
+    }
+
+    plano = planejar_selecao(['PETR4', 'VALE3', 'WEGE3', 'PETR4'], ['fundamentus', 'statusInvest'], mapa, True)
+
+    # VALE3 sem erro fica de fora; WEGE3 não está no dataset e entra completo
+    assert plano == [('PETR4', ['fundamentus']), ('WEGE3', list(FONTES))]
+
+
+def test_plano_sem_filtro_de_erro_usa_as_fontes_pedidas():
+    mapa = {'PETR4': {'ticker': 'PETR4'}}
+
+    assert planejar_selecao(['PETR4'], ['investidor10'], mapa, False) == [('PETR4', ['investidor10'])]
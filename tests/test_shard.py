@@ -0,0 +1,51 @@
+import pytest
+from utils.shard import filtrar_shard, interpretar_shard, shard_do_ticker, salvar_shard, mesclar_shards
+
+TICKERS = [f'{prefixo}{numero}' for prefixo in ('PETR', 'VALE', 'ITUB', 'BBDC', 'WEGE', 'MGLU', 'TAEE', 'SBSP')
+           for numero in (3, 4, 11)]
+
+
+def test_interpretar_shard():
+    assert interpretar_shard('2/4') == (2, 4)
+    for texto in ('0/4', '5/4', '1/0', '2', 'a/b'):
+        with pytest.raises(ValueError):
+            interpretar_shard(texto)
+
+
+def test_shards_disjuntos_e_completos():
+    total = 4
+    shards = [filtrar_shard(TICKERS, indice, total) for indice in range(1, total + 1)]
+
+    assert sorted(ticker for shard in shards for ticker in shard) == sorted(TICKERS)
+    assert all(shard == [ticker for ticker in TICKERS if ticker in shard] for shard in shards)
+
+
+def test_shard_nao_depende_do_processo_nem_da_grafia():
+    # CRC32 fixo: o mesmo valor em qualquer job da matrix (hash() de str muda por processo)
+    assert shard_do_ticker('PETR4', 4) == 3
+    assert shard_do_ticker(' petr4 ', 4) == shard_do_ticker('PETR4', 4)
+
+
+def test_shard_de_um_ticker_nao_muda_com_a_lista():
+    total = 3
+    antes = {ticker: indice for indice in range(1, total + 1) for ticker in filtrar_shard(TICKERS, indice, total)}
+    nova_lista = TICKERS[5:] + ['TECN3', 'RAIZ4']
+    depois = {ticker: indice for indice in range(1, total + 1)
+              for ticker in filtrar_shard(nova_lista, indice, total)}
+
+    assert all(depois[ticker] == antes[ticker] for ticker in TICKERS[5:])
+
+
+def test_mesclar_shards_ausente_usa_o_anterior(tmp_path):
+    total = 2
+    lista = TICKERS[:8]
+    presentes = filtrar_shard(lista, 1, total)
+    salvar_shard([{'ticker': ticker, 'fundamentus_pl': 1.0} for ticker in presentes], lista, 1, total, str(tmp_path))
+    anterior = {ticker: {'ticker': ticker, 'fundamentus_pl': 0.5} for ticker in lista}
+
+    registros, ausentes = mesclar_shards(total, anterior, str(tmp_path))
+
+    assert ausentes == [2]
+    assert [registro['ticker'] for registro in registros] == lista
+    assert {registro['ticker']: registro['fundamentus_pl'] for registro in registros} == {
+        ticker: 1.0 if ticker in presentes else 0.5 for ticker in lista}
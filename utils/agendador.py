@@ -0,0 +1,110 @@
+import math
+import time
+from datetime import datetime
+from models.schema import FONTES, ORDEM_CAMPOS
+from utils import relogio
+
+# Critérios de prioridade aceitos por --priority
+PRIORIDADE_DEFASAGEM = 'staleness'
+PRIORIDADE_LIQUIDEZ = 'liquidity'
+PRIORIDADE_PLANILHA = 'sheet'
+PRIORIDADES = (PRIORIDADE_DEFASAGEM, PRIORIDADE_LIQUIDEZ, PRIORIDADE_PLANILHA)
+
+CAMPOS_LIQUIDEZ = tuple(campo for campo in ORDEM_CAMPOS if campo.endswith('_liquidez_media_diaria'))
+
+# Tempo reservado no fim do prazo para salvar JSON, delta e histórico
+MARGEM_PRAZO_SEGUNDOS = 60
+# Quantas durações recentes entram na estimativa de quanto leva um ticker
+JANELA_ESTIMATIVA = 20
+
+
+def _ler_data(texto):
+    if not isinstance(texto, str) or len(texto) < 10:
+        return None
+    try:
+        return datetime.strptime(texto[:19], "%Y-%m-%d %H:%M:%S")
+    except ValueError:
+        try:
+            return datetime.strptime(texto[:10], "%Y-%m-%d")
+        except ValueError:
+            return None
+
+
+def idade_das_fontes(registro, agora=None):
+    """
+    Idade (em segundos) de cada fonte do registro: {fonte: segundos}.
+
+    Cada fonte usa seu próprio '<fonte>_data_atualizacao' quando existe (StatusInvest
+    pode vir do cache) e 'atualizado_em' caso contrário. Fonte com erro na última
+    coleta, ou sem data, tem idade infinita.
+    """
+    agora = agora or relogio.agora()
+    atualizado_em = _ler_data(registro.get('atualizado_em'))
+    idades = {}
+    for fonte in FONTES:
+        data = None if registro.get(f'{fonte}_erro') else \
+            _ler_data(registro.get(f'{fonte}_data_atualizacao')) or atualizado_em
+        idades[fonte] = math.inf if data is None else (agora - data).total_seconds()
+    return idades
+
+
+def defasagem(registro, agora=None):
+    """Idade (em segundos) da fonte mais desatualizada do registro; ticker sem registro é infinita."""
+    if not registro:
+        return math.inf
+    return max(idade_das_fontes(registro, agora).values(), default=0.0)
+
+
+def liquidez(registro):
+    """Maior liquidez média diária entre as fontes (0 se nenhuma informou)."""
+    if not registro:
+        return 0
+    valores = [registro.get(campo) for campo in CAMPOS_LIQUIDEZ]
+    return max((v for v in valores if isinstance(v, (int, float))), default=0)
+
+
+def ordenar_por_prioridade(tickers, mapa_dados_existentes, criterio=PRIORIDADE_DEFASAGEM):
+    """
+    Ordem de processamento dos tickers. A ordenação é estável, então empates
+    mantêm a ordem da planilha. A ordem do JSON final não muda (é sempre a da planilha).
+    """
+    if criterio == PRIORIDADE_PLANILHA:
+        return list(tickers)
+    if criterio == PRIORIDADE_LIQUIDEZ:
+        return sorted(tickers, key=lambda t: liquidez(mapa_dados_existentes.get(t)), reverse=True)
+    if criterio == PRIORIDADE_DEFASAGEM:
+        agora = relogio.agora()
+        return sorted(tickers, key=lambda t: defasagem(mapa_dados_existentes.get(t), agora), reverse=True)
+    raise ValueError(f"Critério de prioridade desconhecido: {criterio}")
+
+
+class Prazo:
+    """
+    Orçamento de tempo da execução (--deadline). Só diz se ainda dá para despachar
+    mais um ticker: compara o tempo restante com a duração média dos últimos tickers
+    mais a margem para gravar os arquivos. O que já começou sempre termina.
+    """
+
+    def __init__(self, minutos=None, margem_segundos=MARGEM_PRAZO_SEGUNDOS):
+        self.limite = time.monotonic() + minutos * 60 if minutos else None
+        self.margem_segundos = margem_segundos
+        self._duracoes = []
+
+    def restante(self):
+        """Segundos até o limite (None se não há prazo)."""
+        if self.limite is None:
+            return None
+        return self.limite - time.monotonic()
+
+    def estimativa_por_ticker(self):
+        recentes = self._duracoes[-JANELA_ESTIMATIVA:]
+        return sum(recentes) / len(recentes) if recentes else 0.0
+
+    def pode_despachar(self):
+        if self.limite is None:
+            return True
+        return self.restante() > self.estimativa_por_ticker() + self.margem_segundos
+
+    def registrar(self, segundos):
+        """Informa quanto levou um ticker concluído."""
+        self._duracoes.append(segundos)
@@ -0,0 +1,229 @@
+"""
+Validação dos registros recém-coletados, antes de salvar.
+
+Uma página que volta meio renderizada (a espera do renderJs do StatusInvest expirou) ou
+um rótulo que deixou de casar no scraper não dão erro: o registro sai com valores
+plausíveis, mas errados ou vazios, até a próxima execução. Cada par (ticker, fonte)
+coletado é comparado com o registro da execução anterior e com as outras fontes do
+mesmo indicador (models.schema.CAMPOS_EQUIVALENTES: fundamentus_pl, statusInvest_pl,
+investidor10_pl...):
+
+  preenchimento  a fonte tinha pelo menos MINIMO_PREENCHIDOS campos e perdeu mais de
+                 QUEDA_PREENCHIMENTO deles
+  divergencia    o valor difere do consenso das outras fontes (duas ou mais que
+                 concordam entre si), e na execução anterior não diferia
+  salto          o valor mudou em relação à execução anterior e o mesmo indicador nas
+                 outras fontes não mudou junto
+
+Valores "diferem" quando |a - b| > TOLERANCIA * max(|a|, |b|). Um par é suspeito com
+queda de preenchimento ou com CAMPOS_SUSPEITOS_MINIMO campos divergentes ou com salto.
+Só os pares suspeitos são coletados de novo. A nova coleta substitui a primeira: se os
+valores se repetem, a mudança é real e fica.
+
+Uso avulso, comparando duas versões do dataset:
+    git show HEAD~1:dados_acoes.json > /tmp/anterior.json
+    python -m utils.anomalias /tmp/anterior.json dados_acoes.json
+"""
+import argparse
+import math
+from collections import namedtuple
+from models.schema import CAMPOS_POR_FONTE, CAMPOS_EQUIVALENTES, TIPOS_CAMPOS, NUMERICO
+from utils.metricas import METRICAS, ANOMALIAS, RECOLETA_ANOMALIAS, RESULTADO_ACERTO
+from utils.retentativa import recoletar, CONEXOES_RETENTATIVA
+
+TOLERANCIA = 0.5
+QUEDA_PREENCHIMENTO = 0.3
+MINIMO_PREENCHIDOS = 5
+CAMPOS_SUSPEITOS_MINIMO = 2
+
+MOTIVO_PREENCHIMENTO = 'preenchimento'
+MOTIVO_DIVERGENCIA = 'divergencia'
+MOTIVO_SALTO = 'salto'
+
+Anomalia = namedtuple('Anomalia', 'ticker fonte motivos')  # motivos: {motivo: [campos]}
+
+# Campos de dados de cada fonte (sem o '<fonte>_erro'), base do preenchimento
+_CAMPOS_DADOS = {
+    fonte: tuple(campo for campo in campos if campo != f'{fonte}_erro')
+    for fonte, campos in CAMPOS_POR_FONTE.items()
+}
+_NUMERICOS = {
+    fonte: tuple(campo for campo in campos if TIPOS_CAMPOS[campo] == NUMERICO)
+    for fonte, campos in _CAMPOS_DADOS.items()
+}
+# Campo numérico -> o mesmo indicador nas outras fontes
+_EQUIVALENTES = {
+    campo: tuple(outro for outro in campos if outro != campo)
+    for campos in CAMPOS_EQUIVALENTES.values() if TIPOS_CAMPOS[campos[0]] == NUMERICO
+    for campo in campos
+}
+
+
+def _numero(valor):
+    return isinstance(valor, (int, float)) and not isinstance(valor, bool) and math.isfinite(valor)
+
+
+def _difere(a, b):
+    return abs(a - b) > TOLERANCIA * max(abs(a), abs(b))
+
+
+def _preenchidos(registro, fonte):
+    return sum(registro.get(campo) is not None for campo in _CAMPOS_DADOS[fonte])
+
+
+def _consenso(registro, campos):
+    """Mediana dos valores de 'campos' se há dois ou mais e todos concordam entre si; senão None."""
+    valores = sorted(valor for valor in (registro.get(campo) for campo in campos) if _numero(valor))
+    if len(valores) < 2 or _difere(valores[0], valores[-1]):
+        return None
+    meio = len(valores) // 2
+    return valores[meio] if len(valores) % 2 else (valores[meio - 1] + valores[meio]) / 2
+
+
+def _divergente(registro, campo):
+    valor = registro.get(campo)
+    if not _numero(valor):
+        return False
+    consenso = _consenso(registro, _EQUIVALENTES.get(campo, ()))
+    return consenso is not None and _difere(valor, consenso)
+
+
+def _saltou(registro, anterior, campo):
+    valor, valor_anterior = registro.get(campo), anterior.get(campo)
+    return _numero(valor) and _numero(valor_anterior) and _difere(valor, valor_anterior)
+
+
+def avaliar_fonte(registro, fonte, anterior=None):
+    """{motivo: [campos]} do par (ticker, fonte); vazio quando nada é suspeito."""
+    motivos = {}
+    if anterior is not None and not anterior.get(f'{fonte}_erro'):
+        antes = _preenchidos(anterior, fonte)
+        if antes >= MINIMO_PREENCHIDOS and _preenchidos(registro, fonte) < antes * (1 - QUEDA_PREENCHIMENTO):
+            motivos[MOTIVO_PREENCHIMENTO] = [campo for campo in _CAMPOS_DADOS[fonte]
+                                             if anterior.get(campo) is not None and registro.get(campo) is None]
+
+    divergentes = []
+    saltos = []
+    for campo in _NUMERICOS[fonte]:
+        if _divergente(registro, campo):
+            # Divergência que já existia é diferença de critério entre os sites, não falha
+            if anterior is None or not _divergente(anterior, campo):
+                divergentes.append(campo)
+        elif anterior is not None and _saltou(registro, anterior, campo):
+            # Mudança acompanhada por outra fonte é mudança de fato (cotação, balanço novo)
+            if not any(_saltou(registro, anterior, outro) for outro in _EQUIVALENTES.get(campo, ())):
+                saltos.append(campo)
+    if len(divergentes) + len(saltos) >= CAMPOS_SUSPEITOS_MINIMO:
+        if divergentes:
+            motivos[MOTIVO_DIVERGENCIA] = divergentes
+        if saltos:
+            motivos[MOTIVO_SALTO] = saltos
+    return motivos
+
+
+def detectar_anomalias(registros, mapa_anterior, coletadas=None):
+    """
+    Pares (ticker, fonte) suspeitos entre os registros coletados. Fontes com
+    '<fonte>_erro' ficam de fora (são da retentativa), assim como as que não vieram.
+
+    :param mapa_anterior: Dict {ticker: registro} da execução anterior.
+    :param coletadas: Pares (ticker, fonte) coletados nesta execução; só eles são avaliados
+                      (fonte do cache ou mantida da execução anterior não é desta coleta).
+                      None avalia todas as fontes (comparação avulsa de dois arquivos).
+    :return: Lista de Anomalia, na ordem dos registros e das fontes.
+    """
+    anomalias = []
+    for registro in registros:
+        anterior = mapa_anterior.get(registro['ticker'])
+        if anterior is registro:
+            continue
+        for fonte in CAMPOS_POR_FONTE:
+            if coletadas is not None and (registro['ticker'], fonte) not in coletadas:
+                continue
+            if registro.get(f'{fonte}_erro') or not _preenchidos(registro, fonte) and anterior is None:
+                continue
+            motivos = avaliar_fonte(registro, fonte, anterior)
+            if motivos:
+                anomalias.append(Anomalia(registro['ticker'], fonte, motivos))
+    return anomalias
+
+
+def _descrever(anomalia):
+    motivos = '; '.join(f"{motivo}: {', '.join(campos[:3])}{'…' if len(campos) > 3 else ''}"
+                        for motivo, campos in anomalia.motivos.items())
+    return f"{anomalia.ticker}/{anomalia.fonte} ({motivos})"
+
+
+def revalidar(registros, coletadas, mapa_anterior, conexoes=CONEXOES_RETENTATIVA, limitador=None, prazo=None,
+              use_local_strategy=False):
+    """
+    Detecta os pares suspeitos e coleta de novo só eles, substituindo os campos da
+    fonte no próprio registro. Roda depois da normalização, então a nova coleta já
+    vem normalizada.
+
+    :param registros: Registros coletados nesta execução (alterados no lugar).
+    :param coletadas: Pares (ticker, fonte) coletados nesta execução; fonte fora dele nunca é coletada de novo.
+    :param conexoes: Conexões da nova coleta; 0 só detecta e informa.
+    :return: (corrigidas, persistentes, falhas) — listas de Anomalia.
+    """
+    anomalias = detectar_anomalias(registros, mapa_anterior, coletadas)
+    if not anomalias:
+        return [], [], []
+    for anomalia in anomalias:
+        for motivo in anomalia.motivos:
+            METRICAS.contar(ANOMALIAS, fonte=anomalia.fonte, motivo=motivo)
+
+    print(f"\n🩺 {len(anomalias)} pares (ticker, fonte) com valores suspeitos:")
+    for anomalia in anomalias:
+        print(f"   {_descrever(anomalia)}")
+    if conexoes <= 0:
+        return [], [], anomalias
+
+    print(f"🔁 Coletando de novo só esses pares ({conexoes} conexões)...")
+    por_ticker = {registro['ticker']: registro for registro in registros}
+    corrigidas = []
+    persistentes = []
+    falhas = []
+    pares = [(anomalia.ticker, anomalia.fonte) for anomalia in anomalias]
+    coletados = recoletar(pares, conexoes, limitador, prazo, True, use_local_strategy)
+    for anomalia, (ticker, fonte, dados_fonte) in zip(anomalias, coletados):
+        if dados_fonte is None or dados_fonte.get(f'{fonte}_erro'):
+            # Sem nova coleta, fica a primeira
+            falhas.append(anomalia)
+            METRICAS.contar(RECOLETA_ANOMALIAS, fonte=fonte, resultado='falha')
+            continue
+        registro = por_ticker[ticker]
+        registro.mesclar(dados_fonte)
+        if avaliar_fonte(registro, fonte, mapa_anterior.get(ticker)):
+            persistentes.append(anomalia)
+            METRICAS.contar(RECOLETA_ANOMALIAS, fonte=fonte, resultado='persistente')
+        else:
+            corrigidas.append(anomalia)
+            METRICAS.contar(RECOLETA_ANOMALIAS, fonte=fonte, resultado=RESULTADO_ACERTO)
+
+    print(f"✅ Corrigidos: {len(corrigidas)}" +
+          (f" — {', '.join(f'{a.ticker}/{a.fonte}' for a in corrigidas)}" if corrigidas else ""))
+    if persistentes:
+        print(f"ℹ️ Repetiram os mesmos valores (mantidos): "
+              f"{', '.join(f'{a.ticker}/{a.fonte}' for a in persistentes)}")
+    if falhas:
+        print(f"⚠️ Sem nova coleta (mantida a primeira): {', '.join(f'{a.ticker}/{a.fonte}' for a in falhas)}")
+    return corrigidas, persistentes, falhas
+
+
+def main():
+    from utils.dataset import carregar_dataset
+
+    parser = argparse.ArgumentParser(description="Pares (ticker, fonte) suspeitos entre duas versões do dataset.")
+    parser.add_argument('anterior', help="dados_acoes.json da execução anterior.")
+    parser.add_argument('atual', help="dados_acoes.json a validar.")
+    args = parser.parse_args()
+
+    anomalias = detectar_anomalias(list(carregar_dataset(args.atual).values()), carregar_dataset(args.anterior))
+    for anomalia in anomalias:
+        print(_descrever(anomalia))
+    print(f"{len(anomalias)} pares suspeitos.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,473 @@
+"""
+API local de leitura do dados_acoes.json.
+
+    python -m utils.api_leitura [--porta 8080] [--ttl-horas 24] [--varredura-minutos 0] [--salvar]
+
+Rotas (GET, respostas JSON):
+    /ticker/<T>                         registro do ticker, como no dados_acoes.json
+    /fields?names=a,b[&tickers=X,Y]     só esses campos, de todos os tickers (ou dos pedidos)
+    /screen?q=<filtro>[&ordem=<expr>...][&limite=N][&campos=a;b]   triagem (utils.triagem)
+    /tickers                            tickers e versão do instantâneo em memória
+    /status                             instantâneo, fila e contadores da atualização
+    /metrics                            utils.metricas no formato do Prometheus
+
+Toda resposta leva ETag (If-None-Match -> 304) e sai com gzip quando o cliente aceita.
+
+O serviço responde sempre na hora, com o instantâneo em memória. As fontes defasadas de
+um ticker pedido em /ticker (erro na última coleta ou mais velhas que --ttl-horas) vão
+para uma fila, e uma thread as recoleta com os scrapers (Acao.get_all_data no modo
+seletivo) e troca o instantâneo ao fim de cada ticker: stale-while-revalidate. Enquanto
+isso a resposta lista as fontes em X-Fontes-Defasadas. --varredura-minutos enfileira
+periodicamente todos os tickers defasados; o arquivo é relido quando muda no disco
+(ex: git pull) e, com --salvar, as recoletas são gravadas nele.
+
+Os scrapers seguem utils.http.url_base; para testar contra o servidor simulado:
+    URL_BASE_SIMULADA=http://127.0.0.1:8765 RAPIDAPI_KEYS=a python -m utils.api_leitura
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import Counter, OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs, unquote
+from models.registro import serializar_registro
+from models.schema import ORDEM_CAMPOS
+from utils.agendador import idade_das_fontes, ordenar_por_prioridade
+from utils.dataset import carregar_dataset, salvar_dataset, ARQUIVO_DATASET
+from utils.metricas import METRICAS
+from utils.triagem import Triagem, ExpressaoInvalida
+
+PORTA_PADRAO = 8080
+TTL_PADRAO_HORAS = 24
+# Respostas prontas (corpo e gzip) guardadas por versão do instantâneo
+MAXIMO_RESPOSTAS_EM_CACHE = 512
+# Abaixo disso o gzip não compensa
+TAMANHO_MINIMO_GZIP = 1024
+# A cada quantos segundos a thread de atualização confere o arquivo e a varredura
+INTERVALO_VERIFICACAO = 5
+
+
+class Resposta:
+    """Corpo pronto de uma rota, com o ETag e o gzip (feito na primeira vez que um cliente pede)."""
+
+    __slots__ = ('status', 'corpo', 'etag', 'cabecalhos', '_gzip')
+
+    def __init__(self, status, dados, cabecalhos=None, tipo='application/json; charset=utf-8'):
+        self.status = status
+        if isinstance(dados, bytes):
+            self.corpo = dados
+        else:
+            self.corpo = json.dumps(dados, ensure_ascii=False, separators=(',', ':'),
+                                    default=serializar_registro).encode('utf-8')
+        self.etag = f'W/"{hashlib.sha1(self.corpo).hexdigest()[:20]}"'
+        self.cabecalhos = {'Content-Type': tipo, **(cabecalhos or {})}
+        self._gzip = None
+
+    @property
+    def gzip(self):
+        if self._gzip is None:
+            self._gzip = gzip.compress(self.corpo, 6)
+        return self._gzip
+
+
+def _erro(status, mensagem):
+    return Resposta(status, {'erro': mensagem})
+
+
+class Instantaneo:
+    """
+    Uma versão do dataset: {ticker: registro} na ordem do JSON, que não muda depois de
+    criada. 'lido' é o DatasetAcoes de onde veio, para salvar_dataset reaproveitar o
+    texto dos registros não recoletados; 'mtime' é o do arquivo nessa leitura.
+    """
+
+    def __init__(self, registros, versao, mtime=None, lido=None):
+        self.registros = registros
+        self.versao = versao
+        self.mtime = mtime
+        self.lido = lido
+        self.criado_em = time.time()
+        self._triagem = None
+        self._trava = threading.Lock()
+
+    @property
+    def triagem(self):
+        """Índice da triagem, montado na primeira consulta a esta versão."""
+        with self._trava:
+            if self._triagem is None:
+                self._triagem = Triagem(self.registros.values())
+            return self._triagem
+
+    def com_registro(self, registro):
+        registros = dict(self.registros)
+        registros[registro['ticker']] = registro
+        return Instantaneo(registros, self.versao + 1, self.mtime, self.lido)
+
+
+class Atualizador:
+    """Fila de tickers com fontes defasadas e a thread que os recoleta, um por vez."""
+
+    def __init__(self, servico, ttl_segundos, varredura_segundos=0, use_local_strategy=False, salvar=False):
+        self.servico = servico
+        self.ttl_segundos = ttl_segundos
+        self.varredura_segundos = varredura_segundos
+        self.use_local_strategy = use_local_strategy
+        self.salvar = salvar
+        self.fila = OrderedDict()   # ticker -> fontes
+        self.em_andamento = None
+        self.statusinvest_esgotado = False
+        self.estatisticas = Counter()
+        self._condicao = threading.Condition()
+        self._parar = False
+        self._pendente_salvar = False
+        self._proxima_varredura = time.monotonic() + varredura_segundos if varredura_segundos else None
+        self._thread = None
+
+    def fontes_defasadas(self, registro):
+        fontes = [fonte for fonte, idade in idade_das_fontes(registro).items() if idade > self.ttl_segundos]
+        if self.statusinvest_esgotado:
+            fontes = [fonte for fonte in fontes if fonte != 'statusInvest']
+        return fontes
+
+    def enfileirar(self, ticker, fontes):
+        with self._condicao:
+            if not fontes or ticker in self.fila or ticker == self.em_andamento or self._parar:
+                return
+            self.fila[ticker] = fontes
+            self.estatisticas['enfileirados'] += 1
+            self._condicao.notify()
+
+    def varrer(self):
+        """Enfileira todos os tickers com fonte defasada, dos mais defasados aos menos."""
+        registros = self.servico.instantaneo.registros
+        for ticker in ordenar_por_prioridade(list(registros), registros):
+            self.enfileirar(ticker, self.fontes_defasadas(registros[ticker]))
+
+    def iniciar(self):
+        self._thread = threading.Thread(target=self._laco, name='atualizador-api', daemon=True)
+        self._thread.start()
+
+    def parar(self):
+        with self._condicao:
+            self._parar = True
+            self._condicao.notify()
+        if self._thread is not None:
+            self._thread.join()
+        self._salvar_se_pendente()
+
+    def _laco(self):
+        while True:
+            with self._condicao:
+                if not self.fila and not self._parar:
+                    self._condicao.wait(INTERVALO_VERIFICACAO)
+                if self._parar:
+                    return
+                if self.fila:
+                    ticker, fontes = self.fila.popitem(last=False)
+                    self.em_andamento = ticker
+                else:
+                    ticker = None
+            if ticker is None:
+                # Fila vazia: grava o lote recoletado, relê o arquivo se mudou e varre
+                self._salvar_se_pendente()
+                self.servico.recarregar_se_mudou()
+                if self._proxima_varredura is not None and time.monotonic() >= self._proxima_varredura:
+                    self._proxima_varredura = time.monotonic() + self.varredura_segundos
+                    self.varrer()
+                continue
+            try:
+                self._atualizar(ticker, fontes)
+            except Exception as e:
+                self.estatisticas['falhas'] += 1
+                print(f"❌ Erro ao atualizar {ticker}: {e}")
+            finally:
+                with self._condicao:
+                    self.em_andamento = None
+
+    def _atualizar(self, ticker, fontes):
+        # Importado aqui: o serviço só de leitura (--sem-atualizacao) não carrega os scrapers
+        from models.acao import Acao
+
+        antigo = self.servico.instantaneo.registros.get(ticker)
+        if self.statusinvest_esgotado:
+            fontes = [fonte for fonte in fontes if fonte != 'statusInvest']
+        if not fontes:
+            return
+        print(f"🔄 API: atualizando {ticker} ({', '.join(fontes)})")
+        novo = Acao(ticker).get_all_data(dados_existentes=antigo, fontes=fontes,
+                                         use_local_strategy=self.use_local_strategy)
+        if 'statusInvest' in fontes and novo.get('statusInvest_erro') == "ALL_KEYS_EXHAUSTED":
+            # Como em main.coletar_selecao: mantém o StatusInvest anterior e para de pedir à API
+            print("⛔ LIMITE DE API ATINGIDO (Todas as chaves). StatusInvest fica fora das próximas atualizações.")
+            self.statusinvest_esgotado = True
+            if antigo:
+                novo.update(antigo.extrair_fonte('statusInvest'))
+        self.servico.trocar(novo)
+        self.estatisticas['atualizados'] += 1
+        self._pendente_salvar = self.salvar
+
+    def _salvar_se_pendente(self):
+        if not self._pendente_salvar:
+            return
+        self._pendente_salvar = False
+        self.servico.salvar()
+
+
+class ServicoLeitura:
+    """Instantâneo atual, rotas e cache das respostas. O HTTP fica em _Manipulador."""
+
+    def __init__(self, caminho=ARQUIVO_DATASET):
+        self.caminho = caminho
+        self._trava = threading.Lock()
+        self._respostas = OrderedDict()
+        self.atualizador = None
+        self.instantaneo = Instantaneo({}, 0)
+        self.recarregar_se_mudou()
+
+    # --- instantâneo -------------------------------------------------------------
+
+    def _mtime(self):
+        try:
+            return os.stat(self.caminho).st_mtime_ns
+        except OSError:
+            return None
+
+    def recarregar_se_mudou(self):
+        mtime = self._mtime()
+        if mtime is None or mtime == self.instantaneo.mtime:
+            return False
+        dataset = carregar_dataset(self.caminho)
+        with self._trava:
+            self.instantaneo = Instantaneo(dict(dataset), self.instantaneo.versao + 1, mtime, dataset)
+            self._respostas.clear()
+        print(f"📂 API: {len(dataset)} tickers de {self.caminho} (versão {self.instantaneo.versao}).")
+        return True
+
+    def trocar(self, registro):
+        with self._trava:
+            self.instantaneo = self.instantaneo.com_registro(registro)
+            self._respostas.clear()
+
+    def salvar(self):
+        """Grava o instantâneo no arquivo (com --salvar), sem reler a própria escrita."""
+        instantaneo = self.instantaneo
+        if self._mtime() != instantaneo.mtime:
+            # Mudou no disco desde a leitura (ex: git pull): vale o arquivo, que será relido
+            print(f"⚠️ API: {self.caminho} mudou no disco; as recoletas não gravadas serão descartadas.")
+            return
+        try:
+            salvar_dataset(list(instantaneo.registros.values()), self.caminho, anterior=instantaneo.lido)
+        except OSError as e:
+            print(f"⚠️ API: não foi possível gravar {self.caminho}: {e}")
+            return
+        with self._trava:
+            if self.instantaneo is instantaneo:
+                instantaneo.mtime = self._mtime()
+        print(f"💾 API: {self.caminho} gravado (versão {instantaneo.versao}).")
+
+    # --- rotas ---------------------------------------------------------------------
+
+    def responder(self, caminho, consulta):
+        """Resposta da rota (do cache quando a mesma URL já foi respondida nesta versão)."""
+        instantaneo = self.instantaneo
+        chave = (instantaneo.versao, caminho, tuple(sorted((k, tuple(v)) for k, v in consulta.items())))
+        with self._trava:
+            resposta = self._respostas.get(chave)
+            if resposta is not None:
+                self._respostas.move_to_end(chave)
+        if resposta is None:
+            resposta = self._rotear(instantaneo, caminho, consulta)
+            if resposta.status == 200 and not caminho.startswith(('/status', '/metrics')):
+                with self._trava:
+                    self._respostas[chave] = resposta
+                    if len(self._respostas) > MAXIMO_RESPOSTAS_EM_CACHE:
+                        self._respostas.popitem(last=False)
+
+        if caminho.startswith('/ticker/') and resposta.status == 200 and self.atualizador is not None:
+            registro = instantaneo.registros[unquote(caminho[len('/ticker/'):]).upper()]
+            defasadas = self.atualizador.fontes_defasadas(registro)
+            if defasadas:
+                self.atualizador.enfileirar(registro['ticker'], defasadas)
+                return resposta, {'X-Fontes-Defasadas': ','.join(defasadas)}
+        return resposta, {}
+
+    def _rotear(self, instantaneo, caminho, consulta):
+        if caminho.startswith('/ticker/'):
+            ticker = unquote(caminho[len('/ticker/'):]).upper()
+            registro = instantaneo.registros.get(ticker)
+            if registro is None:
+                return _erro(404, f"Ticker desconhecido: {ticker}")
+            return Resposta(200, registro)
+        if caminho == '/fields':
+            return self._campos(instantaneo, consulta)
+        if caminho == '/screen':
+            return self._triagem(instantaneo, consulta)
+        if caminho == '/tickers':
+            return Resposta(200, {'versao': instantaneo.versao, 'tickers': list(instantaneo.registros)})
+        if caminho == '/status':
+            return Resposta(200, self.status())
+        if caminho == '/metrics':
+            return Resposta(200, METRICAS.texto_prometheus(METRICAS.relatorio()).encode('utf-8'),
+                            tipo='text/plain; version=0.0.4; charset=utf-8')
+        return _erro(404, f"Rota desconhecida: {caminho}")
+
+    @staticmethod
+    def _lista(consulta, nome, separador=','):
+        return [item.strip() for valor in consulta.get(nome, []) for item in valor.split(separador) if item.strip()]
+
+    def _campos(self, instantaneo, consulta):
+        campos = self._lista(consulta, 'names')
+        if not campos:
+            return _erro(400, "Informe os campos em names=a,b")
+        desconhecidos = [campo for campo in campos if campo not in ORDEM_CAMPOS]
+        if desconhecidos:
+            return _erro(400, f"Campos desconhecidos: {', '.join(desconhecidos)}")
+        tickers = [ticker.upper() for ticker in self._lista(consulta, 'tickers')] or list(instantaneo.registros)
+        dados = {}
+        for ticker in tickers:
+            registro = instantaneo.registros.get(ticker)
+            if registro is not None:
+                dados[ticker] = {campo: registro.get(campo) for campo in campos}
+        return Resposta(200, {'versao': instantaneo.versao, 'campos': campos, 'dados': dados})
+
+    def _triagem(self, instantaneo, consulta):
+        filtro = (consulta.get('q') or [None])[0]
+        ordem = consulta.get('ordem', [])
+        campos = self._lista(consulta, 'campos', ';') or None
+        try:
+            limite = int(consulta['limite'][0]) if 'limite' in consulta else None
+            resultado = instantaneo.triagem.consultar(filtro, ordem, limite, campos)
+        except ValueError as e:
+            # ExpressaoInvalida é um ValueError, como o int() do limite
+            return _erro(400, str(e) if isinstance(e, ExpressaoInvalida) else "limite deve ser um inteiro")
+        return Resposta(200, {
+            'versao': instantaneo.versao,
+            'total': len(resultado),
+            'campos': resultado.campos,
+            'linhas': resultado.linhas(),
+        })
+
+    def status(self):
+        instantaneo = self.instantaneo
+        status = {
+            'arquivo': self.caminho,
+            'versao': instantaneo.versao,
+            'tickers': len(instantaneo.registros),
+            'idade_instantaneo_s': round(time.time() - instantaneo.criado_em, 1),
+        }
+        atualizador = self.atualizador
+        if atualizador is not None:
+            with atualizador._condicao:
+                status.update({
+                    'ttl_horas': atualizador.ttl_segundos / 3600,
+                    'fila': list(atualizador.fila)[:50],
+                    'tamanho_fila': len(atualizador.fila),
+                    'em_andamento': atualizador.em_andamento,
+                    'statusinvest_esgotado': atualizador.statusinvest_esgotado,
+                    **atualizador.estatisticas,
+                })
+        return status
+
+
+def _aceita_gzip(cabecalho):
+    return any(parte.split(';')[0].strip() in ('gzip', '*') for parte in (cabecalho or '').split(','))
+
+
+def _etag_confere(cabecalho, etag):
+    if not cabecalho:
+        return False
+    # Comparação fraca (RFC 9110): ignora o W/
+    etiquetas = {parte.strip().removeprefix('W/') for parte in cabecalho.split(',')}
+    return '*' in etiquetas or etag.removeprefix('W/') in etiquetas
+
+
+class _Manipulador(BaseHTTPRequestHandler):
+    servico = None
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, formato, *argumentos):
+        pass
+
+    def do_GET(self):
+        partes = urlsplit(self.path)
+        try:
+            resposta, extras = self.servico.responder(partes.path.rstrip('/') or '/', parse_qs(partes.query))
+        except Exception as e:
+            resposta, extras = _erro(500, f"{type(e).__name__}: {e}"), {}
+        METRICAS.contar('api_requisicoes', rota=partes.path.split('/')[1] if '/' in partes.path else '',
+                        status=str(resposta.status))
+
+        if resposta.status == 200 and _etag_confere(self.headers.get('If-None-Match'), resposta.etag):
+            self.send_response(304)
+            self.send_header('ETag', resposta.etag)
+            for nome, valor in extras.items():
+                self.send_header(nome, valor)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        corpo = resposta.corpo
+        comprimido = len(corpo) >= TAMANHO_MINIMO_GZIP and _aceita_gzip(self.headers.get('Accept-Encoding'))
+        if comprimido:
+            corpo = resposta.gzip
+        self.send_response(resposta.status)
+        for nome, valor in {**resposta.cabecalhos, **extras}.items():
+            self.send_header(nome, valor)
+        self.send_header('ETag', resposta.etag)
+        # Sempre revalidar: o ETag torna a revalidação barata (304 sem corpo)
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Vary', 'Accept-Encoding')
+        if comprimido:
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+
+def criar_servidor(servico, porta=PORTA_PADRAO, endereco='127.0.0.1'):
+    """ThreadingHTTPServer pronto para serve_forever() (porta 0 = porta livre qualquer)."""
+    manipulador = type('Manipulador', (_Manipulador,), {'servico': servico})
+    servidor = ThreadingHTTPServer((endereco, porta), manipulador)
+    servidor.daemon_threads = True
+    return servidor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--porta", type=int, default=PORTA_PADRAO)
+    parser.add_argument("--endereco", default='127.0.0.1')
+    parser.add_argument("--arquivo", default=ARQUIVO_DATASET)
+    parser.add_argument("--ttl-horas", type=float, default=TTL_PADRAO_HORAS,
+                        help="Idade a partir da qual uma fonte é recoletada.")
+    parser.add_argument("--varredura-minutos", type=float, default=0,
+                        help="Enfileira todos os tickers defasados a cada N minutos (0 = só os pedidos).")
+    parser.add_argument("--sem-atualizacao", action='store_true', help="Só leitura, sem recoletar.")
+    parser.add_argument("--salvar", action='store_true', help="Grava as recoletas no arquivo.")
+    parser.add_argument("--local", action='store_true',
+                        help="StatusInvest via requests direto, em vez da API ScrapeNinja.")
+    args = parser.parse_args()
+
+    servico = ServicoLeitura(args.arquivo)
+    if not args.sem_atualizacao:
+        servico.atualizador = Atualizador(servico, args.ttl_horas * 3600, args.varredura_minutos * 60,
+                                          args.local, args.salvar)
+        servico.atualizador.iniciar()
+    servidor = criar_servidor(servico, args.porta, args.endereco)
+    print(f"🌐 API de leitura em http://{args.endereco}:{servidor.server_address[1]} "
+          f"({len(servico.instantaneo.registros)} tickers)")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+        if servico.atualizador is not None:
+            servico.atualizador.parar()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,180 @@
+"""
+Conciliação de duas versões do dados_acoes.json, por ticker e por fonte.
+
+Uma execução local (atualizar_statusinvest_local.py, --sources ...) e a do Actions
+reescrevem o JSON inteiro; se uma enviou enquanto a outra coletava, o git vê conflito em
+quase todo o arquivo. Aqui as duas versões são mescladas com a versão comum (base):
+
+- fonte (os campos <fonte>_* de um ticker): se só um lado mudou em relação à base, vale
+  esse lado; se os dois mudaram, vale o de data mais recente na fonte ('<fonte>_data_atualizacao'
+  ou 'atualizado_em', como em utils.agendador.idade_das_fontes; fonte com erro perde).
+  Empate fica com o nosso.
+- atualizado_em: o mais recente dos dois.
+- ticker: o que está em um só dos lados fica, a não ser que o outro lado o tenha removido
+  sem que este o alterasse.
+- ordem: a do lado que reordenou os tickers (a planilha); os só do outro lado vão no fim.
+
+Sem base (duas versões avulsas), toda fonte diferente é decidida pela data.
+
+Como driver de merge do git (ligado aos arquivos no .gitattributes e registrado no
+.git/config por utils.git_local.instalar_drivers_mesclagem ou --instalar):
+    python -m utils.conciliacao %O %A %B            resultado gravado em %A
+    python -m utils.conciliacao --delta %O %A %B    dados_acoes_delta.json: fica o mais recente
+"""
+import argparse
+import json
+import sys
+from collections import Counter
+from datetime import datetime
+from models.registro import RegistroAcao
+from models.schema import FONTES, FONTE_GERAL, fonte_do_campo
+from utils.agendador import idade_das_fontes
+from utils.dataset import DatasetAcoes, carregar_dataset, salvar_dataset
+
+NOSSO = 'nosso'
+DELES = 'deles'
+
+
+def _mudou_ordem(lado, base):
+    comuns = [ticker for ticker in lado if ticker in base]
+    return comuns != [ticker for ticker in base if ticker in lado]
+
+
+def _ordem(base, nossos, deles):
+    if _mudou_ordem(deles, base) and not _mudou_ordem(nossos, base):
+        principal, outro = deles, nossos
+    else:
+        principal, outro = nossos, deles
+    return list(principal) + [ticker for ticker in outro if ticker not in principal]
+
+
+def _conciliar_registro(base, nosso, deles, agora, resumo):
+    """Registro mesclado fonte a fonte; o próprio 'nosso' ou 'deles' quando um deles já é o resultado."""
+    escolhas = {}
+    idades = None
+    for fonte in FONTES:
+        dados_nosso, dados_deles = nosso.extrair_fonte(fonte), deles.extrair_fonte(fonte)
+        if dados_nosso == dados_deles:
+            continue
+        dados_base = base.extrair_fonte(fonte) if base is not None else None
+        if dados_base is not None and dados_nosso == dados_base:
+            lado = DELES
+        elif dados_base is not None and dados_deles == dados_base:
+            lado = NOSSO
+        else:
+            if idades is None:
+                idades = idade_das_fontes(nosso, agora), idade_das_fontes(deles, agora)
+            lado = DELES if idades[1][fonte] < idades[0][fonte] else NOSSO
+            resumo['pela_data'] += 1
+        escolhas[fonte] = lado
+        resumo[lado] += 1
+
+    mais_recente = deles if (deles.get('atualizado_em') or '') > (nosso.get('atualizado_em') or '') else nosso
+    lados = set(escolhas.values())
+    if not lados or lados == {NOSSO if mais_recente is nosso else DELES}:
+        return mais_recente
+    if lados == {NOSSO} and mais_recente.get('atualizado_em') == nosso.get('atualizado_em'):
+        return nosso
+
+    registro = RegistroAcao()
+    for campo, valor in mais_recente.items():
+        if fonte_do_campo(campo) == FONTE_GERAL:
+            registro[campo] = valor
+    for fonte in FONTES:
+        registro.mesclar((deles if escolhas.get(fonte) == DELES else nosso).extrair_fonte(fonte))
+    return registro
+
+
+def conciliar(base, nossos, deles, agora=None):
+    """
+    Mescla duas versões do dataset.
+
+    :param base: {ticker: registro} da versão comum (vazio quando não há).
+    :param nossos, deles: DatasetAcoes (ou dicts) das duas versões.
+    :return: (registros na ordem final, DatasetAcoes com os registros reaproveitados de um
+             dos lados, para salvar_dataset não re-serializá-los, resumo)
+    """
+    agora = agora or datetime.now()
+    resumo = Counter()
+    registros = []
+    reaproveitados = DatasetAcoes()
+    for ticker in _ordem(base, nossos, deles):
+        nosso, dele, anterior = nossos.get(ticker), deles.get(ticker), base.get(ticker)
+        if nosso is None or dele is None:
+            presente = nosso if nosso is not None else dele
+            if anterior is not None and presente == anterior:
+                # Removido do outro lado e intocado deste
+                resumo['removidos'] += 1
+                continue
+            registro = presente
+        else:
+            registro = _conciliar_registro(anterior, nosso, dele, agora, resumo)
+
+        for lado in (nossos, deles):
+            textos = getattr(lado, 'textos', {})
+            if lado.get(ticker) is registro and ticker in textos:
+                reaproveitados[ticker] = registro
+                reaproveitados.textos[ticker] = textos[ticker]
+                break
+        registros.append(registro)
+    resumo['tickers'] = len(registros)
+    return registros, reaproveitados, resumo
+
+
+def conciliar_arquivos(base, nosso, deles, saida=None):
+    """Mescla os arquivos (caminhos) e grava o resultado em 'saida' (padrão: sobre 'nosso', como o git espera)."""
+    registros, reaproveitados, resumo = conciliar(
+        carregar_dataset(base, estrito=True) if base else {},
+        carregar_dataset(nosso, estrito=True),
+        carregar_dataset(deles, estrito=True),
+    )
+    salvar_dataset(registros, saida or nosso, reaproveitados)
+    print(f"🔀 Conciliação: {resumo['tickers']} tickers; fontes do nosso lado: {resumo[NOSSO]}, "
+          f"do outro: {resumo[DELES]} ({resumo['pela_data']} decididas pela data); "
+          f"{resumo['removidos']} tickers removidos.")
+    return resumo
+
+
+def conciliar_delta(nosso, deles, saida=None):
+    """O delta descreve a última execução: fica o de 'gerado_em' mais recente."""
+    with open(nosso, 'r', encoding='utf-8') as f:
+        texto_nosso = f.read()
+    with open(deles, 'r', encoding='utf-8') as f:
+        texto_deles = f.read()
+    gerado_nosso = json.loads(texto_nosso).get('gerado_em', '')
+    gerado_deles = json.loads(texto_deles).get('gerado_em', '')
+    with open(saida or nosso, 'w', encoding='utf-8') as f:
+        f.write(texto_deles if gerado_deles > gerado_nosso else texto_nosso)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mescla duas versões do dados_acoes.json por ticker e por fonte.")
+    parser.add_argument('arquivos', nargs='*', metavar='ARQ',
+                        help="BASE NOSSO DELES (%%O %%A %%B do git) ou só NOSSO DELES, sem versão comum.")
+    parser.add_argument('--saida', metavar='ARQ', help="Onde gravar o resultado (padrão: sobre NOSSO).")
+    parser.add_argument('--delta', action='store_true',
+                        help="Os arquivos são dados_acoes_delta.json: fica o gerado por último.")
+    parser.add_argument('--instalar', action='store_true',
+                        help="Registra os drivers de merge do .gitattributes no .git/config.")
+    args = parser.parse_args(argv)
+
+    if args.instalar:
+        from utils.git_local import instalar_drivers_mesclagem
+        return 0 if instalar_drivers_mesclagem() else 1
+    if len(args.arquivos) not in (2, 3):
+        parser.error("informe BASE NOSSO DELES ou NOSSO DELES")
+    base, nosso, deles = ([None] + args.arquivos)[-3:]
+    try:
+        if args.delta:
+            conciliar_delta(nosso, deles, args.saida)
+        else:
+            conciliar_arquivos(base, nosso, deles, args.saida)
+    except Exception as e:
+        # Código diferente de zero: o git mantém o conflito para resolver à mão
+        print(f"❌ Conciliação de {nosso} falhou: {e}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,95 @@
+import json
+import os
+import re
+from models.registro import RegistroAcao, serializar_registro
+
+ARQUIVO_DATASET = 'dados_acoes.json'
+
+_SEPARADORES = re.compile(r'[\s,]*')
+_INDENTACAO = ' ' * 4
+
+
+class DatasetAcoes(dict):
+    """
+    {ticker: RegistroAcao} lido do dados_acoes.json. Guarda também o texto JSON
+    original de cada registro, para que salvar_dataset reaproveite sem
+    re-serializar os registros que a execução não tocou.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.textos = {}
+
+
+def carregar_dataset(caminho=ARQUIVO_DATASET, estrito=False):
+    """
+    Lê o JSON registro a registro, guardando o trecho de texto de cada um.
+
+    Arquivo ausente ou vazio é um dataset vazio. Arquivo inválido também, com um aviso;
+    com estrito=True a exceção é levantada (quem mescla não pode confundir com vazio).
+    """
+    if not os.path.exists(caminho):
+        return DatasetAcoes()
+    try:
+        with open(caminho, 'r', encoding='utf-8') as f:
+            texto = f.read()
+    except Exception as e:
+        if estrito:
+            raise
+        print(f"Erro ao ler JSON existente: {e}")
+        return DatasetAcoes()
+    return dataset_de_texto(texto, estrito)
+
+
+def dataset_de_texto(texto, estrito=False):
+    """Como carregar_dataset, a partir do conteúdo do arquivo (ex: o gravado por --record)."""
+    dataset = DatasetAcoes()
+    try:
+        if not texto.strip():
+            return dataset
+        decoder = json.JSONDecoder()
+        pos = _SEPARADORES.match(texto).end()
+        if texto[pos] != '[':
+            raise ValueError("o arquivo não contém uma lista de registros")
+        pos += 1
+        while True:
+            pos = _SEPARADORES.match(texto, pos).end()
+            if texto[pos] == ']':
+                break
+            item, fim = decoder.raw_decode(texto, pos)
+            ticker = item['ticker']
+            dataset[ticker] = RegistroAcao.de_dict(item)
+            dataset.textos[ticker] = texto[pos:fim]
+            pos = fim
+    except Exception as e:
+        if estrito:
+            raise
+        print(f"Erro ao ler JSON existente: {e}")
+        return DatasetAcoes()
+    return dataset
+
+
+def salvar_dataset(registros, caminho=ARQUIVO_DATASET, anterior=None):
+    """
+    Grava a lista no mesmo formato de json.dump(..., indent=4, ensure_ascii=False).
+
+    Registros que são o mesmo objeto lido em 'anterior' (carregados e não tocados)
+    são escritos com o texto original; só os demais passam pelo json.dumps.
+
+    :return: Quantos registros foram reaproveitados sem serializar.
+    """
+    textos = anterior.textos if isinstance(anterior, DatasetAcoes) else {}
+    partes = []
+    reaproveitados = 0
+    for registro in registros:
+        ticker = registro['ticker']
+        if ticker in textos and anterior.get(ticker) is registro:
+            partes.append(_INDENTACAO + textos[ticker])
+            reaproveitados += 1
+        else:
+            texto = json.dumps(registro, indent=4, ensure_ascii=False, default=serializar_registro)
+            partes.append(_INDENTACAO + texto.replace('\n', '\n' + _INDENTACAO))
+
+    with open(caminho, 'w', encoding='utf-8') as f:
+        f.write('[\n' + ',\n'.join(partes) + '\n]' if partes else '[]')
+    return reaproveitados
@@ -0,0 +1,98 @@
+import json
+from datetime import datetime
+import pytz
+from models.registro import serializar_registro
+
+ARQUIVO_DELTA_PADRAO = 'dados_acoes_delta.json'
+
+# Campos que mudam a cada execução. Sozinhos não justificam incluir o ticker no delta,
+# mas acompanham as demais alterações quando o ticker mudou de fato.
+CAMPOS_VOLATEIS = {"atualizado_em"}
+
+
+def calcular_delta(mapa_anterior, registros_novos):
+    """
+    Compara o dataset anterior com o novo, campo a campo, por ticker.
+
+    :param mapa_anterior: Dict {ticker: registro} da execução anterior.
+    :param registros_novos: Lista de registros (na ordem final do JSON).
+    :return: Dict com 'alterados', 'campos_removidos', 'novos', 'removidos' e,
+             se a ordem dos tickers mudou, 'ordem'.
+    """
+    alterados = {}
+    campos_removidos = {}
+    novos = {}
+
+    for registro in registros_novos:
+        ticker = registro['ticker']
+        anterior = mapa_anterior.get(ticker)
+        if anterior is None:
+            novos[ticker] = registro
+            continue
+        if anterior is registro:
+            # Registro mantido da execução anterior (não coletado nesta)
+            continue
+
+        mudancas = {
+            campo: valor for campo, valor in registro.items()
+            if campo not in anterior or anterior[campo] != valor
+        }
+        sumiram = [campo for campo in anterior if campo not in registro]
+
+        if sumiram:
+            campos_removidos[ticker] = sumiram
+        if sumiram or any(campo not in CAMPOS_VOLATEIS for campo in mudancas):
+            alterados[ticker] = mudancas
+
+    tickers_novos = [registro['ticker'] for registro in registros_novos]
+    presentes = set(tickers_novos)
+    removidos = [ticker for ticker in mapa_anterior if ticker not in presentes]
+
+    brasilia_tz = pytz.timezone('America/Sao_Paulo')
+    delta = {
+        "gerado_em": datetime.now(brasilia_tz).strftime("%Y-%m-%d %H:%M:%S"),
+        "alterados": alterados,
+        "campos_removidos": campos_removidos,
+        "novos": novos,
+        "removidos": removidos,
+    }
+    if tickers_novos != [t for t in mapa_anterior if t in presentes] + list(novos):
+        delta["ordem"] = tickers_novos
+    return delta
+
+
+def aplicar_delta(registros, delta):
+    """
+    Aplica um delta sobre a lista de registros da execução anterior.
+    Deltas consecutivos podem ser aplicados em sequência.
+
+    :return: Nova lista de registros (os dicts de entrada não são modificados).
+    """
+    removidos = set(delta.get("removidos", []))
+    alterados = delta.get("alterados", {})
+    campos_removidos = delta.get("campos_removidos", {})
+
+    mapa = {}
+    for registro in registros:
+        ticker = registro['ticker']
+        if ticker in removidos:
+            continue
+        if ticker in alterados or ticker in campos_removidos:
+            registro = {**registro, **alterados.get(ticker, {})}
+            for campo in campos_removidos.get(ticker, []):
+                registro.pop(campo, None)
+        mapa[ticker] = registro
+
+    mapa.update(delta.get("novos", {}))
+
+    ordem = delta.get("ordem") or list(mapa)
+    return [mapa[ticker] for ticker in ordem if ticker in mapa]
+
+
+def salvar_delta(delta, caminho=ARQUIVO_DELTA_PADRAO):
+    """Grava o delta em JSON compacto (sem indentação)."""
+    with open(caminho, 'w', encoding='utf-8') as f:
+        json.dump(delta, f, ensure_ascii=False, separators=(',', ':'), default=serializar_registro)
+
+    total = len(delta["alterados"]) + len(delta["novos"]) + len(delta["removidos"])
+    print(f"📝 Delta salvo em {caminho} ({total} tickers com mudanças).")
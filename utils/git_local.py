@@ -0,0 +1,86 @@
+import getpass
+import os
+import subprocess
+
+
+def usuario_local():
+    """Nome do usuário para a mensagem de commit (os.getlogin falha fora de um terminal)."""
+    try:
+        return os.getlogin()
+    except OSError:
+        return getpass.getuser()
+
+
+def executar_comando_git(comando, mensagem_erro):
+    """
+    Executa comandos GIT no terminal local.
+    """
+    try:
+        print(f"CMD: {' '.join(comando)}")
+        # capture_output=False permite que você interaja com o terminal (senha)
+        subprocess.run(comando, check=True, text=True)
+    except subprocess.CalledProcessError:
+        print(f"❌ {mensagem_erro}")
+        return False
+    return True
+
+
+# Drivers de merge citados no .gitattributes. O git não versiona o .git/config, então cada
+# clone registra os seus (instalar_drivers_mesclagem, chamado pelo sincronizar).
+DRIVERS_MESCLAGEM = {
+    'dados-acoes': ("dados_acoes.json por ticker e fonte", "python -m utils.conciliacao %O %A %B"),
+    'dados-acoes-delta': ("dados_acoes_delta.json mais recente", "python -m utils.conciliacao --delta %O %A %B"),
+}
+
+
+def instalar_drivers_mesclagem():
+    """Registra os drivers de merge (utils.conciliacao) no .git/config do repositório."""
+    try:
+        for nome, (descricao, comando) in DRIVERS_MESCLAGEM.items():
+            subprocess.run(["git", "config", f"merge.{nome}.name", descricao], check=True)
+            subprocess.run(["git", "config", f"merge.{nome}.driver", comando], check=True)
+    except (OSError, subprocess.CalledProcessError):
+        print("⚠️ Não foi possível registrar os drivers de merge; conflitos no JSON ficarão para resolver à mão.")
+        return False
+    return True
+
+
+def sincronizar():
+    """git pull antes de coletar, para partir da versão mais recente do JSON."""
+    instalar_drivers_mesclagem()
+    print("\n[1/3] Sincronizando com o GitHub (Git Pull)...")
+    if not executar_comando_git(["git", "pull"], "Falha no Git Pull. Resolva conflitos manuais."):
+        return False
+    return True
+
+
+def publicar(arquivos, mensagem):
+    """git add + commit + push dos arquivos gerados (só commita se houve mudança)."""
+    print("\n[3/3] Enviando atualização para GitHub...")
+
+    # Adiciona
+    if not executar_comando_git(["git", "add", *arquivos], "Erro no Git Add"): return False
+
+    # Confere se houve mudança real
+    try:
+        subprocess.run(["git", "diff-index", "--quiet", "HEAD"], check=True)
+        print("ℹ️ Nenhuma alteração detectada nos dados. Nada a enviar.")
+        return True
+    except subprocess.CalledProcessError:
+        pass # Segue o baile, tem mudança
+
+    # Commit e Push
+    if not executar_comando_git(["git", "commit", "-m", mensagem], "Erro no Git Commit"): return False
+
+    # O Actions (ou outra máquina) pode ter enviado durante a coleta: junta antes de subir.
+    # O dados_acoes.json é mesclado por ticker e fonte (utils.conciliacao), sem conflito.
+    instalar_drivers_mesclagem()
+    if not executar_comando_git(["git", "pull", "--no-rebase", "--no-edit"],
+                                "Falha ao juntar com o remoto. Resolva os conflitos e rode git push."):
+        return False
+
+    print("Subindo alterações... (Autentique se necessário)")
+    if executar_comando_git(["git", "push"], "Erro no Git Push"):
+        print("\n✨ SUCESSO! Repositório atualizado manualmente. ✨")
+        return True
+    return False
@@ -0,0 +1,174 @@
+"""
+Gravação e reprodução das requisições HTTP feitas por utils.http.requisitar().
+
+Gravar (main.py --record ARQ): cada requisição de uma execução real vai para ARQ, um JSON
+Lines comprimido com gzip: método, URL, corpo do POST, status, texto da resposta e tempos.
+Reproduzir (main.py --replay ARQ): requisitar() responde a partir do arquivo, sem rede.
+Requisições iguais (mesmo método, URL e corpo) recebem as respostas na ordem em que foram
+gravadas, e a última se repete se a execução pedir mais vezes. Com --replay-timing cada
+resposta demora o que demorou na gravação.
+
+Cabeçalhos e chaves de API não são gravados; o cabeçalho do arquivo guarda só quantas
+chaves havia, para a reprodução tentar o mesmo número de chaves do ScrapeNinja, e as
+variáveis URL_BASE_* da gravação, para a reprodução pedir as mesmas URLs.
+
+Além das requisições, o arquivo guarda as entradas da execução que não vêm da rede
+(registrar_entrada): o dados_acoes.json lido no início (ENTRADA_DATASET), a lista de
+tickers, que pode ter vindo do cache local (ENTRADA_TICKERS), e a hora de referência da
+execução (ENTRADA_RELOGIO, ver utils.relogio). A reprodução usa as gravadas no lugar das
+atuais, então o resultado não depende do estado da máquina nem do dia.
+"""
+import gzip
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+FORMATO = 2
+# O formato 1 não tem as entradas; a reprodução usa as atuais
+FORMATOS_SUPORTADOS = (1, 2)
+EXTENSAO = '.jsonl.gz'
+
+ENTRADA_DATASET = 'dataset'
+ENTRADA_TICKERS = 'tickers'
+ENTRADA_RELOGIO = 'relogio'
+
+
+class RespostaGravada:
+    """O suficiente de uma resposta do curl_cffi/requests para os scrapers."""
+
+    def __init__(self, texto, status_code=200):
+        self.text = texto
+        self.content = texto.encode('utf-8')
+        self.status_code = status_code
+
+    def json(self):
+        return json.loads(self.text)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise Exception(f"HTTP {self.status_code}")
+
+
+class RequisicaoNaoGravada(Exception):
+    pass
+
+
+def _chave(metodo, url, corpo):
+    return f"{metodo.upper()} {url} {json.dumps(corpo, sort_keys=True, ensure_ascii=False) if corpo is not None else ''}"
+
+
+def caminho_do_shard(caminho, indice, total):
+    """'execucao.jsonl.gz' -> 'execucao.shard-2-de-4.jsonl.gz' (cada shard grava o seu)."""
+    if caminho.endswith(EXTENSAO):
+        base, extensao = caminho[:-len(EXTENSAO)], EXTENSAO
+    else:
+        base, extensao = os.path.splitext(caminho)
+    return f"{base}.shard-{indice}-de-{total}{extensao}"
+
+
+class Gravador:
+    """Escreve as requisições no arquivo à medida que acontecem (seguro entre threads)."""
+
+    def __init__(self, caminho, contexto=None):
+        diretorio = os.path.dirname(caminho)
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
+        self.caminho = caminho
+        self.total = 0
+        self._trava = threading.Lock()
+        # Mesmo relógio de requisitar() (perf_counter)
+        self._inicio = time.perf_counter()
+        self._arquivo = gzip.open(caminho, 'wt', encoding='utf-8')
+        chaves = os.getenv('RAPIDAPI_KEYS') or os.getenv('RAPIDAPI_KEY', '')
+        cabecalho = {
+            'formato': FORMATO,
+            'gravado_em': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'chaves_api': len([chave for chave in chaves.split(',') if chave.strip()]),
+            'urls_base': {nome: valor for nome, valor in os.environ.items() if nome.startswith('URL_BASE_')},
+            'contexto': contexto or {},
+        }
+        self._escrever(cabecalho)
+        self.total = 0
+
+    def _escrever(self, item, requisicao=True):
+        linha = json.dumps(item, ensure_ascii=False) + '\n'
+        with self._trava:
+            self._arquivo.write(linha)
+            self.total += requisicao
+
+    def registrar_entrada(self, nome, valor):
+        """Entrada da execução que não vem da rede (ENTRADA_DATASET, ENTRADA_TICKERS, ENTRADA_RELOGIO)."""
+        self._escrever({'entrada': nome, 'valor': valor}, requisicao=False)
+
+    def registrar(self, metodo, url, corpo, fonte, inicio, duracao, resposta=None, erro=None):
+        """Uma requisição: a resposta (status e texto) ou a exceção que ela levantou."""
+        item = {
+            'metodo': metodo.upper(),
+            'url': url,
+            'corpo': corpo,
+            'fonte': fonte,
+            'inicio_s': round(inicio - self._inicio, 4),
+            'duracao_s': round(duracao, 4),
+        }
+        if erro is not None:
+            item['erro'] = str(erro)
+            item['tipo_erro'] = type(erro).__name__
+        else:
+            item['status'] = resposta.status_code
+            item['texto'] = resposta.text
+        self._escrever(item)
+
+    def fechar(self):
+        with self._trava:
+            self._arquivo.close()
+
+
+class Reprodutor:
+    """Responde requisitar() a partir de um arquivo do Gravador."""
+
+    def __init__(self, caminho, respeitar_tempos=False):
+        self.caminho = caminho
+        self.respeitar_tempos = respeitar_tempos
+        self.servidas = 0
+        self.nao_gravadas = 0
+        self._trava = threading.Lock()
+        self._respostas = {}
+        self._posicao = {}
+        self.entradas = {}
+        with gzip.open(caminho, 'rt', encoding='utf-8') as f:
+            self.cabecalho = json.loads(next(f))
+            if self.cabecalho.get('formato') not in FORMATOS_SUPORTADOS:
+                raise ValueError(f"{caminho}: formato de gravação {self.cabecalho.get('formato')} não suportado")
+            try:
+                for linha in f:
+                    item = json.loads(linha)
+                    if 'entrada' in item:
+                        self.entradas[item['entrada']] = item['valor']
+                        continue
+                    self._respostas.setdefault(_chave(item['metodo'], item['url'], item['corpo']), []).append(item)
+            except (EOFError, ValueError):
+                # Gravação interrompida no meio (execução morta): vale o que foi escrito até ali
+                print(f"⚠️ {caminho} termina no meio de um registro; usando as requisições completas.")
+
+    def __len__(self):
+        return sum(len(itens) for itens in self._respostas.values())
+
+    def responder(self, metodo, url, corpo):
+        """Resposta gravada para a requisição; levanta a exceção gravada, ou RequisicaoNaoGravada."""
+        chave = _chave(metodo, url, corpo)
+        with self._trava:
+            itens = self._respostas.get(chave)
+            if not itens:
+                self.nao_gravadas += 1
+                raise RequisicaoNaoGravada(f"Sem gravação para {metodo.upper()} {url}")
+            posicao = self._posicao.get(chave, 0)
+            self._posicao[chave] = posicao + 1
+            self.servidas += 1
+        item = itens[min(posicao, len(itens) - 1)]
+        if self.respeitar_tempos:
+            time.sleep(item['duracao_s'])
+        if 'erro' in item:
+            raise Exception(item['erro'])
+        return RespostaGravada(item['texto'], item['status'])
@@ -0,0 +1,172 @@
+import os
+import sqlite3
+from datetime import datetime, timedelta
+import pytz
+from models.schema import fonte_do_campo
+
+ARQUIVO_HISTORICO_PADRAO = 'historico_acoes.db'
+
+_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS execucoes (
+    data_execucao TEXT PRIMARY KEY,
+    gravado_em TEXT NOT NULL,
+    total_tickers INTEGER NOT NULL
+);
+
+-- Uma linha por (ticker, campo, dia). A coluna 'valor' não tem tipo declarado
+-- para que o SQLite preserve int/float/texto exatamente como vieram do scraper.
+CREATE TABLE IF NOT EXISTS valores (
+    ticker TEXT NOT NULL,
+    fonte TEXT NOT NULL,
+    campo TEXT NOT NULL,
+    data_execucao TEXT NOT NULL,
+    valor,
+    PRIMARY KEY (ticker, campo, data_execucao)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_valores_ticker_data ON valores (ticker, data_execucao);
+CREATE INDEX IF NOT EXISTS idx_valores_data_campo ON valores (data_execucao, campo);
+"""
+
+
+class HistoricoSQLite:
+    """
+    Armazena o histórico das execuções em um arquivo SQLite local (sem servidor).
+
+    Cada execução grava uma linha por (ticker, campo, dia). Rodar duas vezes no
+    mesmo dia substitui os valores daquele dia dos tickers gravados (inclusive os
+    campos que ficaram nulos, que somem). Campos nulos não são gravados.
+    """
+
+    def __init__(self, caminho=ARQUIVO_HISTORICO_PADRAO):
+        self.caminho = caminho
+        self._conn = sqlite3.connect(caminho)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA_SQL)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+    def fechar(self):
+        self._conn.close()
+
+    @staticmethod
+    def _data_hoje():
+        brasilia_tz = pytz.timezone('America/Sao_Paulo')
+        return datetime.now(brasilia_tz).strftime("%Y-%m-%d")
+
+    def gravar_execucao(self, registros, data_execucao=None):
+        """
+        Grava todos os registros de uma execução em uma única transação.
+
+        :param registros: Lista de dicts no mesmo formato do dados_acoes.json.
+        :param data_execucao: 'YYYY-MM-DD'. Se omitido, usa a data de hoje (Brasília).
+        :return: Quantidade de valores gravados.
+        """
+        data_execucao = data_execucao or self._data_hoje()
+
+        linhas = [
+            (registro['ticker'], fonte_do_campo(campo), campo, data_execucao, valor)
+            for registro in registros
+            for campo, valor in registro.items()
+            if campo != 'ticker' and valor is not None and valor != ""
+        ]
+
+        with self._conn:
+            # Campo que ficou nulo numa segunda execução do dia não pode manter o valor da primeira
+            self._conn.executemany(
+                "DELETE FROM valores WHERE ticker = ? AND data_execucao = ?",
+                [(ticker, data_execucao) for ticker in dict.fromkeys(registro['ticker'] for registro in registros)],
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO valores (ticker, fonte, campo, data_execucao, valor) VALUES (?, ?, ?, ?, ?)",
+                linhas,
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO execucoes (data_execucao, gravado_em, total_tickers) VALUES (?, ?, ?)",
+                (data_execucao, datetime.now().isoformat(timespec='seconds'), len(registros)),
+            )
+        return len(linhas)
+
+    def datas_disponiveis(self):
+        """Retorna as datas de execução gravadas, da mais antiga para a mais recente."""
+        cursor = self._conn.execute("SELECT data_execucao FROM execucoes ORDER BY data_execucao")
+        return [linha[0] for linha in cursor]
+
+    def serie_temporal(self, ticker, campo, dias=None, ate=None):
+        """
+        Série histórica de um campo para um ticker.
+
+        Exemplo: serie_temporal("WEGE3", "fundamentus_pl", dias=90)
+
+        :param dias: Se informado, limita aos últimos N dias (contando a partir de 'ate').
+        :param ate: Data final 'YYYY-MM-DD' (inclusive). Padrão: hoje.
+        :return: Lista de tuplas (data_execucao, valor) em ordem cronológica.
+        """
+        ate = ate or self._data_hoje()
+        desde = "0000-00-00"
+        if dias is not None:
+            desde = (datetime.strptime(ate, "%Y-%m-%d") - timedelta(days=dias)).strftime("%Y-%m-%d")
+
+        cursor = self._conn.execute(
+            "SELECT data_execucao, valor FROM valores "
+            "WHERE ticker = ? AND campo = ? AND data_execucao BETWEEN ? AND ? "
+            "ORDER BY data_execucao",
+            (ticker, campo, desde, ate),
+        )
+        return cursor.fetchall()
+
+    def snapshot(self, campos, data_execucao=None, tickers=None):
+        """
+        Corte transversal: valores dos campos pedidos para todos os tickers em uma data.
+
+        :param campos: Lista de campos (ex: ["fundamentus_pl", "statusInvest_roe_percentual"]).
+        :param data_execucao: 'YYYY-MM-DD'. Padrão: a execução mais recente gravada.
+        :param tickers: Opcional, restringe a um subconjunto de tickers.
+        :return: Dict {ticker: {campo: valor}}.
+        """
+        if not campos:
+            return {}
+        if data_execucao is None:
+            linha = self._conn.execute("SELECT MAX(data_execucao) FROM execucoes").fetchone()
+            data_execucao = linha[0]
+            if data_execucao is None:
+                return {}
+
+        marcadores = ",".join("?" * len(campos))
+        sql = (
+            f"SELECT ticker, campo, valor FROM valores "
+            f"WHERE data_execucao = ? AND campo IN ({marcadores})"
+        )
+        parametros = [data_execucao, *campos]
+        if tickers:
+            sql += f" AND ticker IN ({','.join('?' * len(tickers))})"
+            parametros.extend(tickers)
+
+        resultado = {}
+        for ticker, campo, valor in self._conn.execute(sql, parametros):
+            resultado.setdefault(ticker, {})[campo] = valor
+        return resultado
+
+
+def gravar_historico_se_configurado(registros):
+    """
+    Grava a execução no SQLite se a variável de ambiente HISTORICO_DB estiver definida.
+    Use HISTORICO_DB=1 para o arquivo padrão ou informe um caminho.
+    """
+    caminho = os.getenv('HISTORICO_DB')
+    if not caminho:
+        return
+    if caminho == '1':
+        caminho = ARQUIVO_HISTORICO_PADRAO
+
+    try:
+        with HistoricoSQLite(caminho) as historico:
+            total = historico.gravar_execucao(registros)
+        print(f"🗄️ Histórico gravado em {caminho} ({total} valores).")
+    except sqlite3.Error as e:
+        print(f"Erro ao gravar histórico SQLite: {e}")
@@ -0,0 +1,212 @@
+import os
+import threading
+import time
+from urllib.parse import urlparse
+from utils.metricas import METRICAS, FONTE_GERAL, ETAPA_DNS, ETAPA_CONEXAO, ETAPA_TTFB, ETAPA_DOWNLOAD
+from utils.perfilamento import PERFIL
+from utils.gravacao import Gravador, Reprodutor
+
+# Intervalo mínimo padrão entre duas requisições ao mesmo host
+INTERVALO_PADRAO_SEGUNDOS = 2.0
+
+CLIENTE_CURL = 'curl_cffi'
+CLIENTE_REQUESTS = 'requests'
+
+# Com um pool de saídas (utils.proxies), quantas saídas uma requisição bloqueada tenta
+TENTATIVAS_POR_SAIDAS = 3
+
+# Com URL_BASE_SIMULADA todos os hosts apontam para um servidor só, cada um sob /<nome>
+# (ver benchmarks/servidor_simulado.py)
+VARIAVEL_URL_SIMULADA = 'URL_BASE_SIMULADA'
+
+
+class ErroRequisicao(Exception):
+    """Falha de requisitar sem resposta (conexão, timeout, reprodução sem gravação); a original fica em __cause__."""
+
+
+# Gravação/reprodução das requisições (ver utils.gravacao); no máximo um dos dois ativo
+_gravador = None
+_reprodutor = None
+
+
+def ativar_gravacao(caminho, contexto=None):
+    global _gravador
+    _gravador = Gravador(caminho, contexto)
+    return _gravador
+
+
+def ativar_reproducao(caminho, respeitar_tempos=False):
+    global _reprodutor
+    _reprodutor = Reprodutor(caminho, respeitar_tempos)
+    return _reprodutor
+
+
+def registrar_entrada(nome, valor):
+    """Com a gravação ativa, guarda uma entrada da execução (ver utils.gravacao.Gravador.registrar_entrada)."""
+    if _gravador is not None:
+        _gravador.registrar_entrada(nome, valor)
+
+
+def gravando():
+    return _gravador is not None
+
+
+def entrada_gravada(nome):
+    """Na reprodução, a entrada gravada (None se não há reprodução ou a gravação não tem a entrada)."""
+    return _reprodutor.entradas.get(nome) if _reprodutor is not None else None
+
+
+def encerrar_gravacao():
+    """Fecha o arquivo da gravação e desliga gravação/reprodução. Retorna o que estava ativo."""
+    global _gravador, _reprodutor
+    ativo = _gravador or _reprodutor
+    if _gravador is not None:
+        _gravador.fechar()
+    _gravador = _reprodutor = None
+    return ativo
+
+
+def url_base(nome, padrao):
+    """
+    Base das URLs de um host: URL_BASE_<NOME> (ex: URL_BASE_FUNDAMENTUS), senão
+    <URL_BASE_SIMULADA>/<nome>, senão o endereço real 'padrao'. Lido a cada chamada.
+    """
+    especifica = os.getenv(f"URL_BASE_{nome.upper()}")
+    if especifica:
+        return especifica.rstrip('/')
+    simulada = os.getenv(VARIAVEL_URL_SIMULADA)
+    if simulada:
+        return f"{simulada.rstrip('/')}/{nome}"
+    return padrao
+
+
+def host_da_url(url):
+    return urlparse(url).netloc or url
+
+
+class LimitadorTaxa:
+    """
+    Espaça as requisições por host: cada chamada a aguardar() reserva o próximo
+    horário livre daquele host e dorme até ele. Seguro para uso entre threads.
+    """
+
+    def __init__(self, intervalo_segundos=INTERVALO_PADRAO_SEGUNDOS):
+        self.intervalo_segundos = intervalo_segundos
+        self._proxima_liberacao = {}
+        self._trava = threading.Lock()
+
+    def aguardar(self, url, fonte=FONTE_GERAL, saida=None):
+        """:param saida: Nome da saída (utils.proxies), quando cada uma tem o seu intervalo por host."""
+        host = host_da_url(url) if saida is None else (saida, host_da_url(url))
+        with self._trava:
+            agora = time.monotonic()
+            horario = max(agora, self._proxima_liberacao.get(host, 0.0))
+            self._proxima_liberacao[host] = horario + self.intervalo_segundos
+        if horario > agora:
+            METRICAS.dormir(horario - agora, fonte)
+
+
+def _tempos_curl(resposta):
+    """(dns, conexão, primeiro byte) em segundos, a partir dos curl_infos pedidos em _executar()."""
+    from curl_cffi import CurlInfo
+
+    infos = getattr(resposta, 'infos', None) or {}
+    dns = infos.get(CurlInfo.NAMELOOKUP_TIME)
+    if dns is None:
+        return None, None, None
+    conectado = infos.get(CurlInfo.APPCONNECT_TIME) or infos.get(CurlInfo.CONNECT_TIME) or dns
+    return dns, conectado - dns, infos.get(CurlInfo.STARTTRANSFER_TIME)
+
+
+def _executar(metodo, url, cliente, **kwargs):
+    """Requisição crua pelo cliente indicado. Retorna (resposta, dns, conexão, primeiro byte)."""
+    if cliente == CLIENTE_CURL:
+        from curl_cffi import requests as curl_requests, CurlInfo
+        # Mesmo que curl_requests.get/post (uma sessão por chamada), pedindo os tempos da conexão
+        infos = [CurlInfo.NAMELOOKUP_TIME, CurlInfo.CONNECT_TIME, CurlInfo.APPCONNECT_TIME,
+                 CurlInfo.STARTTRANSFER_TIME]
+        with curl_requests.Session(curl_infos=infos) as sessao:
+            resposta = sessao.request(metodo.upper(), url, **kwargs)
+        dns, conexao, ttfb = _tempos_curl(resposta)
+    else:
+        import requests
+        resposta = getattr(requests, metodo)(url, **kwargs)
+        # requests.elapsed vai do envio até o fim dos cabeçalhos
+        elapsed = getattr(resposta, 'elapsed', None)
+        dns, conexao, ttfb = None, None, elapsed.total_seconds() if elapsed is not None else None
+    return resposta, dns, conexao, ttfb
+
+
+def requisitar(metodo, url, fonte, cliente=CLIENTE_CURL, saidas=None, **kwargs):
+    """
+    Faz a requisição pelo cliente indicado e registra em utils.metricas, por fonte:
+    tempo total, DNS/conexão/primeiro byte (o que o cliente informar), bytes e status.
+    Com a gravação ativa a requisição vai também para o arquivo; com a reprodução, a
+    resposta vem do arquivo e não há rede.
+
+    :param metodo: 'get' ou 'post'.
+    :param cliente: CLIENTE_CURL (curl_cffi, aceita impersonate=...) ou CLIENTE_REQUESTS.
+    :param saidas: utils.proxies.PoolSaidas opcional. A requisição sai pela saída da thread
+                   para o host; bloqueada (403/429) ou com erro de conexão, é refeita por
+                   outra saída, até TENTATIVAS_POR_SAIDAS vezes.
+    :return: A resposta do cliente, sem tratamento de status.
+    :raises ErroRequisicao: Sem resposta, qualquer que seja o cliente.
+    """
+    if saidas is not None and _reprodutor is None:
+        return _requisitar_por_saidas(metodo, url, fonte, cliente, saidas, **kwargs)
+    return _requisitar(metodo, url, fonte, cliente, **kwargs)
+
+
+def _requisitar_por_saidas(metodo, url, fonte, cliente, saidas, **kwargs):
+    from utils.proxies import STATUS_BLOQUEIO, SemSaidaDisponivel
+
+    host = host_da_url(url)
+    resposta = erro = None
+    for tentativa in range(TENTATIVAS_POR_SAIDAS):
+        try:
+            saida = saidas.atribuir(host)
+        except SemSaidaDisponivel:
+            if tentativa == 0:
+                raise
+            break
+        saidas.aguardar(saida, url, fonte)
+        inicio = time.perf_counter()
+        try:
+            resposta = _requisitar(metodo, url, fonte, cliente, **kwargs, **saida.argumentos())
+        except Exception as e:
+            saidas.registrar(saida, time.perf_counter() - inicio, erro=e)
+            resposta, erro = None, e
+            continue
+        saidas.registrar(saida, time.perf_counter() - inicio, status=resposta.status_code)
+        if resposta.status_code not in STATUS_BLOQUEIO:
+            return resposta
+    if resposta is None:
+        raise erro
+    return resposta
+
+
+def _requisitar(metodo, url, fonte, cliente=CLIENTE_CURL, **kwargs):
+    inicio = time.perf_counter()
+    gravador, reprodutor = _gravador, _reprodutor
+    try:
+        with PERFIL.escopo(fonte):
+            if reprodutor is not None:
+                resposta, dns, conexao, ttfb = reprodutor.responder(metodo, url, kwargs.get('json')), None, None, None
+            else:
+                resposta, dns, conexao, ttfb = _executar(metodo, url, cliente, **kwargs)
+    except Exception as e:
+        if gravador is not None:
+            gravador.registrar(metodo, url, kwargs.get('json'), fonte, inicio, time.perf_counter() - inicio, erro=e)
+        METRICAS.observar(ETAPA_DOWNLOAD, time.perf_counter() - inicio, fonte)
+        METRICAS.contar('requisicoes', fonte=fonte, status=type(e).__name__)
+        raise ErroRequisicao(str(e)) from e
+
+    if gravador is not None:
+        gravador.registrar(metodo, url, kwargs.get('json'), fonte, inicio, time.perf_counter() - inicio, resposta)
+    METRICAS.observar(ETAPA_DOWNLOAD, time.perf_counter() - inicio, fonte)
+    for etapa, segundos in ((ETAPA_DNS, dns), (ETAPA_CONEXAO, conexao), (ETAPA_TTFB, ttfb)):
+        if segundos is not None:
+            METRICAS.observar(etapa, segundos, fonte)
+    METRICAS.contar('requisicoes', fonte=fonte, status=str(getattr(resposta, 'status_code', '')))
+    METRICAS.contar('bytes_recebidos', len(getattr(resposta, 'content', b'') or b''), fonte=fonte)
+    return resposta
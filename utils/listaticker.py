@@ -1,25 +1,130 @@
 import csv
+import json
+import os
+import threading
+import time
 from io import StringIO
-from curl_cffi import requests as curl_requests
+from utils.metricas import METRICAS, CACHE_LISTA_TICKERS, RESULTADO_ACERTO
+from utils.http import url_base, requisitar, ErroRequisicao
+
+ARQUIVO_CACHE = 'lista_tickers_cache.json'
+TTL_CACHE_HORAS = 12
+ARQUIVO_DADOS = 'dados_acoes.json'
+
+
+def normalizar_tickers(tickers):
+    """Maiúsculas, sem espaços nem prefixo "BVMF:", sem vazios e sem repetidos (mantém a ordem)."""
+    normalizados = (str(t).strip().upper().replace("BVMF:", "").strip() for t in tickers)
+    return list(dict.fromkeys(t for t in normalizados if t))
+
 
 class ListaTicker:
-    def __init__(self):
+    def __init__(self, caminho_cache=ARQUIVO_CACHE, ttl_horas=TTL_CACHE_HORAS, arquivo_dados=ARQUIVO_DADOS,
+                 atualizar_em_segundo_plano=True):
         """
-        Inicializa a classe e carrega imediatamente a lista de tickers da planilha online.
+        Inicializa a classe e carrega a lista de tickers.
+
+        Ordem de preferência:
+          1. Cache local dentro do TTL: usado direto, sem acessar a planilha.
+          2. Cache expirado: usado já, e a planilha é baixada em segundo plano
+             (a próxima execução pega a versão nova).
+          3. Sem cache: baixa a planilha na hora.
+          4. Planilha indisponível: tickers que já estão no dados_acoes.json.
         """
         self._sheet_id = "1LDNmNs-sKXf3qPWCjNqdR_RO9fY7_cLhvJgoN9PKWlU"
-        self._url = f"https://docs.google.com/spreadsheets/d/{self._sheet_id}/export?format=csv&gid=0"
-        self.lista_ticker = self._carregar_tickers_online()
+        self._url = f"{url_base('planilha', 'https://docs.google.com')}/spreadsheets/d/{self._sheet_id}/export?format=csv&gid=0"
+        self._caminho_cache = caminho_cache
+        self._ttl_segundos = ttl_horas * 3600
+        self._arquivo_dados = arquivo_dados
+        self._atualizar_em_segundo_plano = atualizar_em_segundo_plano
+        self._thread_atualizacao = None
+        # Diferenças em relação à versão anterior da lista (cache ou dados_acoes.json), só para o log;
+        # a prioridade dos tickers novos vem do dataset (main.novos_na_frente)
+        self.tickers_adicionados = []
+        self.tickers_removidos = []
+        self.lista_ticker = self._carregar_lista()
+
+    def _carregar_lista(self):
+        cache = self._ler_cache()
+        if cache is not None:
+            tickers, idade = cache
+            if idade < self._ttl_segundos:
+                METRICAS.contar(CACHE_LISTA_TICKERS, resultado=RESULTADO_ACERTO)
+                print(f"✅ Lista de tickers do cache local ({len(tickers)} ações, {idade / 3600:.1f}h).")
+                return tickers
+            METRICAS.contar(CACHE_LISTA_TICKERS, resultado='expirado')
+            if self._atualizar_em_segundo_plano:
+                print(f"♻️ Cache da lista expirado ({idade / 3600:.1f}h). Usando o cache e atualizando em segundo plano.")
+                self._thread_atualizacao = threading.Thread(target=self._atualizar, args=(tickers,), daemon=True)
+                self._thread_atualizacao.start()
+                return tickers
+            return self._atualizar(tickers) or tickers
+
+        METRICAS.contar(CACHE_LISTA_TICKERS, resultado='ausente')
+        tickers = self._atualizar(self._tickers_do_dataset())
+        if tickers:
+            return tickers
+
+        tickers = self._tickers_do_dataset()
+        if tickers:
+            print(f"⚠️ Planilha indisponível. Usando os {len(tickers)} tickers do {self._arquivo_dados}.")
+        return tickers
+
+    def _atualizar(self, anteriores):
+        """Baixa a planilha; se vier algo, registra as diferenças e grava o cache."""
+        tickers = normalizar_tickers(self._carregar_tickers_online())
+        if not tickers:
+            return []
+        self._registrar_diferencas(anteriores or [], tickers)
+        self._gravar_cache(tickers)
+        return tickers
+
+    def _registrar_diferencas(self, anteriores, atuais):
+        if not anteriores:
+            return
+        conjunto_anterior, conjunto_atual = set(anteriores), set(atuais)
+        self.tickers_adicionados = [t for t in atuais if t not in conjunto_anterior]
+        self.tickers_removidos = [t for t in anteriores if t not in conjunto_atual]
+        if self.tickers_adicionados:
+            print(f"➕ Tickers novos na planilha: {', '.join(self.tickers_adicionados)}")
+        if self.tickers_removidos:
+            print(f"➖ Tickers removidos da planilha: {', '.join(self.tickers_removidos)}")
+
+    def _ler_cache(self):
+        """Retorna (tickers, idade em segundos) ou None se não há cache válido."""
+        try:
+            with open(self._caminho_cache, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+            tickers = normalizar_tickers(cache["tickers"])
+            idade = time.time() - float(cache["baixado_em"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        return (tickers, idade) if tickers else None
+
+    def _gravar_cache(self, tickers):
+        try:
+            temporario = f"{self._caminho_cache}.tmp"
+            with open(temporario, 'w', encoding='utf-8') as f:
+                json.dump({"baixado_em": time.time(), "tickers": tickers}, f, ensure_ascii=False)
+            os.replace(temporario, self._caminho_cache)
+        except OSError as e:
+            print(f"⚠️ Não foi possível gravar o cache da lista de tickers: {e}")
+
+    def _tickers_do_dataset(self):
+        try:
+            with open(self._arquivo_dados, 'r', encoding='utf-8') as f:
+                return normalizar_tickers(item['ticker'] for item in json.load(f))
+        except (OSError, ValueError, KeyError, TypeError):
+            return []
 
     def _carregar_tickers_online(self):
         """
         Carrega a lista de tickers de uma planilha pública do Google Sheets.
         """
         print("➤ Conectando com a planilha online para obter a lista de tickers...")
-        
         try:
-            # Usando curl_cffi para consistência com os outros scrapers
-            response = curl_requests.get(self._url, impersonate="chrome110", timeout=30)
+            # Mesmo caminho dos scrapers (curl_cffi, métricas, gravação/reprodução)
+            response = requisitar("get", self._url, 'planilha', impersonate="chrome110", timeout=30)
             response.raise_for_status()
             
             print("✅ Conexão com a planilha online estabelecida com sucesso.")
@@ -43,7 +148,7 @@ class ListaTicker:
             print(f"✅ Lista de tickers carregada com {len(tickers)} ações encontradas.")
             return tickers
             
-        except curl_requests.errors.RequestsError as e:
+        except ErroRequisicao as e:
             print(f"❌ Erro de conexão ao carregar tickers: {e}")
             return []
         except Exception as e:
@@ -54,4 +159,11 @@ class ListaTicker:
         """
         Retorna a lista de tickers que foi carregada durante a inicialização.
         """
-        return self.lista_ticker
\ No newline at end of file
+        return self.lista_ticker
+
+    def aguardar_atualizacao(self, timeout=None):
+        """Espera a atualização em segundo plano (se houver) terminar. Retorna True se terminou."""
+        if self._thread_atualizacao is None:
+            return True
+        self._thread_atualizacao.join(timeout)
+        return not self._thread_atualizacao.is_alive()
@@ -0,0 +1,259 @@
+"""
+Métricas da execução: duração de cada etapa por fonte, contadores e preenchimento dos campos.
+
+A coleta fica sempre ligada (um perf_counter e um lock por medição). No fim do
+main() o resumo vai para um relatório JSON e para um arquivo no formato texto do
+Prometheus (node_exporter textfile collector / pushgateway).
+
+Etapas medidas:
+  fila          espera do download na fila do pool de threads (coleta paralela)
+  dns, conexao  resolução de nome e conexão TCP/TLS (só curl_cffi informa)
+  ttfb          até o primeiro byte da resposta
+  download      requisição completa
+  espera        pausas deliberadas: backoff entre tentativas e limitador por host
+  parse         parse do HTML (inclui a normalização quando ela é feita no scraper)
+  normalizacao  normalização em lote (NORMALIZACAO_EM_LOTE=1)
+  mesclagem     montagem da lista final / mesclagem dos shards
+  escrita       gravação do JSON, delta e histórico
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+DIRETORIO_METRICAS = 'metricas'
+ARQUIVO_RELATORIO = 'relatorio_execucao.json'
+ARQUIVO_PROMETHEUS = 'metricas.prom'
+
+# Etapas que não pertencem a uma fonte (normalização em lote, escrita...)
+FONTE_GERAL = 'geral'
+
+ETAPA_FILA = 'fila'
+ETAPA_DNS = 'dns'
+ETAPA_CONEXAO = 'conexao'
+ETAPA_TTFB = 'ttfb'
+ETAPA_DOWNLOAD = 'download'
+ETAPA_ESPERA = 'espera'
+ETAPA_PARSE = 'parse'
+ETAPA_NORMALIZACAO = 'normalizacao'
+ETAPA_MESCLAGEM = 'mesclagem'
+ETAPA_ESCRITA = 'escrita'
+
+# Limites superiores (segundos) dos buckets dos histogramas
+LIMITES_HISTOGRAMA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# Contadores de cache/pulos. Contados com o rótulo resultado=...; a taxa de acerto do
+# relatório é resultado='acerto' sobre o total de cada um.
+CACHE_STATUSINVEST = 'cache_statusinvest'      # acerto = dados recentes reaproveitados
+CACHE_LISTA_TICKERS = 'cache_lista_tickers'    # acerto = cache dentro do TTL
+REGISTROS_REAPROVEITADOS = 'registros_json'    # acerto = texto original mantido sem serializar
+TICKERS_DESPACHADOS = 'tickers_despachados'    # acerto = coletado; 'prazo' = ficou de fora
+RECOLETA_ANOMALIAS = 'recoleta_anomalias'    # acerto = a nova coleta voltou ao normal (utils.anomalias)
+RESULTADO_ACERTO = 'acerto'
+
+# Pares (ticker, fonte) com valores suspeitos, por fonte e motivo (sem taxa de acerto)
+ANOMALIAS = 'anomalias'
+
+
+class Histograma:
+    """Amostras de uma etapa: buckets cumulativos para o Prometheus e percentis para o JSON."""
+
+    def __init__(self):
+        self.amostras = []
+        self.buckets = [0] * len(LIMITES_HISTOGRAMA)
+        self.soma = 0.0
+
+    def observar(self, segundos):
+        self.amostras.append(segundos)
+        self.soma += segundos
+        for i, limite in enumerate(LIMITES_HISTOGRAMA):
+            if segundos <= limite:
+                self.buckets[i] += 1
+
+    def resumo(self):
+        ordenadas = sorted(self.amostras)
+        n = len(ordenadas)
+
+        def percentil(p):
+            return round(ordenadas[min(n - 1, int(p * n))], 4)
+
+        return {
+            'n': n,
+            'total_s': round(self.soma, 4),
+            'media_s': round(self.soma / n, 4),
+            'p50_s': percentil(0.50),
+            'p95_s': percentil(0.95),
+            'max_s': round(ordenadas[-1], 4),
+        }
+
+
+class Metricas:
+    """Acumulador de métricas, seguro para uso entre threads (os processos de parse
+    devolvem suas medições para o processo principal registrar)."""
+
+    def __init__(self):
+        self._trava = threading.Lock()
+        self.limpar()
+
+    def limpar(self):
+        with self._trava:
+            self._histogramas = {}
+            self._contadores = {}
+            self._registros = []
+            self._inicio = time.time()
+            self._inicio_monotonico = time.monotonic()
+
+    # --- registro --------------------------------------------------------------
+
+    def observar(self, etapa, segundos, fonte=FONTE_GERAL):
+        with self._trava:
+            histograma = self._histogramas.get((etapa, fonte))
+            if histograma is None:
+                histograma = self._histogramas[(etapa, fonte)] = Histograma()
+            histograma.observar(segundos)
+
+    @contextmanager
+    def medir(self, etapa, fonte=FONTE_GERAL):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observar(etapa, time.perf_counter() - inicio, fonte)
+
+    def dormir(self, segundos, fonte=FONTE_GERAL):
+        """time.sleep contabilizado como etapa 'espera'."""
+        if segundos > 0:
+            time.sleep(segundos)
+            self.observar(ETAPA_ESPERA, segundos, fonte)
+
+    def contar(self, nome, quantidade=1, **rotulos):
+        chave = (nome, tuple(sorted(rotulos.items())))
+        with self._trava:
+            self._contadores[chave] = self._contadores.get(chave, 0) + quantidade
+
+    def registrar_registros(self, registros):
+        """Registros coletados nesta execução (base do preenchimento e dos erros por fonte)."""
+        with self._trava:
+            self._registros = list(registros)
+
+    # --- resumo ----------------------------------------------------------------
+
+    def _por_fonte(self):
+        """({fonte: registros com erro}, {fonte: fração dos campos preenchidos nos registros sem erro})."""
+        from models.schema import CAMPOS_POR_FONTE
+
+        erros = {}
+        preenchimento = {}
+        for fonte, campos in CAMPOS_POR_FONTE.items():
+            chave_erro = f'{fonte}_erro'
+            campos = [campo for campo in campos if campo != chave_erro]
+            sem_erro = [registro for registro in self._registros if not registro.get(chave_erro)]
+            erros[fonte] = len(self._registros) - len(sem_erro)
+            if sem_erro and campos:
+                preenchidos = sum(registro.get(campo) is not None for registro in sem_erro for campo in campos)
+                preenchimento[fonte] = round(preenchidos / (len(sem_erro) * len(campos)), 4)
+        return erros, preenchimento
+
+    def _taxas_de_acerto(self):
+        """{contador: acertos / total} para os contadores de cache e de reaproveitamento."""
+        totais = {}
+        for (nome, rotulos), valor in self._contadores.items():
+            resultado = dict(rotulos).get('resultado')
+            if resultado is None:
+                continue
+            acertos, total = totais.get(nome, (0, 0))
+            totais[nome] = (acertos + (valor if resultado == RESULTADO_ACERTO else 0), total + valor)
+        return {nome: round(acertos / total, 4) for nome, (acertos, total) in totais.items() if total}
+
+    def relatorio(self, contexto=None):
+        with self._trava:
+            erros, preenchimento = self._por_fonte()
+            etapas = {}
+            for (etapa, fonte), histograma in sorted(self._histogramas.items(), key=lambda item: (item[0][1], item[0][0])):
+                etapas.setdefault(fonte, {})[etapa] = histograma.resumo()
+            return {
+                'inicio': datetime.fromtimestamp(self._inicio).strftime("%Y-%m-%d %H:%M:%S"),
+                'duracao_s': round(time.monotonic() - self._inicio_monotonico, 3),
+                'contexto': contexto or {},
+                'registros_coletados': len(self._registros),
+                'etapas': etapas,
+                'erros_por_fonte': erros,
+                'preenchimento_por_fonte': preenchimento,
+                'taxas_de_acerto': self._taxas_de_acerto(),
+                'contadores': [
+                    {'nome': nome, 'rotulos': dict(rotulos), 'valor': valor}
+                    for (nome, rotulos), valor in sorted(self._contadores.items())
+                ],
+            }
+
+    def texto_prometheus(self, relatorio, rotulos_fixos=None):
+        """
+        Formato texto de exposição do Prometheus (histogramas, contadores e gauges).
+
+        :param rotulos_fixos: Rótulos acrescentados a todas as séries (ex: {'shard': '1/4'}),
+                              para que os arquivos de vários shards no mesmo diretório do
+                              textfile collector não repitam as mesmas séries.
+        """
+        fixos = ','.join(f'{chave}="{valor}"' for chave, valor in (rotulos_fixos or {}).items())
+
+        def serie(nome, valor, rotulos=''):
+            todos = ','.join(parte for parte in (rotulos, fixos) if parte)
+            return f"{nome}{{{todos}}} {valor}" if todos else f"{nome} {valor}"
+
+        linhas = [
+            "# HELP coleta_etapa_segundos Duração de cada etapa da coleta, por fonte.",
+            "# TYPE coleta_etapa_segundos histogram",
+        ]
+        with self._trava:
+            for (etapa, fonte), histograma in sorted(self._histogramas.items()):
+                rotulos = f'etapa="{etapa}",fonte="{fonte}"'
+                for limite, quantidade in zip(LIMITES_HISTOGRAMA, histograma.buckets):
+                    linhas.append(serie('coleta_etapa_segundos_bucket', quantidade, f'{rotulos},le="{limite:g}"'))
+                linhas.append(serie('coleta_etapa_segundos_bucket', len(histograma.amostras), f'{rotulos},le="+Inf"'))
+                linhas.append(serie('coleta_etapa_segundos_sum', f'{histograma.soma:.6f}', rotulos))
+                linhas.append(serie('coleta_etapa_segundos_count', len(histograma.amostras), rotulos))
+
+            nomes = sorted({nome for nome, _ in self._contadores})
+            for nome in nomes:
+                linhas.append(f"# TYPE coleta_{nome}_total counter")
+                for (outro, rotulos), valor in sorted(self._contadores.items()):
+                    if outro == nome:
+                        texto_rotulos = ','.join(f'{chave}="{valor_rotulo}"' for chave, valor_rotulo in rotulos)
+                        linhas.append(serie(f"coleta_{nome}_total", valor, texto_rotulos))
+
+        linhas.append("# HELP coleta_registros_com_erro Registros coletados com '<fonte>_erro' preenchido.")
+        linhas.append("# TYPE coleta_registros_com_erro gauge")
+        for fonte, quantidade in relatorio['erros_por_fonte'].items():
+            linhas.append(serie('coleta_registros_com_erro', quantidade, f'fonte="{fonte}"'))
+        linhas.append("# HELP coleta_preenchimento_campos Fração dos campos preenchidos nos registros sem erro.")
+        linhas.append("# TYPE coleta_preenchimento_campos gauge")
+        for fonte, fracao in relatorio['preenchimento_por_fonte'].items():
+            linhas.append(serie('coleta_preenchimento_campos', fracao, f'fonte="{fonte}"'))
+        linhas.append("# HELP coleta_taxa_acerto Acertos de cache / reaproveitamentos sobre o total.")
+        linhas.append("# TYPE coleta_taxa_acerto gauge")
+        for nome, taxa in relatorio['taxas_de_acerto'].items():
+            linhas.append(serie('coleta_taxa_acerto', taxa, f'contador="{nome}"'))
+        linhas.append("# TYPE coleta_duracao_execucao_segundos gauge")
+        linhas.append(serie('coleta_duracao_execucao_segundos', relatorio['duracao_s']))
+        return '\n'.join(linhas) + '\n'
+
+    def gravar(self, diretorio=DIRETORIO_METRICAS, sufixo='', contexto=None, rotulos_fixos=None):
+        """Grava o relatório JSON e o arquivo do Prometheus (ver texto_prometheus). Retorna os dois caminhos."""
+        os.makedirs(diretorio, exist_ok=True)
+        base_json, extensao_json = os.path.splitext(ARQUIVO_RELATORIO)
+        base_prom, extensao_prom = os.path.splitext(ARQUIVO_PROMETHEUS)
+        caminho_json = os.path.join(diretorio, f"{base_json}{sufixo}{extensao_json}")
+        caminho_prom = os.path.join(diretorio, f"{base_prom}{sufixo}{extensao_prom}")
+
+        relatorio = self.relatorio(contexto)
+        with open(caminho_json, 'w', encoding='utf-8') as f:
+            json.dump(relatorio, f, indent=2, ensure_ascii=False)
+        with open(caminho_prom, 'w', encoding='utf-8') as f:
+            f.write(self.texto_prometheus(relatorio, rotulos_fixos))
+        return caminho_json, caminho_prom
+
+
+# Instância única da execução (scrapers, coleta e main registram aqui)
+METRICAS = Metricas()
@@ -0,0 +1,67 @@
+"""
+Estágio de normalização em lote.
+
+Quando os scrapers rodam com normalizar=False, os campos numéricos chegam como texto
+bruto ("R$ 1,5 Bilhões", "7,96%"). Este módulo converte todas as células de todos os
+tickers de uma vez, no fim da execução, aplicando a escala de cada campo definida em
+models.schema.ESCALA_CAMPO. É o único lugar onde unidades são tratadas nesse modo.
+
+A conversão de cada texto distinto é a mesma de normalize_numeric_value, então os dois
+modos dão o mesmo registro. Não é mais rápida que a conversão célula a célula (medido
+com benchmarks/bench_normalizacao.py); o ganho é concentrar as escalas num lugar só.
+"""
+import math
+from models.schema import TIPOS_CAMPOS, ESCALA_CAMPO, NUMERICO
+from utils.normalization import converter_texto
+
+_CAMPOS_NUMERICOS = tuple(campo for campo, tipo in TIPOS_CAMPOS.items() if tipo == NUMERICO)
+
+
+def _com_escala(valor, escala):
+    if escala == 1 or valor is None:
+        return valor
+    valor = valor * escala
+    # Como no caminho célula a célula: escala trunca para int (infinito fica float)
+    return int(valor) if math.isfinite(valor) else valor
+
+
+def normalizar_coluna(valores, escalas=1):
+    """
+    Converte uma sequência de textos em números, com a mesma regra de normalize_numeric_value.
+
+    Os textos repetidos são convertidos uma única vez.
+
+    :param valores: Lista de strings.
+    :param escalas: Escala única ou lista com uma escala por valor. Valores com escala
+                    diferente de 1 são truncados para int.
+    :return: Lista com int, float ou None (texto inválido).
+    """
+    convertidos = {texto: converter_texto(texto) for texto in set(valores)}
+    if isinstance(escalas, (int, float)):
+        return [_com_escala(convertidos[texto], escalas) for texto in valores]
+    return [_com_escala(convertidos[texto], escala) for texto, escala in zip(valores, escalas)]
+
+
+def normalizar_registros(registros):
+    """
+    Converte em lote os campos numéricos que ainda estão como texto, em todos os registros.
+    Valores já numéricos (ex: dados mantidos da execução anterior) não são tocados.
+
+    :param registros: Lista de registros (RegistroAcao ou dict), alterados no lugar.
+    :return: Quantidade de células convertidas.
+    """
+    posicoes = []
+    textos = []
+    escalas = []
+    for registro in registros:
+        for campo in _CAMPOS_NUMERICOS:
+            valor = registro.get(campo)
+            if isinstance(valor, str):
+                posicoes.append((registro, campo))
+                textos.append(valor)
+                escalas.append(ESCALA_CAMPO.get(campo, 1))
+
+    convertidos = normalizar_coluna(textos, escalas)
+    for (registro, campo), valor in zip(posicoes, convertidos):
+        registro[campo] = valor
+    return len(textos)
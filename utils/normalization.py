@@ -1,50 +1,88 @@
-import re
+from functools import lru_cache
+
+# Letras que podem compor um sufixo de escala (já em minúsculas).
+LETRAS_SUFIXO = "abcdefghijklmnopqrstuvwxyzçãõ"
+
+# Sufixos aceitos. Qualquer outro sufixo (ex: "N/A", "x") invalida o valor.
+MULTIPLICADORES_SUFIXO = {
+    '': 1,
+    'k': 1_000, 'mil': 1_000,
+    'm': 1_000_000, 'mi': 1_000_000, 'mm': 1_000_000,
+    'milhão': 1_000_000, 'milhao': 1_000_000, 'milhões': 1_000_000, 'milhoes': 1_000_000,
+    'b': 1_000_000_000, 'bi': 1_000_000_000,
+    'bilhão': 1_000_000_000, 'bilhao': 1_000_000_000, 'bilhões': 1_000_000_000, 'bilhoes': 1_000_000_000,
+}
+
+# Células repetem muito entre tickers ("-", "0,00%", razões comuns), então vale memoizar.
+# Uma execução completa (500 tickers x 270 campos numéricos, ~135 mil células) tem ~54 mil
+# textos distintos no corpus de benchmarks/bench_normalizacao.py; com folga para 3x isso, o
+# LRU não fica descartando entradas que voltam na mesma execução.
+TAMANHO_CACHE = 1 << 17
+
+
+def converter_texto(value_str):
+    """Conversão de um texto, sem cache (o estágio em lote já converte cada texto distinto uma vez)."""
+    # Métodos de str em vez de regex: a mesma gramática com re.sub/fullmatch pré-compilados
+    # mediu ~2x mais lenta (e str.translate também) no benchmark.
+    # Remove moeda, percentual e espaços (inclusive entre o número e o sufixo)
+    cleaned_str = value_str.lower().replace('r$', '').replace('%', '').replace(' ', '').strip()
+
+    # Tokeniza: número à esquerda, sufixo de escala (só letras) à direita
+    numero = cleaned_str.rstrip(LETRAS_SUFIXO)
+    multiplier = MULTIPLICADORES_SUFIXO.get(cleaned_str[len(numero):])
+    if multiplier is None or not numero:
+        return None
+
+    # Padroniza separadores: remove pontos de milhar, troca vírgula decimal por ponto
+    # Esta ordem é crucial. "1.234,56" -> "1234,56" -> "1234.56"
+    try:
+        numeric_value = float(numero.replace('.', '').replace(',', '.'))
+    except ValueError:
+        return None
+
+    final_value = numeric_value * multiplier
+
+    # Retorna como int se for um número inteiro, senão como float
+    if final_value.is_integer():
+        return int(final_value)
+    return final_value
+
+
+_normalizar_texto = lru_cache(maxsize=TAMANHO_CACHE)(converter_texto)
+
 
 def normalize_numeric_value(value_str):
     """
     Normaliza uma string que representa um valor numérico para um int ou float puro.
-    Lida com R$, %, pontos, vírgulas, milhões (M/Mi) e bilhões (B/Bi).
+    Lida com R$, %, pontos, vírgulas e sufixos de escala: mil/k, mi/milhões/M e bi/bilhões/B.
 
     Exemplos:
     - "12,93" -> 12.93
     - "7,96%" -> 7.96
     - "R$ 207,42 Bilhões" -> 207420000000
     - "207.738.000.000" -> 207738000000
+    - "1,5 mil" -> 1500
     - "-34,13" -> -34.13
     - "-" ou "" ou None -> None
     """
-    if value_str is None or not isinstance(value_str, str) or value_str.strip() in ['-', '']:
+    if not isinstance(value_str, str):
         return None
+    return _normalizar_texto(value_str)
 
-    cleaned_str = value_str.lower().strip()
-    
-    # Remove prefixos e sufixos não numéricos
-    cleaned_str = cleaned_str.replace('r$', '').replace('%', '').strip()
-
-    # Identifica multiplicadores (bilhões, milhões)
-    multiplier = 1
-    if 'bi' in cleaned_str:
-        multiplier = 1_000_000_000
-        cleaned_str = re.sub(r'bi(lhões)?', '', cleaned_str).strip()
-    elif 'mi' in cleaned_str:
-        multiplier = 1_000_000
-        cleaned_str = re.sub(r'mi(lhões)?', '', cleaned_str).strip()
-
-    # Padroniza separadores: remove pontos de milhar, troca vírgula decimal por ponto
-    # Esta ordem é crucial. "1.234,56" -> "1234,56" -> "1234.56"
-    cleaned_str = cleaned_str.replace('.', '').replace(',', '.')
+def manter_valor_bruto(value_str):
+    """
+    Alternativa a normalize_numeric_value para quando a conversão fica para o estágio
+    em lote (utils.normalizacao_lote): mantém o texto quando ele é um número válido.
 
-    try:
-        numeric_value = float(cleaned_str)
-        final_value = numeric_value * multiplier
-
-        # Retorna como int se for um número inteiro, senão como float
-        if final_value.is_integer():
-            return int(final_value)
-        return final_value
-    except (ValueError, TypeError):
-        # Retorna None se, mesmo após a limpeza, não for um número válido
+    Texto inválido ("-", "N/A") vira None, como no caminho normalizado, para a extração
+    escolher a mesma ocorrência nos dois modos (ex: o primeiro valor válido de um rótulo repetido).
+    """
+    if not isinstance(value_str, str):
+        return None
+    value_str = value_str.strip()
+    if _normalizar_texto(value_str) is None:
         return None
+    return value_str
 
 # Bloco para testar a função de forma independente
 if __name__ == '__main__':
@@ -53,7 +91,8 @@ if __name__ == '__main__':
         "R$ 207,42 Bilhões", "15,76 Bilhões",
         "363.321.000", "-16.946.400.000",
         "13.16", "5.68", "-2.05", "186922.149.83",
-        "1.11", "-", None, "N/A"
+        "1.11", "-", None, "N/A",
+        "1,5 mil", "350,1 mi", "219,46 B", "12 K", "Milhões"
     ]
     for case in test_cases:
-        print(f'Original: "{case}" -> Normalizado: {normalize_numeric_value(case)}')
\ No newline at end of file
+        print(f'Original: "{case}" -> Normalizado: {normalize_numeric_value(case)}')
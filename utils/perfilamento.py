@@ -0,0 +1,239 @@
+"""
+Perfilamento opcional da execução (main.py --profile ou PERFILAMENTO=1).
+
+Liga três coletores, gravados em --profile-dir (padrão 'perfil/'):
+  - cProfile por rótulo: um perfil para cada fonte (download em utils.http.requisitar e
+    parse em BaseScraper.parse_medido) e um para o resto da execução ('execucao').
+    Arquivos <rotulo>.pstats (python -m pstats, snakeviz, gprof2dot...);
+  - tracemalloc: pico de memória e as N linhas que mais cresceram em memória desde o
+    início (alocacoes.txt);
+  - amostragem das pilhas de todas as threads a cada intervalo, no formato "collapsed"
+    do flamegraph.pl / speedscope / inferno (pilhas.folded). A raiz de cada pilha é o
+    rótulo ativo na thread (fonte, 'execucao') ou o nome da thread.
+
+Desligado, cada escopo custa só um teste de atributo. Na coleta paralela o parse roda
+em outros processos: o cProfile do parse volta para o processo principal junto com o
+resultado, mas tracemalloc e a amostragem cobrem só o processo principal.
+"""
+import cProfile
+import os
+import pstats
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+
+DIRETORIO_PERFIL = 'perfil'
+ARQUIVO_ALOCACOES = 'alocacoes.txt'
+ARQUIVO_PILHAS = 'pilhas.folded'
+ROTULO_EXECUCAO = 'execucao'
+TOP_ALOCACOES = 25
+INTERVALO_AMOSTRAGEM_MS = 10
+# Quadros guardados por alocação (o relatório por traceback usa todos)
+QUADROS_TRACEMALLOC = 10
+
+
+class _EstatisticasProntas:
+    """Adapta o dict de estatísticas de um cProfile (deste ou de outro processo) ao que pstats.Stats aceita."""
+
+    def __init__(self, estatisticas):
+        self.stats = estatisticas
+
+    def create_stats(self):
+        pass
+
+
+def perfilar_chamada(funcao, *argumentos):
+    """
+    Roda funcao(*argumentos) sob um cProfile próprio e devolve (resultado, estatísticas).
+    Para processos filhos: as estatísticas são um dict simples, que vai de volta para o
+    processo principal e entra no perfil da fonte com Perfilador.incorporar().
+    """
+    perfil = cProfile.Profile()
+    perfil.enable()
+    try:
+        resultado = funcao(*argumentos)
+    finally:
+        perfil.disable()
+    perfil.create_stats()
+    return resultado, perfil.stats
+
+
+class Perfilador:
+    """cProfile por rótulo e thread, tracemalloc e amostragem de pilhas, ligados por ativar()."""
+
+    def __init__(self):
+        self.ativo = False
+        self.diretorio = DIRETORIO_PERFIL
+        self._trava = threading.Lock()
+        self._perfis = {}            # (rótulo, thread) -> cProfile.Profile
+        self._de_outros_processos = {}  # rótulo -> [estatísticas]
+        self._rotulos_por_thread = {}   # thread -> pilha de rótulos ativos
+        self._pilhas = Counter()
+        self._parar = threading.Event()
+        self._amostrador = None
+        self._foto_inicial = None
+        self._top = TOP_ALOCACOES
+
+    def ativar(self, diretorio=DIRETORIO_PERFIL, top=TOP_ALOCACOES, intervalo_ms=INTERVALO_AMOSTRAGEM_MS):
+        if self.ativo:
+            return
+        self.ativo = True
+        self.diretorio = diretorio
+        self._top = top
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(QUADROS_TRACEMALLOC)
+        self._foto_inicial = tracemalloc.take_snapshot()
+        self._parar.clear()
+        self._amostrador = threading.Thread(target=self._amostrar, args=(intervalo_ms / 1000,),
+                                            name='amostrador-perfil', daemon=True)
+        self._amostrador.start()
+
+    # --- coleta ----------------------------------------------------------------
+
+    def _perfil(self, rotulo, thread):
+        with self._trava:
+            perfil = self._perfis.get((rotulo, thread))
+            if perfil is None:
+                perfil = self._perfis[(rotulo, thread)] = cProfile.Profile()
+            return perfil
+
+    @contextmanager
+    def escopo(self, rotulo):
+        """
+        Atribui ao perfil 'rotulo' o que roda no bloco. Escopos aninhados pausam o de
+        fora, então cada chamada é contada num rótulo só (o mais interno).
+        """
+        if not self.ativo:
+            yield
+            return
+        thread = threading.get_ident()
+        rotulos = self._rotulos_por_thread.setdefault(thread, [])
+        if rotulos and rotulos[-1] == rotulo:
+            yield
+            return
+        externo = self._perfil(rotulos[-1], thread) if rotulos else None
+        perfil = self._perfil(rotulo, thread)
+        if externo is not None:
+            externo.disable()
+        rotulos.append(rotulo)
+        try:
+            perfil.enable()
+        except ValueError:
+            # Python 3.12+: um cProfile por vez no processo; o bloco fica sem perfil
+            perfil = None
+        try:
+            yield
+        finally:
+            if perfil is not None:
+                perfil.disable()
+            rotulos.pop()
+            if externo is not None:
+                externo.enable()
+
+    def incorporar(self, rotulo, estatisticas):
+        """Soma ao perfil 'rotulo' as estatísticas de perfilar_chamada() feitas em outro processo."""
+        if estatisticas:
+            with self._trava:
+                self._de_outros_processos.setdefault(rotulo, []).append(estatisticas)
+
+    def _amostrar(self, intervalo):
+        proprio = threading.get_ident()
+        while not self._parar.wait(intervalo):
+            nomes_threads = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread, quadro in sys._current_frames().items():
+                if thread == proprio:
+                    continue
+                try:
+                    raiz = self._rotulos_por_thread[thread][-1]
+                except (KeyError, IndexError):
+                    raiz = nomes_threads.get(thread, str(thread))
+                funcoes = []
+                while quadro is not None:
+                    codigo = quadro.f_code
+                    funcoes.append(f"{codigo.co_name} ({os.path.basename(codigo.co_filename)}:{codigo.co_firstlineno})")
+                    quadro = quadro.f_back
+                funcoes.append(raiz)
+                self._pilhas[';'.join(reversed(funcoes))] += 1
+
+    # --- saída -----------------------------------------------------------------
+
+    def _estatisticas_por_rotulo(self):
+        por_rotulo = {}
+        with self._trava:
+            coletadas = [(rotulo, estatisticas)
+                         for rotulo, lista in self._de_outros_processos.items() for estatisticas in lista]
+            for (rotulo, _), perfil in self._perfis.items():
+                perfil.create_stats()
+                coletadas.append((rotulo, perfil.stats))
+        for rotulo, estatisticas in coletadas:
+            # pstats.Stats recusa perfis vazios
+            if not estatisticas:
+                continue
+            fonte = _EstatisticasProntas(dict(estatisticas))
+            if rotulo in por_rotulo:
+                por_rotulo[rotulo].add(fonte)
+            else:
+                por_rotulo[rotulo] = pstats.Stats(fonte)
+        return por_rotulo
+
+    def _relatorio_alocacoes(self):
+        filtros = (
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, cProfile.__file__),
+            tracemalloc.Filter(False, pstats.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        )
+        foto = tracemalloc.take_snapshot().filter_traces(filtros)
+        atual, pico = tracemalloc.get_traced_memory()
+        linhas = [
+            f"Memória rastreada: atual {atual / 2**20:.1f} MiB, pico {pico / 2**20:.1f} MiB",
+            "",
+            f"Top {self._top} linhas por crescimento desde o início da execução:",
+        ]
+        for diferenca in foto.compare_to(self._foto_inicial.filter_traces(filtros), 'lineno')[:self._top]:
+            linhas.append(f"  {diferenca}")
+        linhas += ["", "Maiores alocações vivas por traceback:"]
+        for estatistica in foto.statistics('traceback')[:min(self._top, 5)]:
+            linhas.append(f"  {estatistica.count} blocos, {estatistica.size / 1024:.1f} KiB")
+            linhas += [f"    {linha}" for linha in estatistica.traceback.format()]
+        return '\n'.join(linhas) + '\n', pico
+
+    def finalizar(self):
+        """Para os coletores e grava os arquivos. Retorna a lista de caminhos gravados."""
+        if not self.ativo:
+            return []
+        self._parar.set()
+        self._amostrador.join()
+        os.makedirs(self.diretorio, exist_ok=True)
+
+        caminhos = []
+        for rotulo, estatisticas in sorted(self._estatisticas_por_rotulo().items()):
+            caminho = os.path.join(self.diretorio, f"{rotulo}.pstats")
+            estatisticas.dump_stats(caminho)
+            caminhos.append(caminho)
+
+        relatorio, pico = self._relatorio_alocacoes()
+        tracemalloc.stop()
+        caminho = os.path.join(self.diretorio, ARQUIVO_ALOCACOES)
+        with open(caminho, 'w', encoding='utf-8') as f:
+            f.write(relatorio)
+        caminhos.append(caminho)
+
+        caminho = os.path.join(self.diretorio, ARQUIVO_PILHAS)
+        with open(caminho, 'w', encoding='utf-8') as f:
+            for pilha, amostras in sorted(self._pilhas.items()):
+                f.write(f"{pilha} {amostras}\n")
+        caminhos.append(caminho)
+
+        self.ativo = False
+        print(f"🔬 Perfil gravado em {self.diretorio}/ ({len(caminhos)} arquivos, pico de memória "
+              f"{pico / 2**20:.1f} MiB). Leitura: python -m pstats {self.diretorio}/<rotulo>.pstats")
+        return caminhos
+
+
+# Instância única da execução
+PERFIL = Perfilador()
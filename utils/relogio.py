@@ -0,0 +1,35 @@
+"""
+Hora de referência da execução.
+
+As decisões que dependem da data leem agora() em vez de datetime.now():
+  - a validade do cache do StatusInvest (main.statusinvest_recente);
+  - a prioridade por idade das fontes (utils.agendador);
+  - os rótulos dos anos do Fundamentus ('2025' -> ano corrente menos 1).
+main.py fixa a referência no início da execução. A gravação (--record) guarda essa hora
+como entrada e a reprodução (--replay) volta a usá-la, então uma execução reproduzida
+noutro dia toma as mesmas decisões e faz as mesmas requisições.
+
+Os carimbos de saída ('atualizado_em', '<fonte>_data_atualizacao', 'gerado_em' do delta)
+continuam com a hora real de cada registro.
+
+Sem referência fixada (testes, módulos usados avulsos), agora() é a hora atual.
+"""
+from datetime import datetime
+
+_referencia = None
+
+
+def fixar_referencia(momento=None):
+    """Fixa a hora de referência (padrão: a hora atual) e a devolve."""
+    global _referencia
+    _referencia = momento or datetime.now()
+    return _referencia
+
+
+def referencia():
+    """A hora fixada, ou None (para repassar a outros processos)."""
+    return _referencia
+
+
+def agora():
+    return _referencia if _referencia is not None else datetime.now()
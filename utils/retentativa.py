@@ -0,0 +1,91 @@
+from concurrent.futures import ThreadPoolExecutor
+from scrapers.base_scraper import SCRAPERS_POR_FONTE
+from utils.http import LimitadorTaxa
+
+# Segundo passe com bem menos paralelismo que o principal
+CONEXOES_RETENTATIVA = 2
+
+# Erros que não passam com uma nova tentativa na mesma execução
+ERROS_DEFINITIVOS = {"ALL_KEYS_EXHAUSTED", "Sem Chaves API"}
+
+
+def coletar_falhas(registros, coletadas):
+    """
+    Pares (ticker, fonte) cujo '<fonte>_erro' ficou preenchido, sem os erros definitivos.
+
+    :param coletadas: Pares (ticker, fonte) coletados nesta execução; um erro mantido de
+                      uma execução anterior (fonte reaproveitada do JSON) não é retentado.
+    """
+    falhas = []
+    for registro in registros:
+        for fonte in SCRAPERS_POR_FONTE:
+            if (registro['ticker'], fonte) not in coletadas:
+                continue
+            erro = registro.get(f'{fonte}_erro')
+            if erro and erro not in ERROS_DEFINITIVOS:
+                falhas.append((registro['ticker'], fonte))
+    return falhas
+
+
+def _url_do_scraper(scraper):
+    return getattr(scraper, 'url', None) or getattr(scraper, 'target_url', '')
+
+
+def recoletar(pares, conexoes=CONEXOES_RETENTATIVA, limitador=None, prazo=None,
+              normalizar=True, use_local_strategy=False):
+    """
+    Coleta de novo só os pares (ticker, fonte), com poucas conexões e respeitando o
+    limitador por host.
+
+    :param prazo: utils.agendador.Prazo opcional; sem tempo, os pares restantes nem são tentados.
+    :return: Lista de (ticker, fonte, dados da fonte ou None se não foi tentado), na ordem de 'pares'.
+    """
+    limitador = limitador or LimitadorTaxa()
+
+    def coletar(par):
+        ticker, fonte = par
+        if prazo is not None and not prazo.pode_despachar():
+            return ticker, fonte, None
+        scraper = SCRAPERS_POR_FONTE[fonte](ticker, normalizar)
+        limitador.aguardar(_url_do_scraper(scraper), fonte)
+        if fonte == 'statusInvest':
+            return ticker, fonte, scraper.fetch_data(use_local_strategy=use_local_strategy)
+        return ticker, fonte, scraper.fetch_data()
+
+    with ThreadPoolExecutor(max_workers=conexoes) as executor:
+        return list(executor.map(coletar, pares))
+
+
+def retentar_falhas(registros, coletadas, conexoes=CONEXOES_RETENTATIVA, limitador=None, prazo=None,
+                    normalizar=True, use_local_strategy=False):
+    """
+    Re-coleta só os pares (ticker, fonte) que falharam no passe principal, com
+    poucas conexões e respeitando o limitador por host. Um par recuperado tem os
+    campos da fonte substituídos no próprio registro; os demais ficam como estão.
+
+    :param registros: Registros coletados no passe principal (alterados no lugar).
+    :param coletadas: Pares (ticker, fonte) de fato coletados no passe principal; só eles são retentados.
+    :param prazo: utils.agendador.Prazo opcional; sem tempo, os pares restantes nem são tentados.
+    :return: (recuperadas, definitivas) — listas de (ticker, fonte, erro original).
+    """
+    por_ticker = {registro['ticker']: registro for registro in registros}
+    falhas = coletar_falhas(registros, coletadas)
+    if not falhas:
+        return [], []
+
+    print(f"\n🔁 Retentando {len(falhas)} pares (ticker, fonte) com falha ({conexoes} conexões)...")
+    recuperadas = []
+    definitivas = []
+    for ticker, fonte, dados_fonte in recoletar(falhas, conexoes, limitador, prazo, normalizar, use_local_strategy):
+        erro_original = por_ticker[ticker].get(f'{fonte}_erro')
+        if dados_fonte is not None and not dados_fonte.get(f'{fonte}_erro'):
+            por_ticker[ticker].mesclar(dados_fonte)
+            recuperadas.append((ticker, fonte, erro_original))
+        else:
+            definitivas.append((ticker, fonte, erro_original))
+
+    print(f"✅ Recuperados: {len(recuperadas)}" +
+          (f" — {', '.join(f'{t}/{f}' for t, f, _ in recuperadas)}" if recuperadas else ""))
+    if definitivas:
+        print(f"❌ Falharam de novo: {len(definitivas)} — {', '.join(f'{t}/{f}' for t, f, _ in definitivas)}")
+    return recuperadas, definitivas
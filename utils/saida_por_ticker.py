@@ -0,0 +1,154 @@
+"""
+Saída em um arquivo por ticker, para quem só precisa de alguns tickers.
+
+    <diretorio>/tickers/PETR4.json            registro do ticker (JSON compacto)
+    <diretorio>/fontes/<fonte>/PETR4.json     só os campos de uma fonte (com por_fonte=True)
+    <diretorio>/manifesto.json                hash, tamanho e atualização de cada arquivo
+
+O manifesto lista, por ticker, o arquivo do registro e, por fonte, a data da última
+atualização ('<fonte>_data_atualizacao' ou 'atualizado_em'), o erro da última coleta e o
+arquivo da fonte. Um cliente guarda o manifesto anterior e baixa só os arquivos cujo
+sha256 mudou.
+
+'atualizado_em' muda a cada coleta mesmo quando nenhum dado mudou, então fica só no
+manifesto, fora dos arquivos: assim um arquivo só é reescrito (e só aparece no commit)
+quando o conteúdo muda de fato. Arquivos de tickers que saíram do dataset são apagados.
+"""
+import hashlib
+import json
+import os
+from models.registro import serializar_registro
+from models.schema import CAMPOS_POR_FONTE
+from utils.delta import CAMPOS_VOLATEIS
+
+ARQUIVO_MANIFESTO = 'manifesto.json'
+FORMATO_MANIFESTO = 1
+
+
+def _compacto(dados):
+    return json.dumps(dados, ensure_ascii=False, separators=(',', ':'), default=serializar_registro).encode('utf-8')
+
+
+def _arquivo_do_ticker(ticker):
+    return f"tickers/{ticker}.json"
+
+
+def _arquivo_da_fonte(fonte, ticker):
+    return f"fontes/{fonte}/{ticker}.json"
+
+
+def _conteudos(registro, por_fonte):
+    """{caminho relativo: bytes} dos arquivos de um registro."""
+    ticker = registro['ticker']
+    conteudos = {
+        _arquivo_do_ticker(ticker): _compacto(
+            {campo: valor for campo, valor in registro.items() if campo not in CAMPOS_VOLATEIS}),
+    }
+    if por_fonte:
+        for fonte, campos in CAMPOS_POR_FONTE.items():
+            dados = {campo: registro[campo] for campo in campos if campo in registro}
+            if dados:
+                conteudos[_arquivo_da_fonte(fonte, ticker)] = _compacto({'ticker': ticker, **dados})
+    return conteudos
+
+
+def ler_manifesto(diretorio):
+    try:
+        with open(os.path.join(diretorio, ARQUIVO_MANIFESTO), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _hashes_anteriores(manifesto):
+    """{caminho relativo: sha256} de todos os arquivos listados no manifesto."""
+    hashes = {}
+    for entrada in (manifesto or {}).get('tickers', {}).values():
+        hashes[entrada['arquivo']] = entrada['sha256']
+        for fonte in entrada.get('fontes', {}).values():
+            if 'arquivo' in fonte:
+                hashes[fonte['arquivo']] = fonte['sha256']
+    return hashes
+
+
+def _gravar_atomico(caminho, dados):
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    temporario = caminho + '.tmp'
+    with open(temporario, 'wb') as f:
+        f.write(dados)
+    os.replace(temporario, caminho)
+
+
+def _precisa_gravar(caminho, dados, hash_novo, hash_anterior):
+    if hash_anterior is not None:
+        # O manifesto anterior diz o que está no disco; confere só o tamanho, por segurança
+        return hash_anterior != hash_novo or not os.path.isfile(caminho) or os.path.getsize(caminho) != len(dados)
+    try:
+        with open(caminho, 'rb') as f:
+            return f.read() != dados
+    except OSError:
+        return True
+
+
+def _manifesto_em_linhas(dados):
+    # Uma linha por ticker: diffs do manifesto no git ficam do tamanho das mudanças
+    linhas = [f'{json.dumps(ticker)}:{json.dumps(entrada, ensure_ascii=False, separators=(",", ":"))}'
+              for ticker, entrada in dados['tickers'].items()]
+    cabecalho = {chave: valor for chave, valor in dados.items() if chave != 'tickers'}
+    texto = json.dumps(cabecalho, ensure_ascii=False)[:-1] + ',"tickers":{\n' + ',\n'.join(linhas) + '\n}}\n'
+    return texto.encode('utf-8')
+
+
+def gravar_por_ticker(registros, diretorio, por_fonte=False):
+    """
+    Grava (só o que mudou) os arquivos por ticker e o manifesto.
+
+    :param registros: Lista de registros na ordem final do dataset.
+    :param por_fonte: Também um arquivo por fonte de cada ticker.
+    :return: (gravados, mantidos, apagados)
+    """
+    anteriores = _hashes_anteriores(ler_manifesto(diretorio))
+    tickers = {}
+    atuais = set()
+    gravados = mantidos = 0
+
+    for registro in registros:
+        ticker = registro['ticker']
+        entrada = None
+        fontes = {}
+        for relativo, dados in _conteudos(registro, por_fonte).items():
+            atuais.add(relativo)
+            sha256 = hashlib.sha256(dados).hexdigest()
+            caminho = os.path.join(diretorio, relativo)
+            if _precisa_gravar(caminho, dados, sha256, anteriores.get(relativo)):
+                _gravar_atomico(caminho, dados)
+                gravados += 1
+            else:
+                mantidos += 1
+            descricao = {'arquivo': relativo, 'sha256': sha256, 'bytes': len(dados)}
+            if entrada is None:
+                entrada = descricao
+            else:
+                fontes[relativo.split('/')[1]] = descricao
+
+        for fonte in CAMPOS_POR_FONTE:
+            atualizacao = {
+                'atualizado_em': registro.get(f'{fonte}_data_atualizacao') or registro.get('atualizado_em'),
+                'erro': registro.get(f'{fonte}_erro'),
+            }
+            fontes[fonte] = {**atualizacao, **fontes.get(fonte, {})}
+        tickers[ticker] = {**entrada, 'atualizado_em': registro.get('atualizado_em'), 'fontes': fontes}
+
+    apagados = 0
+    for relativo in set(anteriores) - atuais:
+        try:
+            os.remove(os.path.join(diretorio, relativo))
+            apagados += 1
+        except OSError:
+            pass
+
+    manifesto = _manifesto_em_linhas({'formato': FORMATO_MANIFESTO, 'por_fonte': por_fonte, 'tickers': tickers})
+    caminho_manifesto = os.path.join(diretorio, ARQUIVO_MANIFESTO)
+    if _precisa_gravar(caminho_manifesto, manifesto, None, None):
+        _gravar_atomico(caminho_manifesto, manifesto)
+    return gravados, mantidos, apagados
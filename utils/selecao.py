@@ -0,0 +1,38 @@
+from models.schema import FONTES
+
+
+def interpretar_fontes(texto):
+    """
+    Converte "fonte1,fonte2" na lista de fontes, validando os nomes.
+    Ex: "statusInvest,fundamentus" -> ['statusInvest', 'fundamentus']
+    """
+    fontes = [fonte.strip() for fonte in texto.split(',') if fonte.strip()]
+    desconhecidas = [fonte for fonte in fontes if fonte not in FONTES]
+    if desconhecidas or not fontes:
+        raise ValueError(f"Fontes inválidas: {texto} (opções: {', '.join(FONTES)})")
+    return fontes
+
+
+def interpretar_tickers(texto):
+    """Converte "petr4, VALE3" em ['PETR4', 'VALE3']."""
+    return [ticker.strip().upper() for ticker in texto.split(',') if ticker.strip()]
+
+
+def planejar_selecao(tickers, fontes, mapa_dados_existentes, apenas_com_erro):
+    """
+    Lista (ticker, fontes) do modo seletivo. Com apenas_com_erro, cada ticker entra só
+    com as fontes cujo '<fonte>_erro' ficou preenchido na última coleta. Ticker que
+    ainda não está no dataset sempre entra com todas as fontes (coleta completa).
+    """
+    plano = []
+    for ticker in dict.fromkeys(tickers):
+        dados_antigos = mapa_dados_existentes.get(ticker)
+        if not dados_antigos:
+            plano.append((ticker, list(FONTES)))
+            continue
+        fontes_ticker = list(fontes)
+        if apenas_com_erro:
+            fontes_ticker = [fonte for fonte in fontes if dados_antigos.get(f'{fonte}_erro')]
+        if fontes_ticker:
+            plano.append((ticker, fontes_ticker))
+    return plano
@@ -0,0 +1,113 @@
+import json
+import os
+import zlib
+from models.registro import RegistroAcao, serializar_registro
+
+DIRETORIO_SHARDS = 'shards'
+
+
+def interpretar_shard(texto):
+    """
+    Converte "i/N" em (i, N), com i de 1 a N.
+    Ex: "2/4" -> (2, 4)
+    """
+    try:
+        indice, total = (int(parte) for parte in texto.split('/'))
+    except ValueError:
+        raise ValueError(f"Shard inválido: '{texto}' (use o formato i/N, ex: 2/4)")
+    if total < 1 or not 1 <= indice <= total:
+        raise ValueError(f"Shard inválido: '{texto}' (i deve estar entre 1 e N)")
+    return indice, total
+
+
+def shard_do_ticker(ticker, total):
+    """
+    Shard (1..total) de um ticker. Usa CRC32 e não hash(), que muda a cada processo,
+    então todos os jobs da matrix chegam à mesma partição.
+    """
+    return zlib.crc32(ticker.strip().upper().encode('utf-8')) % total + 1
+
+
+def filtrar_shard(tickers, indice, total):
+    """Tickers da lista que pertencem ao shard informado, na ordem original."""
+    return [ticker for ticker in tickers if shard_do_ticker(ticker, total) == indice]
+
+
+def caminho_shard(indice, total, diretorio=DIRETORIO_SHARDS):
+    return os.path.join(diretorio, f"dados_acoes.shard-{indice}-de-{total}.json")
+
+
+def salvar_shard(registros, lista_completa, indice, total, diretorio=DIRETORIO_SHARDS):
+    """
+    Grava o resultado de um shard. Junto vai a lista completa de tickers que foi
+    particionada, para a mesclagem conseguir a ordem canônica mesmo sem todos os shards.
+    """
+    os.makedirs(diretorio, exist_ok=True)
+    caminho = caminho_shard(indice, total, diretorio)
+    conteudo = {"shard": indice, "total": total, "lista": list(lista_completa), "registros": registros}
+    with open(caminho, 'w', encoding='utf-8') as f:
+        json.dump(conteudo, f, ensure_ascii=False, default=serializar_registro)
+    print(f"🧩 Shard {indice}/{total} salvo em {caminho} ({len(registros)} tickers).")
+    return caminho
+
+
+def limpar_shards(total, diretorio=DIRETORIO_SHARDS):
+    """Remove arquivos de shard de execuções anteriores (evita mesclar resultado velho)."""
+    for indice in range(1, total + 1):
+        caminho = caminho_shard(indice, total, diretorio)
+        if os.path.exists(caminho):
+            os.remove(caminho)
+
+
+def mesclar_shards(total, mapa_anterior, diretorio=DIRETORIO_SHARDS):
+    """
+    Junta os arquivos de shard em uma lista única, na ordem canônica da lista de tickers.
+
+    Tickers de shards ausentes (job que falhou, artefato que não chegou) ficam com
+    o registro da execução anterior, se houver.
+
+    :param mapa_anterior: Dict {ticker: registro} do dados_acoes.json atual.
+    :return: (registros, lista de índices de shards ausentes)
+    """
+    lista_canonica = None
+    registros_por_ticker = {}
+    ausentes = []
+
+    for indice in range(1, total + 1):
+        caminho = caminho_shard(indice, total, diretorio)
+        try:
+            with open(caminho, 'r', encoding='utf-8') as f:
+                conteudo = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Shard {indice}/{total} ausente ou ilegível ({e}). Usando dados anteriores.")
+            ausentes.append(indice)
+            continue
+
+        if conteudo.get("total") != total or conteudo.get("shard") != indice:
+            print(f"⚠️ Shard {caminho} não corresponde a {indice}/{total}. Ignorando.")
+            ausentes.append(indice)
+            continue
+
+        if lista_canonica is None:
+            lista_canonica = conteudo["lista"]
+        for item in conteudo["registros"]:
+            registros_por_ticker[item['ticker']] = RegistroAcao.de_dict(item)
+
+    if lista_canonica is None:
+        # Nenhum shard chegou: mantém o arquivo anterior como está
+        lista_canonica = list(mapa_anterior)
+
+    registros = []
+    vistos = set()
+    for ticker in lista_canonica:
+        if ticker in vistos:
+            continue
+        vistos.add(ticker)
+        if ticker in registros_por_ticker:
+            registros.append(registros_por_ticker[ticker])
+        elif shard_do_ticker(ticker, total) in ausentes and ticker in mapa_anterior:
+            registros.append(mapa_anterior[ticker])
+
+    # Tickers que só um shard conhecia (lista mudou entre os jobs) vão para o fim
+    registros.extend(r for t, r in registros_por_ticker.items() if t not in vistos)
+    return registros, ausentes
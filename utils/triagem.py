@@ -0,0 +1,548 @@
+"""
+Triagem de ações (screener) em memória sobre o dados_acoes.json.
+
+Triagem carrega o dataset uma única vez em colunas NumPy, uma por campo do esquema
+(models.schema), cada uma com a máscara dos seus vazios: float64 para os campos
+numéricos, datetime64 para as datas e códigos inteiros (índice nas categorias, em
+ordem alfabética) para os textos. Filtros e ordenações são expressões em sintaxe
+Python, compiladas uma vez (ast) em operações vetorizadas sobre todos os tickers:
+
+    statusInvest_pl < 10 and statusInvest_roe_percentual > 15% and statusInvest_dy_percentual > 6
+    mediana(pl) < 8 and min(roe_percentual) > 12 and fundamentus_setor in ("Bancos", "Seguros")
+    ordem "-max(dy_percentual)": '-' na frente = decrescente; vazios sempre no fim
+
+- Campos pelo nome do JSON. Um nome sem a fonte (pl, roe_percentual, dy_percentual...)
+  é o grupo dos campos <fonte>_<nome> de todas as fontes, usado nas funções entre
+  fontes min, max, media, mediana, primeiro (o primeiro com valor, na ordem das
+  fontes) e contar (quantas fontes têm valor), que ignoram os vazios.
+- Percentuais estão em pontos (7,96% -> 7.96): '15%' é o mesmo que 15.
+- Aritmética (+ - * / **), abs(), comparações (inclusive encadeadas), and/or/not,
+  in/not in com uma lista de constantes, contem(texto, "trecho") sem diferenciar
+  maiúsculas, nulo(campo). Datas comparam com "dd/mm/aaaa" ou "aaaa-mm-dd".
+- Comparações com um vazio são falsas, exceto != (verdadeira).
+
+Uso (a partir da raiz do repositório):
+    python -m utils.triagem "min(pl) < 10 and min(roe_percentual) > 15" --ordem=-mediana(dy_percentual) --limite 20
+"""
+import argparse
+import ast
+import difflib
+import json
+import re
+import time
+from collections import namedtuple
+from datetime import datetime
+import numpy as np
+from models.schema import ORDEM_CAMPOS, CAMPOS_EQUIVALENTES, TIPOS_CAMPOS, NUMERICO, TEXTO, DATA
+from utils.dataset import carregar_dataset, ARQUIVO_DATASET
+
+LOGICO = "logico"
+GRUPO = "grupo"
+
+_FORMATOS_DATA = ("%d/%m/%Y", "%Y-%m-%d %H:%M:%S", "%Y-%m-%d")
+# '15%' -> '15' (fora de aspas: só quando o % fecha o número)
+_RE_PERCENTUAL = re.compile(r'(\d)\s*%(?=\s|\)|,|$)')
+
+# Nome sem a fonte -> campos de todas as fontes: 'pl' -> ('investidor10_pl', 'fundamentus_pl', 'statusInvest_pl')
+GRUPOS = CAMPOS_EQUIVALENTES
+
+_COMPARACOES = {
+    ast.Lt: np.less, ast.LtE: np.less_equal, ast.Gt: np.greater, ast.GtE: np.greater_equal,
+    ast.Eq: np.equal, ast.NotEq: np.not_equal,
+}
+_ARITMETICA = {ast.Add: np.add, ast.Sub: np.subtract, ast.Mult: np.multiply, ast.Div: np.divide, ast.Pow: np.power}
+_SINONIMOS = {'median': 'mediana', 'mean': 'media', 'coalesce': 'primeiro', 'count': 'contar'}
+
+
+class ExpressaoInvalida(ValueError):
+    pass
+
+
+# valores: float64 / datetime64[s] / códigos int32 (-1 = vazio); categorias: textos dos códigos;
+# originais: texto das datas como estava no JSON
+_Coluna = namedtuple('_Coluna', 'valores nulo categorias originais', defaults=(None, None))
+# Nó compilado: avaliar() devolve o array (ou escalar, se constante)
+_No = namedtuple('_No', 'avaliar tipo constante coluna grupo', defaults=(None, None, None))
+
+
+def _para_data(texto):
+    if isinstance(texto, str):
+        for formato in _FORMATOS_DATA:
+            try:
+                return np.datetime64(datetime.strptime(texto.strip(), formato), 's')
+            except ValueError:
+                pass
+    return np.datetime64('NaT', 's')
+
+
+def _coluna(tipo, valores):
+    if tipo == NUMERICO:
+        try:
+            dados = np.array(valores, dtype=float)
+        except (TypeError, ValueError):
+            # Texto que não virou número (ex: JSON antigo): fica vazio
+            dados = np.array([v if isinstance(v, (int, float)) else np.nan for v in valores], dtype=float)
+        return _Coluna(dados, np.isnan(dados))
+    if tipo == DATA:
+        dados = np.array([_para_data(v) for v in valores], dtype='datetime64[s]')
+        return _Coluna(dados, np.isnat(dados), originais=np.array(valores, dtype=object))
+    textos = [None if v is None else str(v) for v in valores]
+    categorias = sorted({t for t in textos if t is not None})
+    indice = {t: i for i, t in enumerate(categorias)}
+    codigos = np.array([indice.get(t, -1) for t in textos], dtype=np.int32)
+    return _Coluna(codigos, codigos < 0, np.array(categorias, dtype=object))
+
+
+def _valor_python(coluna, tipo, i):
+    if coluna.nulo[i]:
+        return None
+    if tipo == NUMERICO:
+        valor = float(coluna.valores[i])
+        return int(valor) if valor.is_integer() else valor
+    if tipo == DATA:
+        return coluna.originais[i]
+    return coluna.categorias[coluna.valores[i]]
+
+
+class _Compilador:
+    """Uma expressão -> árvore de funções sobre as colunas de uma Triagem."""
+
+    def __init__(self, triagem):
+        self.triagem = triagem
+        self.campos = []
+
+    def compilar(self, texto):
+        try:
+            arvore = ast.parse(_RE_PERCENTUAL.sub(r'\1', texto.strip()), mode='eval')
+        except SyntaxError as e:
+            raise ExpressaoInvalida(f"{texto!r}: {e.msg}") from None
+        return self._sem_grupo(self.no(arvore.body), arvore.body)
+
+    def _sem_grupo(self, no, arvore):
+        if no.tipo == GRUPO:
+            raise ExpressaoInvalida(f"{ast.unparse(arvore)}: nome sem a fonte é um grupo de campos, "
+                                    f"use dentro de {', '.join(_AGREGACOES)}")
+        return no
+
+    def no(self, arvore):
+        metodo = getattr(self, '_' + type(arvore).__name__, None)
+        if metodo is None:
+            raise ExpressaoInvalida(f"Construção não suportada: {ast.unparse(arvore)}")
+        return metodo(arvore)
+
+    def _do_tipo(self, arvore, *tipos):
+        no = self._sem_grupo(self.no(arvore), arvore)
+        if no.tipo not in tipos:
+            raise ExpressaoInvalida(f"{ast.unparse(arvore)}: esperado {'/'.join(tipos)}, não {no.tipo}")
+        return no
+
+    def _no_do_campo(self, campo):
+        coluna = self.triagem.colunas[campo]
+        if campo not in self.campos:
+            self.campos.append(campo)
+        tipo = TIPOS_CAMPOS[campo]
+        valores = coluna.valores
+        return _No(lambda: valores, tipo, coluna=coluna)
+
+    # --- folhas ----------------------------------------------------------------
+
+    def _Constant(self, arvore):
+        valor = arvore.value
+        if isinstance(valor, bool):
+            tipo = LOGICO
+        elif isinstance(valor, (int, float)):
+            tipo, valor = NUMERICO, float(valor)
+        elif isinstance(valor, str):
+            tipo = TEXTO
+        else:
+            raise ExpressaoInvalida(f"Constante não suportada: {valor!r}")
+        return _No(lambda: valor, tipo, constante=valor)
+
+    def _Name(self, arvore):
+        nome = arvore.id
+        if nome in self.triagem.colunas:
+            return self._no_do_campo(nome)
+        if nome in GRUPOS:
+            return _No(None, GRUPO, grupo=GRUPOS[nome])
+        parecidos = difflib.get_close_matches(nome, [*self.triagem.colunas, *GRUPOS], n=3)
+        raise ExpressaoInvalida(f"Campo desconhecido: {nome}" + (f" (parecidos: {', '.join(parecidos)})" if parecidos else ""))
+
+    # --- operadores ------------------------------------------------------------
+
+    def _BinOp(self, arvore):
+        operacao = _ARITMETICA.get(type(arvore.op))
+        if operacao is None:
+            raise ExpressaoInvalida(f"Operador não suportado: {ast.unparse(arvore)}")
+        a = self._do_tipo(arvore.left, NUMERICO).avaliar
+        b = self._do_tipo(arvore.right, NUMERICO).avaliar
+        return _No(lambda: operacao(a(), b()), NUMERICO)
+
+    def _UnaryOp(self, arvore):
+        if isinstance(arvore.op, ast.Not):
+            a = self._do_tipo(arvore.operand, LOGICO).avaliar
+            return _No(lambda: np.logical_not(a()), LOGICO)
+        a = self._do_tipo(arvore.operand, NUMERICO).avaliar
+        if isinstance(arvore.op, ast.USub):
+            return _No(lambda: np.negative(a()), NUMERICO)
+        return _No(a, NUMERICO)
+
+    def _BoolOp(self, arvore):
+        funcoes = [self._do_tipo(valor, LOGICO).avaliar for valor in arvore.values]
+        reduzir = np.logical_and if isinstance(arvore.op, ast.And) else np.logical_or
+
+        def avaliar():
+            resultado = funcoes[0]()
+            for funcao in funcoes[1:]:
+                resultado = reduzir(resultado, funcao())
+            return resultado
+        return _No(avaliar, LOGICO)
+
+    def _Compare(self, arvore):
+        if any(isinstance(op, (ast.In, ast.NotIn)) for op in arvore.ops):
+            if len(arvore.ops) > 1:
+                raise ExpressaoInvalida(f"'in' não pode ser encadeado: {ast.unparse(arvore)}")
+            esquerda = self._sem_grupo(self.no(arvore.left), arvore.left)
+            return self._pertence(esquerda, arvore.comparators[0], isinstance(arvore.ops[0], ast.NotIn))
+        partes = []
+        esquerda = self._sem_grupo(self.no(arvore.left), arvore.left)
+        for operador, comparador in zip(arvore.ops, arvore.comparators):
+            direita = self._sem_grupo(self.no(comparador), comparador)
+            partes.append(self._comparar(esquerda, operador, direita, arvore))
+            esquerda = direita
+        if len(partes) == 1:
+            return partes[0]
+        funcoes = [parte.avaliar for parte in partes]
+        return _No(lambda: np.logical_and.reduce([funcao() for funcao in funcoes]), LOGICO)
+
+    def _data_constante(self, no, arvore):
+        data = _para_data(no.constante)
+        if np.isnat(data):
+            raise ExpressaoInvalida(f"Data inválida em {ast.unparse(arvore)}: {no.constante!r}")
+        return _No(lambda: data, DATA, constante=data)
+
+    def _comparar(self, esquerda, operador, direita, arvore):
+        comparar = _COMPARACOES[type(operador)]
+        # Texto constante ao lado de uma data é a data
+        if esquerda.tipo == DATA and direita.tipo == TEXTO and direita.constante is not None:
+            direita = self._data_constante(direita, arvore)
+        elif direita.tipo == DATA and esquerda.tipo == TEXTO and esquerda.constante is not None:
+            esquerda = self._data_constante(esquerda, arvore)
+        if esquerda.tipo != direita.tipo or esquerda.tipo not in (NUMERICO, DATA, TEXTO):
+            raise ExpressaoInvalida(f"Não dá para comparar {esquerda.tipo} com {direita.tipo}: {ast.unparse(arvore)}")
+        if esquerda.tipo != TEXTO:
+            a, b = esquerda.avaliar, direita.avaliar
+            return _No(lambda: comparar(a(), b()), LOGICO)
+
+        if not isinstance(operador, (ast.Eq, ast.NotEq)):
+            raise ExpressaoInvalida(f"Texto só compara com == e !=: {ast.unparse(arvore)}")
+        if esquerda.coluna is None:
+            esquerda, direita = direita, esquerda
+        if esquerda.coluna is None:
+            raise ExpressaoInvalida(f"Comparação entre duas constantes: {ast.unparse(arvore)}")
+        if direita.coluna is None:
+            # Coluna contra constante: compara os códigos (constante ausente -> código que não existe)
+            indice = np.searchsorted(esquerda.coluna.categorias, direita.constante)
+            codigo = indice if indice < len(esquerda.coluna.categorias) and \
+                esquerda.coluna.categorias[indice] == direita.constante else -2
+            resultado = comparar(esquerda.coluna.valores, codigo)
+        else:
+            # Duas colunas de texto: os textos, com vazio diferente de tudo
+            a, b = esquerda.coluna, direita.coluna
+            iguais = (np.append(a.categorias, None)[a.valores] == np.append(b.categorias, None)[b.valores])
+            iguais &= ~(a.nulo | b.nulo)
+            resultado = iguais if isinstance(operador, ast.Eq) else ~iguais
+        # Colunas não mudam: o resultado é calculado uma vez, na compilação
+        return _No(lambda: resultado, LOGICO)
+
+    def _pertence(self, esquerda, lista, negar):
+        if not isinstance(lista, (ast.Tuple, ast.List, ast.Set)) or \
+                not all(isinstance(item, ast.Constant) for item in lista.elts):
+            raise ExpressaoInvalida(f"'in' espera uma lista de constantes: {ast.unparse(lista)}")
+        valores = [item.value for item in lista.elts]
+        if esquerda.tipo == TEXTO and esquerda.coluna is not None:
+            categorias = {texto: i for i, texto in enumerate(esquerda.coluna.categorias)}
+            resultado = np.isin(esquerda.coluna.valores, [categorias[v] for v in valores if v in categorias])
+            resultado = ~resultado if negar else resultado
+            return _No(lambda: resultado, LOGICO)
+        if esquerda.tipo == NUMERICO:
+            conjunto = np.array(valores, dtype=float)
+        elif esquerda.tipo == DATA:
+            conjunto = np.array([_para_data(v) for v in valores], dtype='datetime64[s]')
+        else:
+            raise ExpressaoInvalida(f"'in' não se aplica a {esquerda.tipo}")
+        a = esquerda.avaliar
+        return _No(lambda: np.isin(a(), conjunto, invert=negar), LOGICO)
+
+    # --- funções ---------------------------------------------------------------
+
+    def _Call(self, arvore):
+        if not isinstance(arvore.func, ast.Name) or arvore.keywords:
+            raise ExpressaoInvalida(f"Chamada não suportada: {ast.unparse(arvore)}")
+        nome = _SINONIMOS.get(arvore.func.id, arvore.func.id)
+        if nome in _AGREGACOES:
+            return self._agregar(nome, arvore)
+        metodo = getattr(self, f'_funcao_{nome}', None)
+        if metodo is None:
+            raise ExpressaoInvalida(f"Função desconhecida: {arvore.func.id}")
+        return metodo(arvore)
+
+    def _agregar(self, nome, arvore):
+        membros = []
+        for argumento in arvore.args:
+            no = self.no(argumento)
+            if no.tipo == GRUPO:
+                numericos = [campo for campo in no.grupo if TIPOS_CAMPOS[campo] == NUMERICO]
+                if not numericos:
+                    raise ExpressaoInvalida(f"{ast.unparse(argumento)} não é numérico")
+                membros += [self._no_do_campo(campo) for campo in numericos]
+            elif no.tipo == NUMERICO:
+                membros.append(no)
+            else:
+                raise ExpressaoInvalida(f"{nome}() espera números: {ast.unparse(argumento)}")
+        if not membros:
+            raise ExpressaoInvalida(f"{nome}() sem argumentos")
+        reduzir = _AGREGACOES[nome]
+        total = len(self.triagem)
+        if all(membro.coluna is not None for membro in membros):
+            # Só colunas: calculado uma vez, na compilação
+            resultado = reduzir(np.vstack([membro.coluna.valores for membro in membros]))
+            return _No(lambda: resultado, NUMERICO)
+        funcoes = [membro.avaliar for membro in membros]
+        return _No(lambda: reduzir(np.vstack([np.broadcast_to(f(), (total,)) for f in funcoes])), NUMERICO)
+
+    def _argumento_unico(self, arvore, quantidade=1):
+        if len(arvore.args) != quantidade:
+            raise ExpressaoInvalida(f"{arvore.func.id}() espera {quantidade} argumento(s)")
+        return arvore.args
+
+    def _funcao_abs(self, arvore):
+        a = self._do_tipo(self._argumento_unico(arvore)[0], NUMERICO).avaliar
+        return _No(lambda: np.abs(a()), NUMERICO)
+
+    def _funcao_nulo(self, arvore):
+        no = self._do_tipo(self._argumento_unico(arvore)[0], NUMERICO, DATA, TEXTO)
+        if no.coluna is not None:
+            nulo = no.coluna.nulo
+            return _No(lambda: nulo, LOGICO)
+        if no.tipo != NUMERICO:
+            raise ExpressaoInvalida(f"nulo() espera um campo: {ast.unparse(arvore)}")
+        a = no.avaliar
+        return _No(lambda: np.isnan(a()), LOGICO)
+
+    def _funcao_contem(self, arvore):
+        campo, trecho = self._argumento_unico(arvore, 2)
+        no = self._do_tipo(campo, TEXTO)
+        if no.coluna is None or not isinstance(trecho, ast.Constant) or not isinstance(trecho.value, str):
+            raise ExpressaoInvalida(f"contem() espera um campo de texto e um trecho: {ast.unparse(arvore)}")
+        trecho = trecho.value.lower()
+        # Testa cada categoria uma vez; a última posição (código -1, vazio) é falsa
+        marcadas = np.array([trecho in categoria.lower() for categoria in no.coluna.categorias] + [False])
+        resultado = marcadas[no.coluna.valores]
+        return _No(lambda: resultado, LOGICO)
+
+
+def _contar(matriz):
+    return (~np.isnan(matriz)).sum(axis=0).astype(float)
+
+
+def _mediana(matriz):
+    # np.nanmedian trata coluna por coluna; ordenando, os vazios vão para o fim de cada
+    # coluna e a mediana fica nas posições (n-1)//2 e n//2 dos n valores
+    ordenada = np.sort(matriz, axis=0)
+    validos = (~np.isnan(matriz)).sum(axis=0)
+    baixo = np.take_along_axis(ordenada, np.maximum(validos - 1, 0)[None] // 2, axis=0)[0]
+    alto = np.take_along_axis(ordenada, validos[None] // 2, axis=0)[0]
+    return np.where(validos > 0, (baixo + alto) / 2, np.nan)
+
+
+def _primeiro(matriz):
+    resultado = matriz[0].copy()
+    for linha in matriz[1:]:
+        np.copyto(resultado, linha, where=np.isnan(resultado))
+    return resultado
+
+
+_AGREGACOES = {
+    'min': lambda matriz: np.fmin.reduce(matriz, axis=0),
+    'max': lambda matriz: np.fmax.reduce(matriz, axis=0),
+    'media': lambda matriz: np.nansum(matriz, axis=0) / _contar(matriz),
+    'mediana': _mediana,
+    'primeiro': _primeiro,
+    'contar': _contar,
+}
+
+
+class ResultadoTriagem:
+    """Tickers selecionados, na ordem pedida, e os campos/expressões a exibir."""
+
+    def __init__(self, triagem, indices, campos, segundos):
+        self.triagem = triagem
+        self.indices = indices
+        self.campos = campos
+        self.segundos = segundos
+
+    def __len__(self):
+        return len(self.indices)
+
+    @property
+    def tickers(self):
+        return self.triagem.tickers[self.indices].tolist()
+
+    def linhas(self):
+        """Uma lista de dicts {campo: valor} (None para vazio), no formato do JSON."""
+        colunas = {}
+        for campo in self.campos:
+            coluna = self.triagem.colunas.get(campo)
+            if coluna is not None:
+                tipo = TIPOS_CAMPOS[campo]
+                colunas[campo] = [_valor_python(coluna, tipo, i) for i in self.indices]
+                continue
+            # Expressão calculada (ex: 'mediana(pl)')
+            valores = self.triagem.avaliar(campo)
+            colunas[campo] = [None if v != v else v for v in np.asarray(valores)[self.indices].tolist()]
+        return [dict(zip(colunas, valores)) for valores in zip(*colunas.values())] if colunas else []
+
+
+class Triagem:
+    """
+    O dataset em colunas NumPy. Os dados não mudam depois de carregados: para ver uma
+    execução nova, carregue outra Triagem.
+    """
+
+    def __init__(self, registros):
+        registros = list(registros)
+        self.colunas = {campo: _coluna(TIPOS_CAMPOS[campo], [registro.get(campo) for registro in registros])
+                        for campo in ORDEM_CAMPOS}
+        self.tickers = np.array([registro.get('ticker') for registro in registros], dtype=object)
+        self._todos = np.arange(len(registros))
+        self._compiladas = {}
+
+    @classmethod
+    def carregar(cls, caminho=ARQUIVO_DATASET):
+        return cls(carregar_dataset(caminho).values())
+
+    def __len__(self):
+        return len(self.tickers)
+
+    def compilar(self, expressao):
+        """(nó, campos usados) da expressão; compilada uma vez por Triagem."""
+        compilada = self._compiladas.get(expressao)
+        if compilada is None:
+            compilador = _Compilador(self)
+            with np.errstate(all='ignore'):
+                no = compilador.compilar(expressao)
+            compilada = self._compiladas[expressao] = (no, tuple(compilador.campos))
+        return compilada
+
+    def avaliar(self, expressao):
+        """Valor da expressão para todos os tickers (array do tamanho do dataset)."""
+        no, _ = self.compilar(expressao)
+        with np.errstate(all='ignore'):
+            return np.broadcast_to(no.avaliar(), (len(self),))
+
+    def filtrar(self, expressao):
+        """Máscara booleana dos tickers que passam no filtro."""
+        no, _ = self.compilar(expressao)
+        if no.tipo != LOGICO:
+            raise ExpressaoInvalida(f"O filtro precisa ser uma condição: {expressao!r}")
+        with np.errstate(all='ignore'):
+            return np.broadcast_to(no.avaliar(), (len(self),))
+
+    def _chave(self, expressao):
+        """(valores, vazios) para ordenar crescente; '-' na frente inverte."""
+        expressao = expressao.strip()
+        decrescente = expressao.startswith('-')
+        no, _ = self.compilar(expressao[1:] if decrescente else expressao)
+        valores = np.broadcast_to(no.avaliar(), (len(self),))
+        if no.tipo == NUMERICO:
+            vazios = np.isnan(valores)
+        elif no.tipo == DATA:
+            vazios, valores = np.isnat(valores), valores.view('i8')
+        elif no.tipo == TEXTO and no.coluna is not None:
+            # Códigos seguem a ordem alfabética das categorias
+            vazios = no.coluna.nulo
+        elif no.tipo == LOGICO:
+            vazios, valores = np.zeros(len(self), dtype=bool), valores.astype(np.int8)
+        else:
+            raise ExpressaoInvalida(f"Não dá para ordenar por {expressao!r}")
+        if decrescente:
+            valores = np.negative(valores)
+        return np.where(vazios, 0, valores), vazios
+
+    def consultar(self, filtro=None, ordem=(), limite=None, campos=None):
+        """
+        Filtra, ordena e corta os N primeiros.
+
+        :param filtro: Expressão de condição (None = todos).
+        :param ordem: Expressão ou lista de expressões; '-' na frente = decrescente.
+                      Vazios ficam no fim; empates mantêm a ordem do dataset.
+        :param limite: Quantos tickers devolver (None = todos).
+        :param campos: Campos ou expressões de cada linha do resultado. Padrão: o ticker
+                       e os campos usados no filtro e na ordem.
+        """
+        inicio = time.perf_counter()
+        if isinstance(ordem, str):
+            ordem = [ordem]
+        with np.errstate(all='ignore'):
+            indices = np.flatnonzero(self.filtrar(filtro)) if filtro else self._todos
+            if ordem and len(indices):
+                chaves = []
+                for expressao in reversed(ordem):
+                    valores, vazios = self._chave(expressao)
+                    chaves += [valores[indices], vazios[indices]]
+                indices = indices[np.lexsort(chaves)]
+        if limite is not None:
+            indices = indices[:limite]
+        segundos = time.perf_counter() - inicio
+
+        if campos is None:
+            campos = ['ticker']
+            for expressao in ([filtro] if filtro else []) + [e.strip().lstrip('-') for e in ordem]:
+                campos += [campo for campo in self.compilar(expressao)[1] if campo not in campos]
+        return ResultadoTriagem(self, indices, list(campos), segundos)
+
+
+def _formatar(valor):
+    if valor is None:
+        return '-'
+    if isinstance(valor, float):
+        return f"{valor:,.2f}".replace(',', '_').replace('.', ',').replace('_', '.')
+    return str(valor)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("filtro", nargs='?', help="Condição (vazio = todos os tickers).")
+    parser.add_argument("--ordem", action='append', default=[], metavar='EXPR',
+                        help="Ordenação (repetível; '-' na frente = decrescente, com --ordem=-EXPR).")
+    parser.add_argument("--limite", type=int, default=20)
+    parser.add_argument("--campos", help="Campos/expressões exibidos, separados por ';'.")
+    parser.add_argument("--arquivo", default=ARQUIVO_DATASET)
+    parser.add_argument("--json", action='store_true', help="Resultado em JSON.")
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    triagem = Triagem.carregar(args.arquivo)
+    carga = time.perf_counter() - inicio
+    campos = [campo.strip() for campo in args.campos.split(';')] if args.campos else None
+    try:
+        resultado = triagem.consultar(args.filtro, args.ordem, args.limite, campos)
+        # Segunda vez: já compilada, é o custo de uma consulta repetida
+        repetida = triagem.consultar(args.filtro, args.ordem, args.limite, campos).segundos
+    except ExpressaoInvalida as e:
+        parser.error(str(e))
+    linhas = resultado.linhas()
+
+    if args.json:
+        print(json.dumps(linhas, indent=2, ensure_ascii=False))
+        return
+    tabela = [resultado.campos] + [[_formatar(linha[campo]) for campo in resultado.campos] for linha in linhas]
+    larguras = [max(len(linha[i]) for linha in tabela) for i in range(len(resultado.campos))]
+    for linha in tabela:
+        print('  '.join(valor.rjust(largura) for valor, largura in zip(linha, larguras)))
+    print(f"\n🔎 {len(resultado)} tickers (de {len(triagem)}). Carga {carga * 1000:.0f} ms; consulta "
+          f"{resultado.segundos * 1e6:.0f} µs na primeira vez, {repetida * 1e6:.0f} µs já compilada.")
+
+
+if __name__ == '__main__':
+    main()